@@ -1,4 +1,5 @@
 from .chat_session_repository import IChatSessionRepository
+from .document_manifest_repository import IDocumentManifestRepository
 from .document_repository import IDocumentRepository
 from .rag_repository import IRAGRepository
 from .vectorstore_repo import IVectorStoreRepository
@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from backend.src.domain.entities.rag_entities.document_manifest import \
+    DocumentManifestEntry
+
+
+class IDocumentManifestRepository(ABC):
+    """Tracks which documents are (being) ingested into the vector store."""
+
+    @abstractmethod
+    def get(self, document_hash: str) -> Optional[DocumentManifestEntry]:
+        """Retrieve the manifest entry of a document by its hash."""
+        pass
+
+    @abstractmethod
+    def is_completed(self, document_hash: str) -> bool:
+        """Return True if every chunk of the document has been committed."""
+        pass
+
+    @abstractmethod
+    def list_completed(self) -> Dict[str, str]:
+        """Map document hash to filename for all completed documents."""
+        pass
+
+    @abstractmethod
+    def list_all(self) -> List[DocumentManifestEntry]:
+        """Return the entries of all documents, whatever their status."""
+        pass
+
+    @abstractmethod
+    def save(self, entry: DocumentManifestEntry) -> DocumentManifestEntry:
+        """Insert or replace the entry of one document atomically."""
+        pass
+
+    @abstractmethod
+    def update_committed(self, document_hash: str, committed_chunks: int) -> None:
+        """Advance the ingestion checkpoint of a document."""
+        pass
+
+    @abstractmethod
+    def mark_deleted(self, document_hash: str) -> bool:
+        """Turn the entry of a document into a tombstone; False if there was no live entry."""
+        pass
+
+    @abstractmethod
+    def delete(self, document_hash: str) -> bool:
+        """Remove the entry of a document and return True if it existed."""
+        pass
+
+    @abstractmethod
+    def add_deleted_vectors(self, collection_name: str, count: int) -> None:
+        """Count vectors deleted from a collection, which stay stored until it is compacted."""
+        pass
+
+    @abstractmethod
+    def get_deleted_vectors(self, collection_name: str) -> int:
+        """Return the vectors deleted from a collection since it was last compacted."""
+        pass
+
+    @abstractmethod
+    def reset_deleted_vectors(self, collection_name: str) -> None:
+        """Clear the deleted-vector count of a collection after compacting it."""
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 
 class IRAGRepository(ABC):
@@ -10,7 +10,7 @@ class IRAGRepository(ABC):
 
 
     @abstractmethod
-    def summarize_history(self, formatted_history: List[Dict[str, Any]]) -> str:
+    async def summarize_history(self, formatted_history: List[Dict[str, Any]]) -> str:
         """Summarize chat history for context.
 
         Args:
@@ -22,7 +22,7 @@ class IRAGRepository(ABC):
         pass
 
     @abstractmethod
-    def revise_query_with_context(self, query: str, context: str) -> str:
+    async def revise_query_with_context(self, query: str, context: str) -> str:
         """Revise the user query by incorporating provided context.
 
         Args:
@@ -35,7 +35,7 @@ class IRAGRepository(ABC):
         pass
 
     @abstractmethod
-    def answer_query_with_specific_document(
+    async def answer_query_with_specific_document(
         self, user_query: str, document_hash: str
     ) -> str:
         """Run retrieval + generation + storage pipeline with a specific document.
@@ -50,6 +50,22 @@ class IRAGRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def astream_answer(
+        self, user_query: str, document_hash: Optional[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run the same pipeline, yielding events as it goes.
+
+        Args:
+            user_query: The user's query
+            document_hash: The hash of the specific document to use, if any
+
+        Yields:
+            "progress" events as steps finish, "token" events with the generated
+            text and a final "answer" event with the whole response
+        """
+        pass
+
         @abstractmethod
         def search_for_books_with_ai(self, user_query: str) -> str:
             pass
\ No newline at end of file
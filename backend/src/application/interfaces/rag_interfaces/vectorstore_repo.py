@@ -1,23 +1,53 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
+from typing import Any, Callable, Dict, List, Optional
 
 
 class IVectorStoreRepository(ABC):
     @abstractmethod
-    def process_document(self, file_path: str, hash: str, file_name: str) -> Any:
+    def process_document(
+        self,
+        file_path: str,
+        hash: str,
+        file_name: str,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> Any:
+        """Chunk, embed and store a document; `on_progress` receives the committed chunk count."""
         pass
 
     @abstractmethod
     def get_similar_chunks(self, query: str, k: int = 4, collection: str = "book_chunks") -> List[Any]:
         pass
 
+    @abstractmethod
+    async def aget_similar_chunks(self, query: str, k: int = 4, collection: str = "book_chunks") -> List[Any]:
+        """Async `get_similar_chunks` that does not block the event loop."""
+        pass
+
+    @abstractmethod
+    def get_similar_chunks_batch(
+        self, queries: List[str], k: int = 4, collection_name: str = "book_chunks", filter_dict: Optional[dict] = None
+    ) -> List[List[Any]]:
+        """Retrieve chunks for several queries with one embedding call and one index query."""
+        pass
+
 
     @abstractmethod
     def get_document_chunks(
         self, query: str, document_hash: str, k: int = 6
     ) -> List[Any]:
+        """Return the k chunks of one document most similar to the query, best first."""
         pass
 
     @abstractmethod
     def get_all_processed_docs(self) -> Dict[Any, Any]:
         pass
+
+    @abstractmethod
+    def is_document_processed(self, document_hash: str) -> bool:
+        """Return True if the document with this hash is fully ingested."""
+        pass
+
+    @abstractmethod
+    def delete_document_vectors(self, document_hash: str) -> Dict[str, int]:
+        """Remove every vector of a document and its manifest entry; returns removed counts."""
+        pass
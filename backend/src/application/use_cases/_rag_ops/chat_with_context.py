@@ -1,4 +1,5 @@
-from typing import Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional
 
 from backend.src.application.interfaces.rag_interfaces.chat_session_repository import \
     IChatSessionRepository
@@ -28,38 +29,19 @@ class ChatWithContext:
         self.chat_session_repo = chat_session_repo
         self.hash = hash
 
-    def generate_response(
+    async def generate_response(
         self, current_user, session_id: str, query: str, hash: Optional[str]
     ) -> ChatMessage:
         
-        # Get or create session
-        db_chat_session = self._get_or_create_session(session_id, current_user.user_id)
-
-        if not db_chat_session.messages:
-            revised_query = query
-        else:
-            history_msg = db_chat_session.messages[-MAX_HISTORY_MSG_LEN_TO_RETRIEVE:]
-            formatted_history = [
-                {"role": msg.role.value, "content": msg.content} for msg in history_msg
-            ]
-            print(
-                "=======Here are the last 4 of the formatted history (for short): ",
-                formatted_history[-4:],
-            )
-            summarized_history = self.rag_repo.summarize_history(formatted_history)
-            print("=======Here is summarized history:", summarized_history)
-            revised_query = self.rag_repo.revise_query_with_context(
-                query, summarized_history
-            )
-            print("=======Here is revised query:", revised_query)
+        revised_query = await self._revise_query(current_user, session_id, query)
         
         # PERSIST USER MESSAGE
         user_msg = ChatMessage(
             content=query, role=MessageRole.USER, session_id=session_id
             )
-        self.chat_session_repo.add_message_to_session(session_id, user_msg)
+        await asyncio.to_thread(self.chat_session_repo.add_message_to_session, session_id, user_msg)
 
-        response = self.rag_repo.answer_query_with_specific_document(
+        response = await self.rag_repo.answer_query_with_specific_document(
             user_query=revised_query, document_hash=hash
             )
         if not response:
@@ -69,14 +51,100 @@ class ChatWithContext:
         ai_msg = ChatMessage(
             content=response, role=MessageRole.ASSISTANT, session_id=session_id
             )
-        self.chat_session_repo.add_message_to_session(
-            session_id=session_id, message=ai_msg
+        await asyncio.to_thread(
+            self.chat_session_repo.add_message_to_session, session_id=session_id, message=ai_msg
             )
         
         return ChatMessage(
             content=response, role=MessageRole.ASSISTANT, session_id=session_id
         )
 
+    async def stream_response(
+        self, current_user, session_id: str, query: str, hash: Optional[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Same as `generate_response`, but yields the pipeline's progress and tokens as they
+        come. The assistant message is persisted once the answer is complete and reported
+        in a final "done" event; if the stream ends early (the client disconnected or
+        the graph failed), the tokens sent so far are persisted instead.
+        """
+        revised_query = await self._revise_query(current_user, session_id, query)
+
+        # PERSIST USER MESSAGE
+        user_msg = ChatMessage(
+            content=query, role=MessageRole.USER, session_id=session_id
+            )
+        await asyncio.to_thread(self.chat_session_repo.add_message_to_session, session_id, user_msg)
+
+        response = ""
+        streamed_tokens = []
+        persisted = False
+        try:
+            async for event in self.rag_repo.astream_answer(
+                user_query=revised_query, document_hash=hash
+                ):
+                if event["event"] == "answer":
+                    response = event["content"]
+                    continue
+                if event["event"] == "token":
+                    streamed_tokens.append(event["content"])
+                yield event
+            if not response:
+                raise MessageGenerationNotFound("No response generated for the query.")
+
+            # PERSIST AI MESSAGE
+            ai_msg = ChatMessage(
+                content=response, role=MessageRole.ASSISTANT, session_id=session_id
+                )
+            persisted = True
+            await self._persist_message(session_id, ai_msg)
+
+            yield {"event": "done", "message": ai_msg}
+        finally:
+            if not persisted and streamed_tokens:
+                await self._persist_message(
+                    session_id,
+                    ChatMessage(
+                        content="".join(streamed_tokens),
+                        role=MessageRole.ASSISTANT,
+                        session_id=session_id,
+                    ),
+                )
+
+    async def _persist_message(self, session_id: str, message: ChatMessage) -> None:
+        # Shielded: a disconnect cancels the stream, but the write still has to land
+        await asyncio.shield(
+            asyncio.to_thread(
+                self.chat_session_repo.add_message_to_session, session_id=session_id, message=message
+            )
+        )
+
+    async def _revise_query(self, current_user, session_id: str, query: str) -> str:
+        """Get or create the session and fold its recent history into the query."""
+        # Get or create session (blocking DB calls, kept off the event loop)
+        db_chat_session = await asyncio.to_thread(
+            self._get_or_create_session, session_id, current_user.user_id
+        )
+
+        if not db_chat_session.messages:
+            revised_query = query
+        else:
+            history_msg = db_chat_session.messages[-MAX_HISTORY_MSG_LEN_TO_RETRIEVE:]
+            formatted_history = [
+                {"role": msg.role.value, "content": msg.content} for msg in history_msg
+            ]
+            print(
+                "=======Here are the last 4 of the formatted history (for short): ",
+                formatted_history[-4:],
+            )
+            summarized_history = await self.rag_repo.summarize_history(formatted_history)
+            print("=======Here is summarized history:", summarized_history)
+            revised_query = await self.rag_repo.revise_query_with_context(
+                query, summarized_history
+            )
+            print("=======Here is revised query:", revised_query)
+        return revised_query
+
     def _get_or_create_session(self, session_id: str, user_id: int) -> ChatSession:
         db_chat_session = self.chat_session_repo.get_session_by_id(session_id)
         if not db_chat_session:
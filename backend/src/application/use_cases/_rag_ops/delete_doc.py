@@ -0,0 +1,36 @@
+from typing import Any, Dict
+
+from backend.src.application.interfaces.rag_interfaces.document_repository import \
+    IDocumentRepository
+from backend.src.application.interfaces.rag_interfaces.vectorstore_repo import \
+    IVectorStoreRepository
+from backend.src.domain.exceptions.chat_exceptions import DocumentNotFound
+from logs.log_config import setup_logger
+
+doc_logger = setup_logger("document")
+
+
+class DeleteDocument:
+    """Removes a document from the SQL store, the vector store and the manifest."""
+
+    def __init__(
+        self, doc_repo: IDocumentRepository, vector_repo: IVectorStoreRepository
+    ):
+        self.doc_repo = doc_repo
+        self.vector_repo = vector_repo
+
+    def execute(self, document_hash: str) -> Dict[str, Any]:
+        removed = self.vector_repo.delete_document_vectors(document_hash)
+        document_removed = self.doc_repo.delete_document(document_hash)
+
+        if not document_removed and not any(removed.values()):
+            raise DocumentNotFound(f"No document found with hash {document_hash}")
+
+        doc_logger.info(f"Deleted document {document_hash}: {removed}")
+        return {
+            "hash": document_hash,
+            "document_removed": document_removed,
+            "chunks_removed": removed["chunks"],
+            "summaries_removed": removed["summaries"],
+            "manifest_removed": bool(removed["manifest_entries"]),
+        }
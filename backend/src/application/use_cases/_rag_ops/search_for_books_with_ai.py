@@ -26,7 +26,7 @@ class SearchForBooksWithAI:
         self.rag_repo = rag_repo
         self.chat_session_repo = chat_session_repo
 
-    def execute(
+    async def execute(
         self, current_user, session_id: str, query: str) -> ChatMessage:
         
         # Get or create session
@@ -43,9 +43,9 @@ class SearchForBooksWithAI:
                 "=======Here are the last 4 of the formatted history (for short): ",
                 formatted_history[-4:],
             )
-            summarized_history = self.rag_repo.summarize_history(formatted_history)
+            summarized_history = await self.rag_repo.summarize_history(formatted_history)
             print("=======Here is summarized history:", summarized_history)
-            revised_query = self.rag_repo.revise_query_with_context(
+            revised_query = await self.rag_repo.revise_query_with_context(
                 query, summarized_history
             )
             print("=======Here is revised query:", revised_query)
@@ -1,5 +1,5 @@
 import os
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from backend.src.application.interfaces.rag_interfaces.document_repository import \
     IDocumentRepository
@@ -23,21 +23,38 @@ class AddAndProcessDocument:
         self.doc_repo = doc_repo
         self.vector_repo = vector_repo
 
-    def add_documents(self, file_path: str, user_id: int, file_name: str) -> Document:
-        """Add a document if new, or skip if already processed."""
+    def add_documents(
+        self,
+        file_path: str,
+        user_id: int,
+        file_name: str,
+        on_stage: Optional[Callable[[str], None]] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+        document_hash: Optional[str] = None,
+    ) -> Document:
+        """
+        Add a document if new, or skip if already processed.
+
+        `on_stage` is told when hashing, embedding and saving start, and `on_progress`
+        receives the number of chunks committed so far. A `document_hash` from
+        `check_not_processed` saves hashing the file again; it is checked again here,
+        since the same file may have been uploaded twice in the meantime.
+        """
+        report_stage = on_stage or (lambda stage: None)
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        document_hash = DocumentHasher.hash_file(file_path)
-
-        if document_hash in self.vector_repo.get_all_processed_docs():
-            doc_logger.info(f"Document with hash {document_hash} already exists")
-            raise DocumentAlreadyProcessed(
-                f"Document already exists with hash {document_hash}"
-            )
+        report_stage("hashing")
+        if document_hash is None:
+            document_hash = DocumentHasher.hash_file(file_path)
+        self._ensure_not_processed(document_hash)
 
         # Process document through vector store
-        document = self.vector_repo.process_document(file_path, document_hash, file_name)
+        report_stage("embedding")
+        document = self.vector_repo.process_document(
+            file_path, document_hash, file_name, on_progress=on_progress
+        )
+        report_stage("saving")
         self.doc_repo.save_document(document)
         document.user_id = user_id
 
@@ -51,3 +68,18 @@ class AddAndProcessDocument:
             content=document.content,
             hash=document.hash,
         )
+
+    def check_not_processed(self, file_path: str) -> str:
+        """Hash the file; raise DocumentAlreadyProcessed if it is already in the vector store."""
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        document_hash = DocumentHasher.hash_file(file_path)
+        self._ensure_not_processed(document_hash)
+        return document_hash
+
+    def _ensure_not_processed(self, document_hash: str) -> None:
+        if self.vector_repo.is_document_processed(document_hash):
+            doc_logger.info(f"Document with hash {document_hash} already exists")
+            raise DocumentAlreadyProcessed(
+                f"Document already exists with hash {document_hash}"
+            )
@@ -1,9 +1,11 @@
 from .chat_history import ChatMessage, ChatSession
 from .document import Document
+from .document_manifest import DocumentManifestEntry
 
 __all__ = [
     "ChatMessage",
     "ChatSession",
     "Document",
+    "DocumentManifestEntry",
 
 ]
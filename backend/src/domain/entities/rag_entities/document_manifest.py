@@ -0,0 +1,37 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass
+class DocumentManifestEntry:
+    """Ingestion state of one document in the vector store.
+
+    Chunk ids are not enumerated: a document owns the contiguous range
+    `{chunk_id_prefix}_chunk_0` .. `{chunk_id_prefix}_chunk_{chunk_count - 1}`.
+    """
+
+    document_hash: str
+    filename: str
+    status: str = "in_progress"  # "in_progress" | "completed" | "deleted"
+    chunk_id_prefix: str = ""
+    chunk_count: int = 0
+    committed_chunks: int = 0
+    chunk_size: Optional[int] = None
+    chunk_overlap: Optional[int] = None
+    read_block_chars: Optional[int] = None
+    strip_boilerplate: Optional[bool] = None
+    book_isbn: Optional[str] = None
+    updated_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def is_completed(self) -> bool:
+        return self.status == "completed"
+
+    @property
+    def is_deleted(self) -> bool:
+        """Tombstone left by a delete, so the startup sync does not re-ingest the file."""
+        return self.status == "deleted"
+
+    def chunk_ids(self) -> List[str]:
+        return [f"{self.chunk_id_prefix}_chunk_{i}" for i in range(self.chunk_count)]
@@ -53,4 +53,8 @@ class DocumentAlreadyProcessed(Exception):
 
 class MessageGenerationNotFound(Exception):
     """Exception raised when no message is generated for a given query."""
-    pass
\ No newline at end of file
+    pass
+
+class DocumentNotFound(Exception):
+    """Exception raised when a document to delete is neither stored nor indexed."""
+    pass
@@ -0,0 +1,44 @@
+from backend.src.domain.entities.rag_entities.document_manifest import \
+    DocumentManifestEntry
+from backend.src.infrastructure.persistence.models.rag_models import \
+    DocumentManifestModel
+
+
+class DocumentManifestMapper:
+    """Handles conversion between DocumentManifestEntry entity and DocumentManifestModel."""
+
+    @staticmethod
+    def to_model(entity: DocumentManifestEntry) -> DocumentManifestModel:
+        """Convert DocumentManifestEntry entity to DocumentManifestModel."""
+        return DocumentManifestModel(
+            document_hash=entity.document_hash,
+            filename=entity.filename,
+            status=entity.status,
+            chunk_id_prefix=entity.chunk_id_prefix,
+            chunk_count=entity.chunk_count,
+            committed_chunks=entity.committed_chunks,
+            chunk_size=entity.chunk_size,
+            chunk_overlap=entity.chunk_overlap,
+            read_block_chars=entity.read_block_chars,
+            strip_boilerplate=entity.strip_boilerplate,
+            book_isbn=entity.book_isbn,
+            updated_at=entity.updated_at,
+        )
+
+    @staticmethod
+    def to_entity(model: DocumentManifestModel) -> DocumentManifestEntry:
+        """Convert DocumentManifestModel to DocumentManifestEntry entity."""
+        return DocumentManifestEntry(
+            document_hash=model.document_hash,
+            filename=model.filename,
+            status=model.status,
+            chunk_id_prefix=model.chunk_id_prefix,
+            chunk_count=model.chunk_count,
+            committed_chunks=model.committed_chunks,
+            chunk_size=model.chunk_size,
+            chunk_overlap=model.chunk_overlap,
+            read_block_chars=model.read_block_chars,
+            strip_boilerplate=model.strip_boilerplate,
+            book_isbn=model.book_isbn,
+            updated_at=model.updated_at,
+        )
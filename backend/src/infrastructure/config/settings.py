@@ -1,6 +1,6 @@
 # backend\\src\\infrastructure\\configurations\\config.py
 import os
-from typing import Set
+from typing import Dict, Optional, Set
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -39,6 +39,95 @@ class RAGSettings(BaseSettings):
     MAX_FILE_SIZE_MB: int = 5
     ALLOWED_EXTENSIONS: Set[str] = {".txt"}
 
+    # Embedding backend: "google", "onnx" (local CPU) or "hashing" (deterministic, for tests)
+    EMBEDDING_PROVIDER: str = "google"
+    LOCAL_EMBEDDING_BATCH_SIZE: int = 32
+    LOCAL_EMBEDDING_NUM_THREADS: int = 0
+    # Where the ONNX model is downloaded (defaults to chromadb's cache, so a model it
+    # already fetched is reused)
+    LOCAL_EMBEDDING_MODEL_DIR: Optional[str] = None
+    HASHING_EMBEDDING_DIMENSION: int = 384
+
+    # Embedding pipeline
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_MAX_WORKERS: int = 4
+    EMBEDDING_MAX_RETRIES: int = 3
+    EMBEDDING_RETRY_BACKOFF_SECONDS: float = 1.0
+
+    # Persistent embedding cache (defaults to <CHROMA_PERSIST_DIR>/embedding_cache.sqlite3)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: Optional[str] = None
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 200_000
+
+    # In-process query embedding cache
+    QUERY_CACHE_MAX_ENTRIES: int = 1024
+    QUERY_CACHE_TTL_SECONDS: float = 3600
+
+    # Streaming ingestion
+    INGEST_ENCODING_SAMPLE_BYTES: int = 64 * 1024
+    INGEST_READ_BLOCK_CHARS: int = 64 * 1024
+    DOCUMENT_PREVIEW_CHARS: int = 2000
+
+    # Ingest-time normalization and near-duplicate chunk skipping
+    INGEST_STRIP_BOILERPLATE: bool = True
+    INGEST_SKIP_NEAR_DUPLICATES: bool = True
+    NEAR_DUPLICATE_MAX_DISTANCE: int = 3
+    NEAR_DUPLICATE_MIN_WORDS: int = 8
+
+    # Background ingestion jobs
+    INGEST_MAX_WORKERS: int = 2
+    INGEST_MAX_PENDING_JOBS: int = 8
+    INGEST_JOB_HISTORY_SIZE: int = 100
+
+    # Vector store backend: "chroma" (HNSW) or "exact" (memory-mapped matrix, brute force)
+    VECTOR_STORE_BACKEND: str = "chroma"
+    EXACT_INDEX_DIR: Optional[str] = None
+    EXACT_INDEX_DTYPE: str = "float16"
+    # Maintenance compacts a collection once this share of its stored vectors is dead
+    VECTOR_COMPACTION_THRESHOLD: float = 0.2
+
+    # Book-scoped chat searches a cached per-document partition
+    DOCUMENT_PARTITION_CACHE_SIZE: int = 8
+
+    # Hybrid (BM25 + vector) retrieval over book chunks
+    HYBRID_SEARCH_ENABLED: bool = True
+    HYBRID_CANDIDATE_MULTIPLIER: int = 3
+    BM25_K1: float = 1.5
+    BM25_B: float = 0.75
+    RRF_K: int = 60
+    # Lexical hits must score at least this share of the best score the query could
+    # reach, so a single shared common word does not pull in an unrelated chunk
+    BM25_MIN_SCORE_RATIO: float = 0.3
+
+    # Maximal-marginal-relevance diversification (opt-in)
+    MMR_ENABLED: bool = False
+    MMR_FETCH_MULTIPLIER: int = 4
+    MMR_LAMBDA: float = 0.5
+
+    # Local query routing (keyword rules + nearest-centroid classifier); the LLM
+    # router is only asked when the classifier is less confident than this
+    LOCAL_ROUTER_ENABLED: bool = True
+    ROUTER_MIN_CONFIDENCE: float = 0.6
+    ROUTER_TEMPERATURE: float = 0.05
+
+    # Shared, pooled LLM clients
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_KEEPALIVE_EXPIRY_SECONDS: float = 60
+    LLM_TIMEOUT_SECONDS: float = 60
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 10
+    # Calls in flight per provider model; LLM_MODEL_CONCURRENCY overrides single models
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_MODEL_CONCURRENCY: Dict[str, int] = {}
+
+    # Threads that run blocking vector store work for async callers
+    RETRIEVAL_EXECUTOR_WORKERS: int = 4
+
+    # Start the web search while the grader reads the retrieved chunks; the search
+    # is cancelled when they are enough. Off by default: every started search is a
+    # billed Tavily call, even when it is cancelled
+    SPECULATIVE_WEB_SEARCH: bool = False
+
     model_config = SettingsConfigDict(
         env_file=ENV_FILE_PATH, env_file_encoding="utf-8", extra="ignore"
     )
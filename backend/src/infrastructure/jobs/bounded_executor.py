@@ -0,0 +1,87 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class BoundedExecutor:
+    """
+    Fixed-size thread pool for blocking work awaited from async code.
+
+    Unlike `asyncio.to_thread`, which shares the loop's default pool with everything
+    else, this pool is dedicated and sized on purpose, so a burst of searches queues
+    here instead of starving other requests. `stats()` reports the queue depth (work
+    submitted but not started), work in flight and average wait and run times.
+    """
+
+    def __init__(self, max_workers: int, name: str):
+        self.max_workers = max_workers
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self.submitted - self.started
+
+    @property
+    def in_flight(self) -> int:
+        return self.started - self.completed - self.failed
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `func(*args, **kwargs)` on the pool and await its result."""
+        enqueued = time.perf_counter()
+        with self._lock:
+            self.submitted += 1
+            # Only work that finds no idle thread actually waits
+            waiting = self.queue_depth - max(0, self.max_workers - self.in_flight)
+            self.max_queue_depth = max(self.max_queue_depth, waiting)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._call, enqueued, func, args, kwargs)
+        )
+
+    def _call(self, enqueued: float, func: Callable[..., Any], args, kwargs) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self.started += 1
+            self._wait_seconds += started - enqueued
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+                self._run_seconds += time.perf_counter() - started
+            raise
+        with self._lock:
+            self.completed += 1
+            self._run_seconds += time.perf_counter() - started
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self.started or 1
+            finished = (self.completed + self.failed) or 1
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self.queue_depth,
+                "in_flight": self.in_flight,
+                "max_queue_depth": self.max_queue_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_wait_ms": round(self._wait_seconds / started * 1000, 3),
+                "avg_run_ms": round(self._run_seconds / finished * 1000, 3),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,151 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from backend.src.infrastructure.config.settings import rag_settings
+from logs.log_config import setup_logger
+
+job_logger = setup_logger("ingestion_jobs")
+
+
+class IngestionQueueFull(Exception):
+    """Raised when too many ingestion jobs are already waiting or running."""
+
+    pass
+
+
+class IngestionAlreadyQueued(Exception):
+    """Raised when a job for the same document is already waiting or running."""
+
+    def __init__(self, job: "IngestionJob"):
+        super().__init__(f"{job.file_name} is already being ingested by job {job.job_id}")
+        self.job = job
+
+
+@dataclass
+class IngestionJob:
+    """Status of one background document ingestion."""
+
+    job_id: str
+    file_name: str
+    stage: str = "queued"
+    chunks_committed: int = 0
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    _stage_started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.stage in ("completed", "failed")
+
+    def set_stage(self, stage: str) -> None:
+        """Close the timing of the current stage and move on to `stage`."""
+        now = time.perf_counter()
+        elapsed = now - self._stage_started
+        self.stage_timings[self.stage] = round(self.stage_timings.get(self.stage, 0.0) + elapsed, 3)
+        self.stage = stage
+        self._stage_started = now
+
+    def set_chunks_committed(self, count: int) -> None:
+        self.chunks_committed = count
+
+
+class IngestionJobQueue:
+    """
+    Runs document ingestion on a bounded worker pool so uploads return immediately.
+
+    At most `max_pending` jobs may be queued or running at once, and at most one per
+    `key` (the document hash), so two uploads of one file never ingest it side by
+    side. Finished jobs are kept for status lookups until `history_size` newer jobs
+    push them out.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = rag_settings.INGEST_MAX_WORKERS,
+        max_pending: int = rag_settings.INGEST_MAX_PENDING_JOBS,
+        history_size: int = rag_settings.INGEST_JOB_HISTORY_SIZE,
+    ):
+        self.max_pending = max_pending
+        self.history_size = history_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ingestion"
+        )
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._active_keys: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        file_name: str,
+        work: Callable[[IngestionJob], Dict[str, Any]],
+        key: Optional[str] = None,
+    ) -> IngestionJob:
+        """Enqueue `work`; it receives the job so it can report stage and progress."""
+        with self._lock:
+            if key is not None and key in self._active_keys:
+                raise IngestionAlreadyQueued(self._jobs[self._active_keys[key]])
+            active = sum(1 for job in self._jobs.values() if not job.is_finished)
+            if active >= self.max_pending:
+                raise IngestionQueueFull(
+                    f"{active} ingestion jobs are already queued or running, try again later"
+                )
+            job = IngestionJob(job_id=uuid.uuid4().hex, file_name=file_name)
+            self._jobs[job.job_id] = job
+            if key is not None:
+                self._active_keys[key] = job.job_id
+            self._trim_history()
+
+        self._executor.submit(self._run, job, work, key)
+        job_logger.info(f"Queued ingestion job {job.job_id} for {file_name}")
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stages: Dict[str, int] = {}
+            for job in self._jobs.values():
+                stages[job.stage] = stages.get(job.stage, 0) + 1
+            return stages
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(
+        self,
+        job: IngestionJob,
+        work: Callable[[IngestionJob], Dict[str, Any]],
+        key: Optional[str] = None,
+    ) -> None:
+        job.started_at = datetime.now()
+        job.set_stage("running")
+        try:
+            job.result = work(job)
+            job.set_stage("completed")
+            job_logger.info(f"Ingestion job {job.job_id} completed: {job.stage_timings}")
+        except Exception as e:
+            job.error = str(e)
+            job.set_stage("failed")
+            job_logger.error(f"Ingestion job {job.job_id} failed: {e}")
+        finally:
+            job.finished_at = datetime.now()
+            if key is not None:
+                with self._lock:
+                    self._active_keys.pop(key, None)
+
+    def _trim_history(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[: max(0, len(finished) - self.history_size)]:
+            del self._jobs[job_id]
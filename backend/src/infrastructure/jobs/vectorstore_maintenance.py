@@ -0,0 +1,65 @@
+"""
+Vector store maintenance: report dead vectors and compact collections.
+
+Run offline (not while the API is ingesting), e.g.:
+
+    python -m backend.src.infrastructure.jobs.vectorstore_maintenance --threshold 0.2
+    python -m backend.src.infrastructure.jobs.vectorstore_maintenance --dry-run
+"""
+import argparse
+import json
+from typing import List, Optional
+
+from backend.src.infrastructure.config.settings import rag_settings
+from backend.src.infrastructure.web.dependencies import build_vector_repo
+from logs.log_config import setup_logger
+
+maintenance_logger = setup_logger("vectorstore_maintenance")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Report the dead-vector ratio per collection and compact those past a threshold."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=rag_settings.VECTOR_COMPACTION_THRESHOLD,
+        help="compact a collection once this share of its stored vectors is dead",
+    )
+    parser.add_argument(
+        "--collection",
+        action="append",
+        help="only check these collections (default: all)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="report only, never compact"
+    )
+    args = parser.parse_args(argv)
+
+    vector_repo = build_vector_repo(sync_on_start=False)
+    health = vector_repo.collection_health()
+    print(json.dumps({"before": health}, indent=2))
+
+    compacted = {}
+    for name, stats in health.items():
+        if args.collection and name not in args.collection:
+            continue
+        if stats["dead"] == 0 or stats["dead_ratio"] < args.threshold:
+            continue
+        if args.dry_run:
+            print(f"{name}: dead ratio {stats['dead_ratio']:.2%} is past {args.threshold:.2%}, would compact")
+            continue
+        maintenance_logger.info(f"Compacting {name}: {stats}")
+        compacted[name] = vector_repo.compact_collection(name)
+        maintenance_logger.info(f"Compacted {name}: {compacted[name]}")
+
+    if compacted:
+        print(json.dumps({"after": compacted}, indent=2))
+    else:
+        print("No collection needed compaction.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from logs.log_config import setup_logger
+
+warmup_logger = setup_logger("vectorstore_warmup")
+
+
+class VectorStoreWarmup:
+    """
+    Builds the vector store repository on a background thread.
+
+    Construction syncs `TEXT_FILES_DIR` into Chroma, which may embed new books and
+    call external APIs, so it must not block application startup. Until it is done
+    `state` is "pending" or "warming_up"; afterwards it is "ready" or "failed".
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.state = "pending"
+        self.vector_repo: Optional[Any] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.duration_seconds: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == "ready"
+
+    def start(self) -> None:
+        """Start the sync once; later calls are no-ops while it runs or after success."""
+        with self._lock:
+            if self.state in ("warming_up", "ready"):
+                return
+            self.state = "warming_up"
+            self.error = None
+            self.started_at = datetime.now()
+            self._thread = threading.Thread(
+                target=self._run, name="vectorstore-warmup", daemon=True
+            )
+            self._thread.start()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "error": self.error,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_seconds": self.duration_seconds,
+        }
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        warmup_logger.info("Vector store sync started")
+        try:
+            self.vector_repo = self._factory()
+            self.state = "ready"
+            warmup_logger.info("Vector store sync finished")
+        except Exception as e:
+            self.error = str(e)
+            self.state = "failed"
+            warmup_logger.error(f"Vector store sync failed: {e}")
+        finally:
+            self.duration_seconds = round(time.perf_counter() - started, 3)
+            self.finished_at = datetime.now()
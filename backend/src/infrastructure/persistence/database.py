@@ -25,7 +25,8 @@ def create_tables():
     from backend.src.infrastructure.persistence.models.normal_models import (
         Base, BookModel, UserModel)
     from backend.src.infrastructure.persistence.models.rag_models import (
-        ChatMessageModel, ChatSessionModel, DocumentModel)
+        ChatMessageModel, ChatSessionModel, DocumentManifestModel, DocumentModel,
+        VectorCollectionStatsModel)
 
     # Create all tables in the main database
     Base.metadata.create_all(bind=engine)
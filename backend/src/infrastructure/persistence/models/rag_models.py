@@ -79,3 +79,40 @@ class DocumentModel(Base):
 
     # Relationship
     book: Mapped["BookModel"] = relationship(back_populates="document")
+
+
+class DocumentManifestModel(Base):
+    __tablename__ = "document_manifest"
+
+    document_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    chunk_id_prefix: Mapped[str] = mapped_column(String(64), nullable=False)
+    chunk_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    committed_chunks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    chunk_size: Mapped[Optional[int]] = mapped_column(Integer)
+    chunk_overlap: Mapped[Optional[int]] = mapped_column(Integer)
+    read_block_chars: Mapped[Optional[int]] = mapped_column(Integer)
+    strip_boilerplate: Mapped[Optional[bool]] = mapped_column(Boolean)
+    book_isbn: Mapped[Optional[str]] = mapped_column(String(13))
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.now, onupdate=datetime.now
+    )
+
+    def __repr__(self) -> str:
+        return f"<DocumentManifest(hash={self.document_hash}, status='{self.status}')>"
+
+
+class VectorCollectionStatsModel(Base):
+    """Vectors deleted from a collection since it was last compacted."""
+
+    __tablename__ = "vector_collection_stats"
+
+    collection_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    deleted_vectors: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.now, onupdate=datetime.now
+    )
+
+    def __repr__(self) -> str:
+        return f"<VectorCollectionStats(collection={self.collection_name}, deleted={self.deleted_vectors})>"
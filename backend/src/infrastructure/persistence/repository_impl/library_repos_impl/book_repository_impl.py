@@ -1,4 +1,5 @@
-from typing import List, Optional, Dict
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Dict
 
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
@@ -13,94 +14,122 @@ from backend.src.infrastructure.persistence.models.normal_models import \
 
 
 class BookRepositoryImpl(BookRepository):
-    """SQLAlchemy implementation of BookRepository."""
+    """
+    SQLAlchemy implementation of BookRepository.
 
-    def __init__(self, db_session: Session):
+    Takes the request session, or a `session_factory` for owners that outlive a
+    request, in which case every call runs in its own short session.
+    """
+
+    def __init__(
+        self,
+        db_session: Optional[Session] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ):
+        if db_session is None and session_factory is None:
+            raise ValueError("BookRepositoryImpl needs a session or a session factory")
         self.db = db_session
+        self.session_factory = session_factory
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        if self.db is not None:
+            yield self.db
+            return
+        with self.session_factory() as db:  # type: ignore[misc]
+            yield db
 
     def get_by_isbn(self, book_isbn: str) -> Optional[Book]:
-        db_book = (
-            self.db.query(BookModel).filter(BookModel.book_isbn == book_isbn).first()
-        )
-        return BookMapper.to_entity(db_book) if db_book else None
+        with self._session() as db:
+            db_book = (
+                db.query(BookModel).filter(BookModel.book_isbn == book_isbn).first()
+            )
+            return BookMapper.to_entity(db_book) if db_book else None
 
     def list(self, skip: int = 0, limit: int = 100) -> List[Book]:
-        db_books = self.db.query(BookModel).offset(skip).limit(limit).all()
-        return [BookMapper.to_entity(book) for book in db_books]
+        with self._session() as db:
+            db_books = db.query(BookModel).offset(skip).limit(limit).all()
+            return [BookMapper.to_entity(book) for book in db_books]
 
     def save(self, book: Book) -> Book:
-        db_book = BookMapper.to_model(book)
-        self.db.add(db_book)
-        self.db.commit()
-        self.db.refresh(db_book)
-        return book
+        with self._session() as db:
+            db_book = BookMapper.to_model(book)
+            db.add(db_book)
+            db.commit()
+            db.refresh(db_book)
+            return book
 
     def delete(self, book_isbn: str) -> bool:
-        db_book = (
-            self.db.query(BookModel).filter(BookModel.book_isbn == book_isbn).first()
-        )
+        with self._session() as db:
+            db_book = (
+                db.query(BookModel).filter(BookModel.book_isbn == book_isbn).first()
+            )
 
-        if db_book:
-            self.db.delete(db_book)
-            self.db.commit()
-            return True
-        return False
+            if db_book:
+                db.delete(db_book)
+                db.commit()
+                return True
+            return False
 
     def search(
         self, text_to_search: str, skip: Optional[int] = 0, limit: Optional[int] = 100
     ) -> Optional[List[Book]]:
-        search_pattern = f"%{text_to_search}%"
-        query = (
-            self.db.query(BookModel)
-            .filter(
-                or_(
-                    BookModel.title.ilike(search_pattern),
-                    BookModel.book_isbn.ilike(search_pattern),
-                    BookModel.genre.ilike(search_pattern),
-                    BookModel.summary.ilike(search_pattern),
+        with self._session() as db:
+            search_pattern = f"%{text_to_search}%"
+            query = (
+                db.query(BookModel)
+                .filter(
+                    or_(
+                        BookModel.title.ilike(search_pattern),
+                        BookModel.book_isbn.ilike(search_pattern),
+                        BookModel.genre.ilike(search_pattern),
+                        BookModel.summary.ilike(search_pattern),
+                    )
                 )
             )
-        )
-        db_books = query.offset(skip).limit(limit).all()
+            db_books = query.offset(skip).limit(limit).all()
 
-        if not db_books:
-            return None
+            if not db_books:
+                return None
 
-        return [BookMapper.to_entity(book) for book in db_books]
+            return [BookMapper.to_entity(book) for book in db_books]
 
     def update(self, book_isbn: str, book_data: dict) -> Optional[Book]:
-        db_book = (
-            self.db.query(BookModel).filter(BookModel.book_isbn == book_isbn).first()
-        )
+        with self._session() as db:
+            db_book = (
+                db.query(BookModel).filter(BookModel.book_isbn == book_isbn).first()
+            )
 
-        if not db_book:
-            return None
+            if not db_book:
+                return None
 
-        for key, value in book_data.items():
-            setattr(db_book, key, value)
+            for key, value in book_data.items():
+                setattr(db_book, key, value)
 
-        self.db.commit()
-        self.db.refresh(db_book)
+            db.commit()
+            db.refresh(db_book)
 
-        return BookMapper.to_entity(db_book)
+            return BookMapper.to_entity(db_book)
     
     def get_all_authors(self) -> List[str]:
         """Retrieve a list of all authors in the repository."""
-        authors = (
-            self.db.query(BookModel.author_name)
-            .distinct()
-            .all()
-        )
-        return [author[0] for author in authors if author[0] is not None]
+        with self._session() as db:
+            authors = (
+                db.query(BookModel.author_name)
+                .distinct()
+                .all()
+            )
+            return [author[0] for author in authors if author[0] is not None]
     
     def get_all_genres(self) -> List[str]:
         """Retrieve a list of all genres in the repository."""
-        genres = (
-            self.db.query(BookModel.genre)
-            .distinct()
-            .all()
-        )
-        return [genre[0] for genre in genres if genre[0] is not None]
+        with self._session() as db:
+            genres = (
+                db.query(BookModel.genre)
+                .distinct()
+                .all()
+            )
+            return [genre[0] for genre in genres if genre[0] is not None]
     
     def get_books_with_filter(
         self,
@@ -112,33 +141,34 @@ class BookRepositoryImpl(BookRepository):
         """
         Retrieve books filtered by genre, author, title, or publication year (exact or range).
         """
-        query = self.db.query(BookModel)
-
-        # Genre filter (multiple)
-        if genre:
-            query = query.filter(BookModel.genre.in_(genre))
-
-        # Author filter (multiple)
-        if author:
-            query = query.filter(BookModel.author_name.in_(author))
-
-        # Title filter (case-insensitive partial match)
-        if title:
-            query = query.filter(BookModel.title.ilike(f"%{title}%"))
-
-        # Published year filter (exact or range)
-        if published_year:
-            if isinstance(published_year, dict):
-                start = published_year.get("from")
-                end = published_year.get("to")
-                if start and end:
-                    query = query.filter(BookModel.published_year.between(start, end))
-                elif start:
-                    query = query.filter(BookModel.published_year >= start)
-                elif end:
-                    query = query.filter(BookModel.published_year <= end)
-            else:
-                query = query.filter(BookModel.published_year == published_year)
-
-        db_books = query.all()
-        return [BookMapper.to_entity(book) for book in db_books]
+        with self._session() as db:
+            query = db.query(BookModel)
+
+            # Genre filter (multiple)
+            if genre:
+                query = query.filter(BookModel.genre.in_(genre))
+
+            # Author filter (multiple)
+            if author:
+                query = query.filter(BookModel.author_name.in_(author))
+
+            # Title filter (case-insensitive partial match)
+            if title:
+                query = query.filter(BookModel.title.ilike(f"%{title}%"))
+
+            # Published year filter (exact or range)
+            if published_year:
+                if isinstance(published_year, dict):
+                    start = published_year.get("from")
+                    end = published_year.get("to")
+                    if start and end:
+                        query = query.filter(BookModel.published_year.between(start, end))
+                    elif start:
+                        query = query.filter(BookModel.published_year >= start)
+                    elif end:
+                        query = query.filter(BookModel.published_year <= end)
+                else:
+                    query = query.filter(BookModel.published_year == published_year)
+
+            db_books = query.all()
+            return [BookMapper.to_entity(book) for book in db_books]
@@ -0,0 +1,193 @@
+import json
+import os
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from backend.src.application.interfaces.rag_interfaces.document_manifest_repository import \
+    IDocumentManifestRepository
+from backend.src.domain.entities.rag_entities.document_manifest import \
+    DocumentManifestEntry
+from backend.src.infrastructure.adapters.mappers.rag_mappers.document_manifest_mapper import \
+    DocumentManifestMapper
+from backend.src.infrastructure.persistence.database import SessionLocal
+from backend.src.infrastructure.persistence.models.rag_models import (
+    DocumentManifestModel, VectorCollectionStatsModel)
+from logs.log_config import setup_logger
+
+doc_logger = setup_logger("document_repo")
+
+
+class DocumentManifestRepositoryImpl(IDocumentManifestRepository):
+    """
+    SQLAlchemy implementation of the document manifest.
+
+    The manifest is shared by the long-lived vector store and concurrent ingestion
+    jobs, so every call runs in its own short session and transaction instead of
+    holding on to a request session.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+
+    def get(self, document_hash: str) -> Optional[DocumentManifestEntry]:
+        with self.session_factory() as db:
+            db_entry = db.get(DocumentManifestModel, document_hash)
+            return DocumentManifestMapper.to_entity(db_entry) if db_entry else None
+
+    def is_completed(self, document_hash: str) -> bool:
+        with self.session_factory() as db:
+            return (
+                db.query(DocumentManifestModel.document_hash)
+                .filter(
+                    DocumentManifestModel.document_hash == document_hash,
+                    DocumentManifestModel.status == "completed",
+                )
+                .first()
+                is not None
+            )
+
+    def list_completed(self) -> Dict[str, str]:
+        with self.session_factory() as db:
+            rows = (
+                db.query(DocumentManifestModel.document_hash, DocumentManifestModel.filename)
+                .filter(DocumentManifestModel.status == "completed")
+                .all()
+            )
+            return {document_hash: filename for document_hash, filename in rows}
+
+    def list_all(self) -> List[DocumentManifestEntry]:
+        with self.session_factory() as db:
+            return [DocumentManifestMapper.to_entity(row) for row in db.query(DocumentManifestModel).all()]
+
+    def save(self, entry: DocumentManifestEntry) -> DocumentManifestEntry:
+        with self.session_factory() as db:
+            try:
+                db_entry = db.merge(DocumentManifestMapper.to_model(entry))
+                db.commit()
+                return DocumentManifestMapper.to_entity(db_entry)
+            except SQLAlchemyError as e:
+                db.rollback()
+                raise RuntimeError(f"Failed to save manifest of {entry.document_hash}: {e}") from e
+
+    def update_committed(self, document_hash: str, committed_chunks: int) -> None:
+        with self.session_factory() as db:
+            try:
+                db.query(DocumentManifestModel).filter(
+                    DocumentManifestModel.document_hash == document_hash
+                ).update({DocumentManifestModel.committed_chunks: committed_chunks})
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                raise RuntimeError(f"Failed to update manifest of {document_hash}: {e}") from e
+
+    def mark_deleted(self, document_hash: str) -> bool:
+        with self.session_factory() as db:
+            try:
+                updated = (
+                    db.query(DocumentManifestModel)
+                    .filter(
+                        DocumentManifestModel.document_hash == document_hash,
+                        DocumentManifestModel.status != "deleted",
+                    )
+                    .update(
+                        {
+                            DocumentManifestModel.status: "deleted",
+                            DocumentManifestModel.committed_chunks: 0,
+                        }
+                    )
+                )
+                db.commit()
+                return updated > 0
+            except SQLAlchemyError as e:
+                db.rollback()
+                raise RuntimeError(f"Failed to mark {document_hash} as deleted: {e}") from e
+
+    def delete(self, document_hash: str) -> bool:
+        with self.session_factory() as db:
+            try:
+                deleted_count = (
+                    db.query(DocumentManifestModel)
+                    .filter(DocumentManifestModel.document_hash == document_hash)
+                    .delete()
+                )
+                db.commit()
+                return deleted_count > 0
+            except SQLAlchemyError as e:
+                db.rollback()
+                raise RuntimeError(f"Failed to delete manifest of {document_hash}: {e}") from e
+
+    def add_deleted_vectors(self, collection_name: str, count: int) -> None:
+        if count <= 0:
+            return
+        with self.session_factory() as db:
+            try:
+                updated = (
+                    db.query(VectorCollectionStatsModel)
+                    .filter(VectorCollectionStatsModel.collection_name == collection_name)
+                    .update(
+                        {VectorCollectionStatsModel.deleted_vectors: VectorCollectionStatsModel.deleted_vectors + count}
+                    )
+                )
+                if not updated:
+                    db.add(VectorCollectionStatsModel(collection_name=collection_name, deleted_vectors=count))
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                raise RuntimeError(f"Failed to count deleted vectors of {collection_name}: {e}") from e
+
+    def get_deleted_vectors(self, collection_name: str) -> int:
+        with self.session_factory() as db:
+            stats = db.get(VectorCollectionStatsModel, collection_name)
+            return stats.deleted_vectors if stats else 0
+
+    def reset_deleted_vectors(self, collection_name: str) -> None:
+        with self.session_factory() as db:
+            try:
+                db.query(VectorCollectionStatsModel).filter(
+                    VectorCollectionStatsModel.collection_name == collection_name
+                ).delete()
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                raise RuntimeError(f"Failed to reset deleted vectors of {collection_name}: {e}") from e
+
+    def import_legacy_json(self, metadata_file: str) -> int:
+        """
+        One-off migration from the old `document_metadata.json`.
+
+        Only runs while the manifest table is still empty; returns the number of
+        imported documents.
+        """
+        if not os.path.exists(metadata_file):
+            return 0
+        with self.session_factory() as db:
+            if db.query(DocumentManifestModel.document_hash).first() is not None:
+                return 0
+        try:
+            with open(metadata_file, "r") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            doc_logger.error(f"Could not read legacy metadata {metadata_file}: {e}")
+            return 0
+
+        for document_hash, info in legacy.items():
+            # Legacy entries without a status were written only after full ingestion
+            status = info.get("status", "completed")
+            chunk_count = info.get("chunk_count", len(info.get("chunk_ids", [])))
+            self.save(
+                DocumentManifestEntry(
+                    document_hash=document_hash,
+                    filename=info.get("filename", ""),
+                    status=status,
+                    chunk_id_prefix=document_hash[:8],
+                    chunk_count=chunk_count or 0,
+                    committed_chunks=info.get("committed_chunks", chunk_count or 0),
+                    chunk_size=info.get("chunk_size"),
+                    chunk_overlap=info.get("chunk_overlap"),
+                    read_block_chars=info.get("read_block_chars"),
+                )
+            )
+        doc_logger.info(f"Imported {len(legacy)} documents from {metadata_file}")
+        return len(legacy)
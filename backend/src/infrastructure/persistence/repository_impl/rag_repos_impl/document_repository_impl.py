@@ -1,4 +1,5 @@
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -15,56 +16,82 @@ doc_logger = setup_logger("document_repo")
 
 
 class DocumentRepositoryImpl(IDocumentRepository):
-    """Handles document CRUD operations in the database."""
+    """
+    Handles document CRUD operations in the database.
 
-    def __init__(self, db: Session):
+    Request handlers pass their session; long-lived owners such as the vector
+    store pass a `session_factory` instead, and every call then runs in its own
+    short session.
+    """
+
+    def __init__(
+        self,
+        db: Optional[Session] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ):
+        if db is None and session_factory is None:
+            raise ValueError("DocumentRepositoryImpl needs a session or a session factory")
         self.db = db
+        self.session_factory = session_factory
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        if self.db is not None:
+            yield self.db
+            return
+        with self.session_factory() as db:  # type: ignore[misc]
+            yield db
 
     def get_all_documents(self) -> List[Document]:
         """Retrieve all documents."""
-        db_docs = self.db.query(DocumentModel).all()
-        return [DocumentMapper.to_entity(doc) for doc in db_docs]
+        with self._session() as db:
+            db_docs = db.query(DocumentModel).all()
+            return [DocumentMapper.to_entity(doc) for doc in db_docs]
 
     def save_document(self, document: Document) -> Document:
         """Persist a document entity to the database."""
-        db_doc = DocumentMapper.to_model(document)
-        self.db.add(db_doc)
-        self.db.commit()
-        self.db.refresh(db_doc)
-        return DocumentMapper.to_entity(db_doc)
+        with self._session() as db:
+            db_doc = DocumentMapper.to_model(document)
+            db.add(db_doc)
+            db.commit()
+            db.refresh(db_doc)
+            return DocumentMapper.to_entity(db_doc)
 
     def get_document_by_hash(self, content_hash: str) -> Optional[Document]:
         """Retrieve a document by its hash."""
-        db_doc = (
-            self.db.query(DocumentModel)
-            .filter(DocumentModel.hash == content_hash)
-            .first()
-        )
-        if not db_doc:
-            doc_logger.info(f"No document found with hash {content_hash}")
-        return DocumentMapper.to_entity(db_doc) if db_doc else None
+        with self._session() as db:
+            db_doc = (
+                db.query(DocumentModel)
+                .filter(DocumentModel.hash == content_hash)
+                .first()
+            )
+            if not db_doc:
+                doc_logger.info(f"No document found with hash {content_hash}")
+            return DocumentMapper.to_entity(db_doc) if db_doc else None
 
     def delete_document(self, document_hash: str) -> bool:
         """Delete a document by its hash."""
-        db_doc = (
-            self.db.query(DocumentModel)
-            .filter(DocumentModel.hash == document_hash)
-            .first()
-        )
-        if not db_doc:
-            doc_logger.info(f"No document found with hash {document_hash} to delete")
-            return False
+        with self._session() as db:
+            db_doc = (
+                db.query(DocumentModel)
+                .filter(DocumentModel.hash == document_hash)
+                .first()
+            )
+            if not db_doc:
+                doc_logger.info(f"No document found with hash {document_hash} to delete")
+                return False
 
-        self.db.delete(db_doc)
-        self.db.commit()
-        doc_logger.info(f"Deleted document with hash {document_hash}")
-        return True
+            db.delete(db_doc)
+            db.commit()
+            doc_logger.info(f"Deleted document with hash {document_hash}")
+            return True
 
     def document_exists(self, content_hash: str) -> bool:
         """Check if a document exists by hash."""
-        return (
-            self.db.query(DocumentModel)
-            .filter(DocumentModel.hash == content_hash)
-            .first()
-            is not None
-        )
+        with self._session() as db:
+            return (
+                db.query(DocumentModel)
+                .filter(DocumentModel.hash == content_hash)
+                .first()
+                is not None
+            )
@@ -0,0 +1,225 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from hashlib import sha256
+from typing import Dict, List, Sequence
+
+from langchain_core.embeddings import Embeddings
+
+from logs.log_config import setup_logger
+
+cache_logger = setup_logger("embedding_cache")
+
+
+def text_sha256(text: str) -> str:
+    return sha256(text.encode("utf-8")).hexdigest()
+
+
+def _to_blob(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _from_blob(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class SQLiteEmbeddingCache:
+    """
+    Content-addressed, size-bounded embedding store.
+
+    Vectors are kept as float32 blobs keyed by (model name, task type, sha256 of text).
+    When the cache grows past `max_entries`, the least recently used rows are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                task_type TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, task_type, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+
+    def get_many(
+        self, model: str, task_type: str, text_hashes: Sequence[str]
+    ) -> Dict[str, List[float]]:
+        """Return cached vectors for the given hashes; missing hashes are simply absent."""
+        found: Dict[str, List[float]] = {}
+        if not text_hashes:
+            return found
+        unique_hashes = list(dict.fromkeys(text_hashes))
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique_hashes), 500):
+                part = unique_hashes[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND task_type = ? AND text_hash IN ({placeholders})",
+                    (model, task_type, *part),
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = _from_blob(blob)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? "
+                    "WHERE model = ? AND task_type = ? AND text_hash = ?",
+                    [(now, model, task_type, text_hash) for text_hash in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(
+        self, model: str, task_type: str, vectors: Dict[str, Sequence[float]]
+    ) -> None:
+        if not vectors:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, task_type, text_hash, vector, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (model, task_type, text_hash, _to_blob(vector), now)
+                    for text_hash, vector in vectors.items()
+                ],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _evict(self) -> None:
+        overflow = (
+            self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            - self.max_entries
+        )
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (overflow,),
+            )
+            cache_logger.info(f"Evicted {overflow} least recently used embeddings")
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embedding model and serves repeated texts from a persistent cache.
+
+    Only cache misses are forwarded to the wrapped model, in a single call per request.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: SQLiteEmbeddingCache,
+        model_name: str,
+        document_task_type: str = "retrieval_document",
+        query_task_type: str = "retrieval_query",
+    ):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+        self.document_task_type = document_task_type
+        self.query_task_type = query_task_type
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, self.document_task_type, self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(
+            [text],
+            self.query_task_type,
+            lambda missing: [self.embeddings.embed_query(missing[0])],
+        )[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self._aembed(texts, self.document_task_type, self.embeddings.aembed_documents)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        async def embed_one(missing: List[str]) -> List[List[float]]:
+            return [await self.embeddings.aembed_query(missing[0])]
+
+        return (await self._aembed([text], self.query_task_type, embed_one))[0]
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "entries": self.cache.count(),
+        }
+
+    def _embed(self, texts: List[str], task_type: str, embed_missing) -> List[List[float]]:
+        hashes, cached, missing = self._lookup(texts, task_type)
+        if missing:
+            self._store(task_type, missing, embed_missing(list(missing.values())), cached)
+        self._count(len(texts), len(missing))
+        return [cached[text_hash] for text_hash in hashes]
+
+    async def _aembed(self, texts: List[str], task_type: str, embed_missing) -> List[List[float]]:
+        """
+        Like `_embed`, but misses go to the wrapped model's async API.
+
+        Cache reads and writes are SQLite I/O behind a lock that ingest threads also
+        hold, so they run in a worker thread instead of on the event loop.
+        """
+        hashes, cached, missing = await asyncio.to_thread(self._lookup, texts, task_type)
+        if missing:
+            vectors = await embed_missing(list(missing.values()))
+            await asyncio.to_thread(self._store, task_type, missing, vectors, cached)
+        self._count(len(texts), len(missing))
+        return [cached[text_hash] for text_hash in hashes]
+
+    def _lookup(self, texts: List[str], task_type: str):
+        hashes = [text_sha256(text) for text in texts]
+        cached = self.cache.get_many(self.model_name, task_type, hashes)
+
+        # Deduplicate misses so identical texts in one request are embedded once
+        missing: Dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in cached:
+                missing.setdefault(text_hash, text)
+        return hashes, cached, missing
+
+    def _store(self, task_type: str, missing: Dict[str, str], vectors, cached: Dict[str, List[float]]) -> None:
+        computed = dict(zip(missing.keys(), vectors))
+        self.cache.put_many(self.model_name, task_type, computed)
+        cached.update(computed)
+
+    def _count(self, total: int, missed: int) -> None:
+        with self._counter_lock:
+            self.hits += total - missed
+            self.misses += missed
@@ -0,0 +1,180 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from langchain_core.documents import Document as LCDocument
+from langchain_core.embeddings import Embeddings
+
+from backend.src.infrastructure.config.settings import rag_settings
+from logs.log_config import setup_logger
+
+pipeline_logger = setup_logger("embedding_pipeline")
+
+# Substrings of provider errors that are worth retrying (rate limits, timeouts, 5xx)
+TRANSIENT_ERROR_MARKERS = (
+    "429",
+    "500",
+    "502",
+    "503",
+    "504",
+    "rate limit",
+    "resource exhausted",
+    "resourceexhausted",
+    "quota",
+    "timeout",
+    "timed out",
+    "deadline",
+    "unavailable",
+    "connection",
+)
+
+BatchWriter = Callable[[List[LCDocument], List[List[float]]], None]
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """Return True if the embedding error looks temporary and the batch can be retried."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    message = f"{type(exc).__name__} {exc}".lower()
+    return any(marker in message for marker in TRANSIENT_ERROR_MARKERS)
+
+
+@dataclass
+class EmbeddingProgress:
+    """Running counters of an embedding pipeline run."""
+
+    total_chunks: Optional[int] = None
+    done_chunks: int = 0
+    done_batches: int = 0
+    retries: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def chunks_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.done_chunks / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        total = self.total_chunks if self.total_chunks is not None else "?"
+        return (
+            f"{self.done_chunks}/{total} chunks in {self.done_batches} batches, "
+            f"{self.elapsed_seconds:.2f}s, {self.chunks_per_second:.1f} chunks/s, "
+            f"{self.retries} retries"
+        )
+
+
+class EmbeddingPipeline:
+    """
+    Splits chunks into batches, embeds them on a bounded worker pool and hands each
+    finished batch to a writer as soon as it is ready.
+
+    Embedding calls run on worker threads; the writer is always called from the
+    calling thread, so writes to the vector store are never concurrent.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        batch_size: int = rag_settings.EMBEDDING_BATCH_SIZE,
+        max_workers: int = rag_settings.EMBEDDING_MAX_WORKERS,
+        max_retries: int = rag_settings.EMBEDDING_MAX_RETRIES,
+        backoff_seconds: float = rag_settings.EMBEDDING_RETRY_BACKOFF_SECONDS,
+        on_progress: Optional[Callable[[EmbeddingProgress], None]] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.on_progress = on_progress
+        self._retry_lock = threading.Lock()
+
+    def iter_batches(self, chunks: Iterable[LCDocument]) -> Iterator[List[LCDocument]]:
+        """Yield consecutive lists of at most `batch_size` chunks."""
+        batch: List[LCDocument] = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def run(self, chunks: Iterable[LCDocument], writer: BatchWriter) -> EmbeddingProgress:
+        """
+        Embed all chunks and write them batch by batch.
+
+        At most `2 * max_workers` batches are in flight at any time, so `chunks`
+        can be a lazy iterable without being fully materialised.
+        """
+        progress = EmbeddingProgress(
+            total_chunks=len(chunks) if hasattr(chunks, "__len__") else None  # type: ignore
+        )
+        max_in_flight = self.max_workers * 2
+        pending: Dict[Future, List[LCDocument]] = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="embedding"
+        ) as executor:
+            try:
+                for batch in self.iter_batches(chunks):
+                    pending[executor.submit(self._embed_with_retry, batch, progress)] = batch
+                    if len(pending) >= max_in_flight:
+                        self._drain(pending, writer, progress)
+                while pending:
+                    self._drain(pending, writer, progress)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        pipeline_logger.info(f"Embedding pipeline finished: {progress.summary()}")
+        return progress
+
+    def _drain(
+        self,
+        pending: Dict[Future, List[LCDocument]],
+        writer: BatchWriter,
+        progress: EmbeddingProgress,
+    ) -> None:
+        """Wait for at least one in-flight batch and write every finished one."""
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for future in done:
+            batch = pending.pop(future)
+            vectors = future.result()
+            writer(batch, vectors)
+            progress.done_chunks += len(batch)
+            progress.done_batches += 1
+            pipeline_logger.info(f"Embedded batch {progress.done_batches}: {progress.summary()}")
+            if self.on_progress:
+                self.on_progress(progress)
+
+    def _embed_with_retry(
+        self, batch: List[LCDocument], progress: EmbeddingProgress
+    ) -> List[List[float]]:
+        texts = [chunk.page_content for chunk in batch]
+        attempt = 0
+        while True:
+            try:
+                return self.embeddings.embed_documents(texts)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient_error(e):
+                    raise
+                delay = self.backoff_seconds * (2 ** attempt)
+                attempt += 1
+                with self._retry_lock:
+                    progress.retries += 1
+                pipeline_logger.warning(
+                    f"Transient embedding error ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                )
+                time.sleep(delay)
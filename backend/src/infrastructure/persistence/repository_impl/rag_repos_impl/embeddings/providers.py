@@ -0,0 +1,211 @@
+import hashlib
+import math
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import threading
+import urllib.request
+from typing import List, Optional, Tuple, cast
+
+from langchain_core.embeddings import Embeddings
+from pydantic import SecretStr
+
+from backend.src.infrastructure.config.settings import api_settings, rag_settings
+
+EMBEDDING_PROVIDERS = ("google", "onnx", "hashing")
+HASHING_TOKEN_PATTERN = re.compile(r"\w+")
+
+# The all-MiniLM-L6-v2 ONNX export chromadb publishes; the archive unpacks to onnx/
+MINILM_MODEL_URL = "https://chroma-onnx-models.s3.amazonaws.com/all-MiniLM-L6-v2/onnx.tar.gz"
+MINILM_MODEL_SHA256 = "913d7300ceae3b2dbc2c50d1de4baacab4be7b9380491c27fab7418616a16ec3"
+MINILM_MODEL_FILES = ("model.onnx", "tokenizer.json")
+MINILM_DEFAULT_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "chroma", "onnx_models", "all-MiniLM-L6-v2"
+)
+
+
+def ensure_minilm_model(model_dir: str) -> str:
+    """
+    Download and unpack the ONNX model into `model_dir` unless it is already there.
+
+    The archive's SHA-256 is checked before it is unpacked, and the files are moved
+    into place in one rename, so an interrupted download is simply retried next time.
+    Returns the folder holding model.onnx and tokenizer.json.
+    """
+    onnx_dir = os.path.join(model_dir, "onnx")
+    if all(os.path.isfile(os.path.join(onnx_dir, name)) for name in MINILM_MODEL_FILES):
+        return onnx_dir
+
+    os.makedirs(model_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(dir=model_dir)
+    try:
+        archive_path = os.path.join(staging_dir, "onnx.tar.gz")
+        digest = hashlib.sha256()
+        with urllib.request.urlopen(MINILM_MODEL_URL, timeout=60) as response, \
+                open(archive_path, "wb") as archive:
+            for block in iter(lambda: response.read(1 << 20), b""):
+                archive.write(block)
+                digest.update(block)
+        if digest.hexdigest() != MINILM_MODEL_SHA256:
+            raise RuntimeError(f"Downloaded {MINILM_MODEL_URL} does not match its SHA-256")
+
+        with tarfile.open(archive_path) as tar:
+            tar.extractall(staging_dir)
+        shutil.rmtree(onnx_dir, ignore_errors=True)
+        os.replace(os.path.join(staging_dir, "onnx"), onnx_dir)
+        return onnx_dir
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic, dependency-free embeddings for tests and offline benchmarks.
+
+    Tokens and token bigrams are hashed into a fixed number of signed buckets and the
+    result is L2-normalized, so texts sharing words get a positive cosine similarity.
+    The same text always yields the same vector, in every process.
+    """
+
+    def __init__(self, dimension: int = rag_settings.HASHING_EMBEDDING_DIMENSION):
+        self.dimension = dimension
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        tokens = HASHING_TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimension
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm:
+            vector = [value / norm for value in vector]
+        return vector
+
+
+class OnnxMiniLMEmbeddings(Embeddings):
+    """
+    Local CPU embeddings with the all-MiniLM-L6-v2 ONNX model published by chromadb.
+
+    The model is downloaded once into `model_dir` (LOCAL_EMBEDDING_MODEL_DIR) and run
+    through onnxruntime in batches of `batch_size`; `num_threads` caps ONNX Runtime's
+    intra-op thread pool (0 keeps its default of one thread per core).
+    """
+
+    MAX_TOKENS = 256
+
+    def __init__(
+        self,
+        batch_size: int = rag_settings.LOCAL_EMBEDDING_BATCH_SIZE,
+        num_threads: int = rag_settings.LOCAL_EMBEDDING_NUM_THREADS,
+        model_dir: Optional[str] = rag_settings.LOCAL_EMBEDDING_MODEL_DIR,
+    ):
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.model_dir = model_dir or MINILM_DEFAULT_DIR
+        self._session = None
+        self._tokenizer = None
+        self._load_lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._forward(texts[start:start + self.batch_size]))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._forward([text])[0]
+
+    def _load(self):
+        with self._load_lock:
+            if self._session is not None:
+                return self._session, self._tokenizer
+
+            import onnxruntime
+            from tokenizers import Tokenizer
+
+            model_dir = ensure_minilm_model(self.model_dir)
+
+            tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+            tokenizer.enable_truncation(max_length=self.MAX_TOKENS)
+            tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+            options = onnxruntime.SessionOptions()
+            options.log_severity_level = 3
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if self.num_threads > 0:
+                options.intra_op_num_threads = self.num_threads
+                options.inter_op_num_threads = 1
+            self._session = onnxruntime.InferenceSession(
+                os.path.join(model_dir, "model.onnx"),
+                sess_options=options,
+                providers=["CPUExecutionProvider"],
+            )
+            self._tokenizer = tokenizer
+            return self._session, self._tokenizer
+
+    def _forward(self, texts: List[str]) -> List[List[float]]:
+        import numpy as np
+
+        session, tokenizer = self._load()
+        encoded = tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+        last_hidden_state = session.run(
+            None,
+            {
+                "input_ids": input_ids,
+                "attention_mask": attention_mask,
+                "token_type_ids": np.zeros_like(input_ids),
+            },
+        )[0]
+
+        # Mean pooling over real tokens, then L2 normalization
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (last_hidden_state * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (pooled / norms).tolist()
+
+
+def build_embedding_provider(
+    provider: Optional[str] = None,
+) -> Tuple[Embeddings, str]:
+    """
+    Create the embedding backend named by `provider` (defaults to `EMBEDDING_PROVIDER`).
+
+    Returns the embeddings together with a stable model name; the name keys the
+    embedding cache and is recorded on the Chroma collections.
+    """
+    provider = (provider or rag_settings.EMBEDDING_PROVIDER).lower()
+
+    if provider == "google":
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        model_name = f"models/{api_settings.GOOGLE_EMBEDDING_MODEL}"
+        embeddings = GoogleGenerativeAIEmbeddings(
+            model=model_name,
+            google_api_key=cast(SecretStr, api_settings.GOOGLE_API_KEY),
+            task_type="retrieval_document",
+        )
+        return embeddings, model_name
+
+    if provider == "onnx":
+        return OnnxMiniLMEmbeddings(), "onnx/all-MiniLM-L6-v2"
+
+    if provider == "hashing":
+        dimension = rag_settings.HASHING_EMBEDDING_DIMENSION
+        return HashingEmbeddings(dimension), f"hashing/{dimension}"
+
+    raise ValueError(
+        f"Unknown EMBEDDING_PROVIDER {provider!r}, expected one of {', '.join(EMBEDDING_PROVIDERS)}"
+    )
@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.src.infrastructure.config.settings import rag_settings
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share one entry."""
+    return " ".join(query.lower().split())
+
+
+class QueryEmbeddingCache:
+    """
+    In-process LRU cache of query embeddings with a time-to-live.
+
+    Each entry remembers how long its embedding call took, so every hit adds
+    that latency to `time_saved_seconds`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = rag_settings.QUERY_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = rag_settings.QUERY_CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # normalized query -> (vector, expires_at, compute_seconds)
+        self._entries: "OrderedDict[str, Tuple[List[float], float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.time_saved_seconds = 0.0
+
+    def get_or_compute(
+        self, query: str, compute: Callable[[str], List[float]]
+    ) -> List[float]:
+        key = normalize_query(query)
+        vector = self._lookup(key)
+        if vector is not None:
+            return vector
+
+        # Compute outside the lock so a slow embedding call doesn't block other lookups
+        started = time.perf_counter()
+        vector = compute(query)
+        self._store(key, vector, time.perf_counter() - started)
+        return vector
+
+    async def aget_or_compute(
+        self, query: str, compute: Callable[[str], Awaitable[List[float]]]
+    ) -> List[float]:
+        """Async variant of `get_or_compute` for an awaitable embedding call."""
+        key = normalize_query(query)
+        vector = self._lookup(key)
+        if vector is not None:
+            return vector
+
+        started = time.perf_counter()
+        vector = await compute(query)
+        self._store(key, vector, time.perf_counter() - started)
+        return vector
+
+    def _lookup(self, key: str) -> Optional[List[float]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            vector, expires_at, compute_seconds = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.time_saved_seconds += compute_seconds
+                return vector
+            del self._entries[key]
+            return None
+
+    def _store(self, key: str, vector: List[float], compute_seconds: float) -> None:
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (vector, time.monotonic() + self.ttl_seconds, compute_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute_many(
+        self, queries: List[str], compute_many: Callable[[List[str]], List[List[float]]]
+    ) -> List[List[float]]:
+        """Batch variant of `get_or_compute`: all misses are embedded in one `compute_many` call."""
+        keys = [normalize_query(query) for query in queries]
+        vectors: Dict[str, List[float]] = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None or key in vectors:
+                    continue
+                vector, expires_at, compute_seconds = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.time_saved_seconds += compute_seconds
+                    vectors[key] = vector
+                else:
+                    del self._entries[key]
+
+        missing: Dict[str, str] = {}
+        for key, query in zip(keys, queries):
+            if key not in vectors:
+                missing.setdefault(key, query)
+
+        if missing:
+            started = time.perf_counter()
+            computed = compute_many(list(missing.values()))
+            # Spread the batch latency so hits later report a fair per-query saving
+            compute_seconds = (time.perf_counter() - started) / len(missing)
+            with self._lock:
+                for key, vector in zip(missing, computed):
+                    self.misses += 1
+                    self._entries[key] = (vector, time.monotonic() + self.ttl_seconds, compute_seconds)
+                    self._entries.move_to_end(key)
+                    vectors[key] = vector
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return [vectors[key] for key in keys]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "time_saved_seconds": round(self.time_saved_seconds, 3),
+            }
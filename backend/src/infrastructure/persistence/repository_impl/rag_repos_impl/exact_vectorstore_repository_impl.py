@@ -0,0 +1,103 @@
+import os
+from typing import Any, Dict
+
+import chromadb
+from chromadb.errors import NotFoundError
+
+from backend.src.infrastructure.config.settings import rag_settings
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.retrieval.exact_index import \
+    ExactVectorCollection
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.vectorstore_repository_impl import \
+    ChromaVectorStoreRepositoryImpl
+
+EXACT_INDEX_DIR = rag_settings.EXACT_INDEX_DIR or os.path.join(
+    rag_settings.CHROMA_PERSIST_DIR, "exact_index"
+)
+
+
+class ExactVectorStoreRepositoryImpl(ChromaVectorStoreRepositoryImpl):
+    """
+    Vector store repository that answers searches by exact brute-force similarity.
+
+    For a corpus of a few thousand chunks a vectorized dot product over a
+    memory-mapped matrix is both faster and more accurate than HNSW. Ingestion,
+    hybrid search and MMR are shared with the Chroma repository; only the
+    collections differ. Selected with `VECTOR_STORE_BACKEND=exact`.
+
+    The document manifest is shared with the Chroma backend, so a document it marks
+    completed may never have reached this index. On startup, empty collections are
+    filled from the Chroma collections in the same persist directory, and the sync
+    re-ingests any completed document that is still missing here.
+    """
+
+    def __init__(self, *args, index_directory: str = EXACT_INDEX_DIR, **kwargs):
+        self.index_directory = index_directory
+        super().__init__(*args, **kwargs)
+
+    def _create_collections(self) -> Dict[str, Any]:
+        metadata = {"hnsw:space": "cosine", "embedding_model": self.embedding_model}
+        return {
+            name: ExactVectorCollection(self.index_directory, name, metadata=metadata)
+            for name in ("book_chunks", "summary_chunks")
+        }
+
+    def _load_vectorstore(self):
+        self._bootstrap_from_chroma()
+        super()._load_vectorstore()
+
+    def _is_synced(self, document_hash: str) -> bool:
+        if not super()._is_synced(document_hash):
+            return False
+        if self.manifest_repo.get(document_hash).is_deleted:  # type: ignore[union-attr]
+            return True
+        indexed = self.collections["book_chunks"].get(
+            where={"document_hash": document_hash}, limit=1, include=()
+        )["ids"]
+        if not indexed:
+            print(f"⚠ {document_hash} is completed in the manifest but missing from the exact index, re-ingesting")
+        return bool(indexed)
+
+    def _bootstrap_from_chroma(self, page_size: int = 1000) -> None:
+        """Copy the vectors of the Chroma collections into exact collections that are still empty."""
+        empty = [name for name, collection in self.collections.items() if not collection.count()]
+        if not empty:
+            return
+        client = chromadb.PersistentClient(path=self.persist_directory)
+        for name in empty:
+            try:
+                source = client.get_collection(name)
+            except NotFoundError:
+                continue
+            recorded = (source.metadata or {}).get("embedding_model")
+            if recorded != self.embedding_model:
+                print(
+                    f"⚠ Not copying Chroma collection {name!r}: embedded with {recorded!r}, "
+                    f"not {self.embedding_model!r}"
+                )
+                continue
+
+            target = self.collections[name]
+            offset = 0
+            while True:
+                page = source.get(
+                    include=["documents", "metadatas", "embeddings"], limit=page_size, offset=offset
+                )
+                ids = page.get("ids") or []
+                if not ids:
+                    break
+                target.upsert(
+                    ids=ids,
+                    embeddings=page["embeddings"],
+                    documents=page["documents"],
+                    metadatas=page["metadatas"],
+                )
+                offset += len(ids)
+            print(f"✓ Exact index {name!r} bootstrapped with {offset} vectors from Chroma")
+
+    def _stored_vector_count(self, collection: ExactVectorCollection) -> int:
+        return collection.stored_rows()
+
+    def _rebuild_collection(self, collection_name: str) -> ExactVectorCollection:
+        collection = self.collections[collection_name]
+        collection.compact()
+        return collection
@@ -1,10 +1,14 @@
+import asyncio
+import inspect
 import json
 import operator
-from typing import Annotated, Any, Dict, List, Literal, Optional, TypedDict
+import time
+from typing import Annotated, Any, Callable, Dict, List, Literal, Optional, TypedDict
 
 from langchain_core.documents import Document
 from langchain_core.messages import (AIMessage, HumanMessage, SystemMessage,
                                      ToolMessage)
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import add_messages
 
@@ -17,6 +21,8 @@ from backend.src.infrastructure.config.promtps import (DOC_GRADER_PROMPT,
                                                        GENERATE_AFTER_FIND_BOOKS_PROMPT)
 from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.llm.llm import (
     get_big_llm, get_small_llm, get_field_extractor_llm)
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.routing.query_router import (
+    QueryRouter, greeting_reply)
 from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.tools.doc_retriever_tool import \
     get_retriever_tool
 from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.tools.search_tool import \
@@ -28,8 +34,6 @@ from backend.src.infrastructure.persistence.repository_impl.library_repos_impl.b
 from backend.src.application.interfaces.library_interfaces.book_repository import BookRepository
 from datetime import datetime
 from backend.src.domain.entities.library_entities.book import Book
-from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.tools.doc_retriever_tool import \
-    get_embedding_function
 import re
 
 def parse_model_json(content: str) -> Optional[Dict[str, Any]]:
@@ -54,6 +58,9 @@ def parse_model_json(content: str) -> Optional[Dict[str, Any]]:
         # If JSON parsing fails, return None (or you could log/raise an error)
         return None
     
+def merge_timings(left: Dict[str, float], right: Dict[str, float]) -> Dict[str, float]:
+    return {**(left or {}), **(right or {})}
+
 # --- State ---
 class State(TypedDict):
     query: str
@@ -63,30 +70,49 @@ class State(TypedDict):
     documents: List[Document]
     search_results: Annotated[List[str], operator.add]
     books_list: List[Book]
+    # find_books branches: extracted fields, then the SQL and summary matches
+    book_fields: Dict[str, Any]
+    filtered_books: List[Book]
+    summary_isbns: List[str]
+    # Milliseconds each node took; parallel branches merge theirs
+    timings: Annotated[Dict[str, float], merge_timings]
+
+
+def timed_node(name: str, node: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a node (sync or async, with or without `config`) to record its duration in `timings`."""
+    takes_config = "config" in inspect.signature(node).parameters
+
+    async def run(state: State, config: RunnableConfig) -> Dict[str, Any]:
+        started = time.perf_counter()
+        update = node(state, config) if takes_config else node(state)
+        if inspect.isawaitable(update):
+            update = await update
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        return {**update, "timings": {name: elapsed_ms}}
+
+    return run
 
 ## ROUTING THE FIRST NODE
-def route_question(state: State) -> str:
+async def llm_route(query: str) -> str:
     """
-    Route question to websearch or RAG
+    Ask the small LLM where a query should go.
     Args:
-        state (State): The current state containing the query.
+        query (str): The user query.
     Returns:
         str: Next node to call ('web_search' or 'retrieve', or 'only_greet' or "find_books")
     """
-    print("==Routing question to appropriate data source...")
+    print("==Routing question with the LLM...")
     small_llm = get_small_llm()
-    query = state["query"]
 
     sysmes = SystemMessage(ROUTER_INSTRUCTION)
     human = HumanMessage(query)
-    response = small_llm.invoke([sysmes, human])
+    response = await small_llm.ainvoke([sysmes, human])
     response.pretty_print()
 
     datasource = response.content.strip().lower()  # type: ignore
     if "find" in datasource or "find_books" in datasource or "recommend" in datasource:
         return "find_books"
     elif "web" in datasource or "search" in datasource:
-        state["web_search"] = "yes"
         print("heading to web_search")
         return "web_search"
     elif "greet" in datasource:
@@ -95,19 +121,50 @@ def route_question(state: State) -> str:
         return "retrieve"
     else:
         print(f"Unexpected routing response: {datasource}. Defaulting to web_search")
-        state["web_search"] = "yes"
         return "web_search"
 
+
+def build_query_router(vector_repo: ChromaVectorStoreRepositoryImpl) -> QueryRouter:
+    """Local router over the vector store's embeddings, falling back to `llm_route`; centroids are built here."""
+    router = QueryRouter(
+        embed_query=vector_repo.embed_query,
+        embed_documents=vector_repo.embeddings.embed_documents,
+        llm_fallback=llm_route,
+    )
+    router.fit()
+    return router
+
+
+async def route_question(state: State, router: Optional[QueryRouter] = None) -> str:
+    """
+    Route question to websearch or RAG
+    Args:
+        state (State): The current state containing the query.
+        router (QueryRouter): Local router; without it every query goes to the LLM.
+    Returns:
+        str: Next node to call ('web_search' or 'retrieve', or 'only_greet' or "find_books")
+    """
+    print("==Routing question to appropriate data source...")
+    if router is None:
+        return await llm_route(state["query"])
+    return (await router.route(state["query"], state.get("document_hash"))).route
+
 # ===============                                                 ===============
-#                  ROUTE -> FIND BOOKS -> GENERATE FINAL ANSWER 
+#       ROUTE -> FIND BOOKS -> (FILTER BOOKS | SEARCH SUMMARIES) IN PARALLEL
+#                 -> MERGE BOOKS -> GENERATE FINAL ANSWER
 # ===============                                                 ===============
-# 1: Find books (extract fields then filter based on fields and semantic search on summary)
-def find_books_node(state: State, books_repo: BookRepository, vector_repo: ChromaVectorStoreRepositoryImpl) -> State:
+# 1: Find books: extract the search fields, which both branches below work from
+async def find_books_node(
+    state: State,
+    books_repo: BookRepository,
+    config: Optional[RunnableConfig] = None,
+) -> Dict[str, Any]:
     big_llm = get_field_extractor_llm()
     query = state["query"]
 
-    author_list = books_repo.get_all_authors()
-    genre_list = books_repo.get_all_genres()
+    # The book repository is a blocking SQLAlchemy one
+    author_list = await asyncio.to_thread(books_repo.get_all_authors)
+    genre_list = await asyncio.to_thread(books_repo.get_all_genres)
 
     human_msg = HumanMessage(FIELDS_EXTRACTION_PROMPT.format(
         authors_list=", ".join(author_list),
@@ -116,49 +173,59 @@ def find_books_node(state: State, books_repo: BookRepository, vector_repo: Chrom
         current_date=datetime.now().strftime("%Y-%m-%d")
     ))
 
-    response = big_llm.invoke([human_msg])
+    response = await big_llm.ainvoke([human_msg], config)
     print(response)
-    response_content = parse_model_json(response.content)
-    # output = json.loads(response_content)
-    output = response_content   
-    filtered_book_list = books_repo.get_books_with_filter(
+    output = parse_model_json(response.content) or {}  # type: ignore
+    return {"book_fields": output}
+
+# 2a. Filter the books table on the extracted fields (runs alongside 2b)
+async def filter_books_node(state: State, books_repo: BookRepository) -> Dict[str, Any]:
+    output = state["book_fields"]
+    filtered_book_list = await asyncio.to_thread(
+        books_repo.get_books_with_filter,
         genre=output.get("Genre", None), 
         author=output.get("Author", None),
         title=output.get("Title", None),
         published_year=output.get("Publication Year", None),
         )
-    matching_book_list = filtered_book_list
-    
-    if summary := output.get("Summary", None):
-        # emb_summary = get_embedding_function().embed_query(summary)
-        print("Performing sim search")
-        matched_docs = vector_repo.get_similar_chunks(summary, rag_settings.NUM_DOCS_RETRIEVED, "summary_chunks")
-        matched_book_isbns = set()
-        print()
-        for doc in matched_docs:
-            print(doc)
-            if "book_isbn:" in doc.metadata:
-                matched_book_isbns.add(doc.metadata["book_isbn:"])
-        
-        matching_isbns = {book.book_isbn for book in matching_book_list}
-
-        for book_isbn in matched_book_isbns:
-            if book_isbn not in matching_isbns:
-                book = books_repo.get_book_by_isbn(book_isbn)
-                if book:
-                    matching_book_list.append(book)
-                    matching_isbns.add(book_isbn)
-        ## This is stricter way, taking intersection
-        # matching_book_list = [book for book in filtered_book_list if book.book_isbn in matched_book_isbns]
-        # This is less strict, concatenating all
-        # matching_book_list.extend(matched_docs)
-    
-    state["books_list"] = matching_book_list
-    
-    return state
-
-# 2. Generate from the matching books, heading to END
-def generate_after_find_books_node(state: State) -> State:
+    return {"filtered_books": filtered_book_list}
+
+# 2b. Semantic search on the book summaries (runs alongside 2a)
+async def search_summaries_node(
+    state: State, vector_repo: ChromaVectorStoreRepositoryImpl
+) -> Dict[str, Any]:
+    summary = state["book_fields"].get("Summary", None)
+    if not summary:
+        return {"summary_isbns": []}
+
+    print("Performing sim search")
+    matched_docs = await vector_repo.aget_similar_chunks(
+        query=summary, k=rag_settings.NUM_DOCS_RETRIEVED, collection_name="summary_chunks"
+    )
+    # Summary chunks carry the ISBN of their book under "isbn"
+    matched_book_isbns = [doc.metadata["isbn"] for doc in matched_docs if doc.metadata.get("isbn")]
+    return {"summary_isbns": list(dict.fromkeys(matched_book_isbns))}
+
+# 3. Merge both branches: the filtered books, then the books whose summary matched
+async def merge_books_node(state: State, books_repo: BookRepository) -> Dict[str, Any]:
+    matching_book_list = list(state["filtered_books"])
+    matching_isbns = {book.book_isbn for book in matching_book_list}
+
+    for book_isbn in state["summary_isbns"]:
+        if book_isbn not in matching_isbns:
+            book = await asyncio.to_thread(books_repo.get_by_isbn, book_isbn)
+            if book:
+                matching_book_list.append(book)
+                matching_isbns.add(book_isbn)
+    ## This is stricter way, taking intersection
+    # matching_book_list = [book for book in filtered_book_list if book.book_isbn in matched_book_isbns]
+    # This is less strict, concatenating all
+    # matching_book_list.extend(matched_docs)
+
+    return {"books_list": matching_book_list}
+
+# 4. Generate from the matching books, heading to END
+async def generate_after_find_books_node(state: State, config: RunnableConfig) -> Dict[str, Any]:
     """Generate final answer after finding books."""
     print("==Generating final answer after finding books...")
     big_llm = get_big_llm()
@@ -173,18 +240,16 @@ def generate_after_find_books_node(state: State) -> State:
                                 user_query=query, 
                                 books_list=book_status)
                              )
-    response = big_llm.invoke([human_msg])
-    response = AIMessage(response.content)
-    
-    state["messages"].append(response)
-    return state
+    response = await big_llm.ainvoke([human_msg], config)
+    # Only the new message: returning the whole state would add search_results again
+    return {"messages": [AIMessage(response.content)]}
 
 # ===============                                                 ===============
 #                 ROUTE -> DOCUMENT RETRIEVAL -> GRADE DOCUMENTS -> 
 #                 (WEB SEARCH IF NEEDED) -> GENERATE FINAL ANSWER 
 # ===============                                                 ===============
 # 1. Retrieve documents 
-def retrieve_node(state: State, vector_repo: ChromaVectorStoreRepositoryImpl) -> State:
+async def retrieve_node(state: State, vector_repo: ChromaVectorStoreRepositoryImpl) -> State:
     """Retrieve documents based on the query."""
     print("==Retrieving documents...")
 
@@ -195,7 +260,7 @@ def retrieve_node(state: State, vector_repo: ChromaVectorStoreRepositoryImpl) ->
         
         filter_dict = {"document_hash": document_hash} if document_hash else None
 
-        relevant_docs = vector_repo.get_similar_chunks(query=query, k=rag_settings.NUM_DOCS_RETRIEVED, filter_dict=filter_dict)
+        relevant_docs = await vector_repo.aget_similar_chunks(query=query, k=rag_settings.NUM_DOCS_RETRIEVED, filter_dict=filter_dict)
 
         if relevant_docs:
             state['documents'] = [doc for doc in relevant_docs]
@@ -213,67 +278,96 @@ def retrieve_node(state: State, vector_repo: ChromaVectorStoreRepositoryImpl) ->
 
 # 2. Grade document to determine whether to search, the flag means whether the documents are sufficient 
 # "yes" (document is sufficient) -> "no" (doesn't need web_search), vice versa
-def grade_documents_node(state: State) -> State:
-    """Decide whether web search is needed based on retrieved documents."""
+async def grade_documents_node(state: State, config: RunnableConfig) -> Dict[str, Any]:
+    """
+    Decide whether web search is needed based on retrieved documents.
+
+    With SPECULATIVE_WEB_SEARCH (off by default, every started search is billed) the
+    search starts alongside the grader and is cancelled if the documents are
+    sufficient; otherwise its results are already in hand.
+    """
     print("==Grading retrieved documents for relevance...")
-    big_llm = get_big_llm()
     query = state["query"]
     documents = state["documents"]
+
+    speculative_search = None
+    if rag_settings.SPECULATIVE_WEB_SEARCH:
+        speculative_search = asyncio.create_task(search_web_results(query))
+    try:
+        web_search_decision = await grade_documents(query, documents, config) if documents else "yes"
+    except BaseException:
+        if speculative_search is not None:
+            await cancel_task(speculative_search)
+        raise
+
+    update: Dict[str, Any] = {"web_search": web_search_decision}
+    if speculative_search is None:
+        return update
+    if web_search_decision == "no":
+        await cancel_task(speculative_search)
+        print("==Documents are sufficient, cancelled the speculative web search")
+        return update
+    try:
+        update["search_results"] = await speculative_search
+    except Exception as e:
+        # decide_to_generate sends the query to web_search again
+        print(f"Speculative web search failed: {e}")
+    return update
+
+async def cancel_task(task: "asyncio.Task[Any]") -> None:
+    """Cancel a task and wait for it to unwind, so it is never left pending."""
+    task.cancel()
+    # return_exceptions absorbs the task's CancelledError (or its own failure) but a
+    # cancellation of the caller still propagates
+    await asyncio.gather(task, return_exceptions=True)
+
+async def grade_documents(query: str, documents: List[Document], config: RunnableConfig) -> str:
+    """Ask the big LLM whether the documents answer the query; "no" means no web search is needed."""
+    big_llm = get_big_llm()
     formatted_docs = "\n".join(doc.page_content for doc in documents)
     human = HumanMessage(
         DOC_GRADER_PROMPT.format(document=formatted_docs, question=query)
     )
-    response = big_llm.invoke([human])
+    response = await big_llm.ainvoke([human], config)
     response.pretty_print()
-    web_search_decision = "no" if "yes" in response.content.strip().lower() else "yes"  # type: ignore
-    state["web_search"] = web_search_decision
-    return state
+    return "no" if "yes" in response.content.strip().lower() else "yes"  # type: ignore
 
 def decide_to_generate(state: State) -> str:
     """Determine whether to generate or add web search"""
     web_search = state["web_search"]
-    if web_search == "yes":
+    # A speculative search during grading may already have the results
+    if web_search == "yes" and not state["search_results"]:
         return "web_search"
     else:
         return "generate"
     
-# 3. Web search node (this is performed if documents are sufficient)
-def web_search_node(state: State) -> State:
-    """Perform web search if needed."""
-    web_search_tool = search_web
+# 3. Web search node (this is performed if documents are not sufficient)
+async def search_web_results(query: str) -> List[str]:
+    search_result = await search_web.ainvoke(query)
+    print(search_result)
+    return [item["content"] for item in search_result["results"]]
 
+async def web_search_node(state: State) -> Dict[str, Any]:
+    """Perform web search if needed."""
     print(f"==Performing web search...{state['web_search']}")
 
     if state["web_search"] == "yes":
-        search_result = web_search_tool.invoke(state["query"])
-        print(search_result)
-
-        for item in search_result["results"]:
-            cur_msg = item["content"]
-            state["search_results"].append(cur_msg)
-
-        return state
-    return state
+        return {"search_results": await search_web_results(state["query"])}
+    return {}
 
 # ===============                                                 ===============
 #                  ROUTE -> ONLY_GREET -> GENERATE FINAL ANSWER 
 # ===============                                                 ===============
 def only_greet(state: State) -> State:
-    """Generate a greeting response."""
+    """Answer a greeting from a template, without an LLM call."""
     print("==Generating greeting response...")
-    small_llm = get_small_llm()
-    query = state["query"]
-
-    human = HumanMessage(query)
-    response = small_llm.invoke([human])
-    ai_response = AIMessage(response.content)
-    state["messages"].append(ai_response)  # Add this line
+    state["messages"].append(AIMessage(greeting_reply(state["query"])))
     return state
 
 # ===============                                                 ===============
 #                          THE FINAL GENERATE ANSWER NODE 
 # ===============                                                 ===============
-def generate_node(state: State) -> State:
+async def generate_node(state: State, config: RunnableConfig) -> Dict[str, Any]:
     """Generate final answer based on retrieved documents and web search if needed."""
     print("==Generating final answer...")
     big_llm = get_big_llm()
@@ -288,34 +382,76 @@ def generate_node(state: State) -> State:
 
     human_msg = HumanMessage(RAG_PROMPT.format(context=docs_and_search, question=query))
 
-    response = big_llm.invoke([human_msg])
-    response = AIMessage(response.content)
-    state["messages"].append(response)
-    return state
+    response = await big_llm.ainvoke([human_msg], config)
+    # Only the new message: returning the whole state would add search_results again
+    return {"messages": [AIMessage(response.content)]}
 
 
 # --- Main graph builder ---
-def build_graph(vector_repo: IVectorStoreRepository, books_repo: BookRepository) -> StateGraph:
-    graph = StateGraph(State)
+def build_graph(
+    vector_repo: IVectorStoreRepository,
+    books_repo: Optional[BookRepository] = None,
+    router: Optional[QueryRouter] = None,
+) -> StateGraph:
+    """
+    Compile the RAG graph once; it can be shared by concurrent requests.
 
-    # add functionalities: retrieve, web_search, generate, grade_documents, only_greet, find_books
-    def retrieve_with_repo(state: State) -> State:
-        return retrieve_node(state, vector_repo)  # type: ignore
+    The nodes are async, so run it with `ainvoke`/`astream`. Nodes calling an LLM pass
+    their `config` on explicitly: on Python 3.10 the callbacks (token streaming, tracing)
+    do not reach the model otherwise.
 
-    graph.add_node("retrieve", retrieve_with_repo)
-    graph.add_node("web_search", web_search_node)
-    graph.add_node("generate", generate_node)
-    graph.add_node("grade_documents", grade_documents_node)
-    graph.add_node("only_greet", only_greet)
+    Independent steps run in parallel: find_books fans out to the SQL filter and the
+    summary search, and grading starts a speculative web search. Every node records its
+    duration in `timings` so the branches can be compared.
 
-    def find_books_with_repos(state: State) -> State:
-        return find_books_node(state, books_repo, vector_repo)  # type: ignore
-    
-    graph.add_node("find_books", find_books_with_repos)
-    graph.add_node("generate_after_find_books", generate_after_find_books_node)
+    `books_repo` is bound to a DB session, so callers that share the graph pass theirs
+    per run as `config={"configurable": {"books_repo": ...}}`, which wins over this one.
+    Without a `router` one is built when LOCAL_ROUTER_ENABLED is set.
+    """
+    if router is None and rag_settings.LOCAL_ROUTER_ENABLED:
+        router = build_query_router(vector_repo)  # type: ignore
+    graph = StateGraph(State)
+
+    # add functionalities: retrieve, web_search, generate, grade_documents, only_greet, find_books
+    # every node records its duration in state["timings"]
+    async def retrieve_with_repo(state: State) -> State:
+        return await retrieve_node(state, vector_repo)  # type: ignore
+
+    graph.add_node("retrieve", timed_node("retrieve", retrieve_with_repo))
+    graph.add_node("web_search", timed_node("web_search", web_search_node))
+    graph.add_node("generate", timed_node("generate", generate_node))
+    graph.add_node("grade_documents", timed_node("grade_documents", grade_documents_node))
+    graph.add_node("only_greet", timed_node("only_greet", only_greet))
+
+    def repo_for_run(config: RunnableConfig) -> BookRepository:
+        return (config.get("configurable") or {}).get("books_repo", books_repo)
+
+    async def find_books_with_repo(state: State, config: RunnableConfig) -> Dict[str, Any]:
+        return await find_books_node(state, repo_for_run(config), config)  # type: ignore
+
+    async def filter_books_with_repo(state: State, config: RunnableConfig) -> Dict[str, Any]:
+        return await filter_books_node(state, repo_for_run(config))  # type: ignore
+
+    async def search_summaries_with_repo(state: State) -> Dict[str, Any]:
+        return await search_summaries_node(state, vector_repo)  # type: ignore
+
+    async def merge_books_with_repo(state: State, config: RunnableConfig) -> Dict[str, Any]:
+        return await merge_books_node(state, repo_for_run(config))  # type: ignore
+
+    graph.add_node("find_books", timed_node("find_books", find_books_with_repo))
+    graph.add_node("filter_books", timed_node("filter_books", filter_books_with_repo))
+    graph.add_node("search_summaries", timed_node("search_summaries", search_summaries_with_repo))
+    graph.add_node("merge_books", timed_node("merge_books", merge_books_with_repo))
+    graph.add_node(
+        "generate_after_find_books",
+        timed_node("generate_after_find_books", generate_after_find_books_node),
+    )
     # route the first question to the first node
+    async def route_with_router(state: State) -> str:
+        return await route_question(state, router)
+
     graph.set_conditional_entry_point(
-        route_question,
+        route_with_router,
         {
             "find_books": "find_books",
             "web_search": "web_search",
@@ -336,8 +472,12 @@ def build_graph(vector_repo: IVectorStoreRepository, books_repo: BookRepository)
     )
     # after web_search, go to generate
     graph.add_edge("web_search", "generate")
-    # after find_books, go to generate
-    graph.add_edge("find_books", "generate_after_find_books")
+    # after find_books, the SQL filter and the summary search run in the same step;
+    # merge_books waits for both, then generate
+    graph.add_edge("find_books", "filter_books")
+    graph.add_edge("find_books", "search_summaries")
+    graph.add_edge(["filter_books", "search_summaries"], "merge_books")
+    graph.add_edge("merge_books", "generate_after_find_books")
     
     # these nodes lead to the end
     graph.add_edge("generate", END)
@@ -0,0 +1,75 @@
+import re
+from typing import Callable, Iterable, Iterator, List, Optional
+
+GUTENBERG_START = re.compile(
+    r"^\s*\*{3}\s*START OF (THE|THIS) PROJECT GUTENBERG E-?BOOK", re.IGNORECASE
+)
+GUTENBERG_END = re.compile(
+    r"^\s*(\*{3}\s*END OF (THE|THIS) PROJECT GUTENBERG E-?BOOK"
+    r"|END OF (THE )?PROJECT GUTENBERG'?S? E-?BOOK"
+    r"|\*END\*THE SMALL PRINT)",
+    re.IGNORECASE,
+)
+# Files without a start marker within this many header lines have no Gutenberg header
+MAX_HEADER_LINES = 400
+
+
+class GutenbergBoilerplateFilter:
+    """
+    Streams text blocks through, dropping the Project Gutenberg license header and footer.
+
+    Everything up to and including the `*** START OF ... ***` line and everything from
+    the `*** END OF ... ***` line on is removed. Files without markers pass unchanged.
+    Only whole lines are inspected, so markers split across blocks are still found.
+    """
+
+    def __init__(self, count_tokens: Optional[Callable[[str], int]] = None):
+        self.count_tokens = count_tokens
+        self.stripped_chars = 0
+        self.stripped_tokens = 0
+
+    def filter(self, blocks: Iterable[str]) -> Iterator[str]:
+        header: List[str] = []
+        in_header = True
+        in_footer = False
+        partial = ""
+
+        for block in blocks:
+            lines = (partial + block).splitlines(keepends=True)
+            # The last line may continue in the next block
+            partial = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+            emitted: List[str] = []
+            for line in lines:
+                if in_footer:
+                    self._strip(line)
+                elif in_header:
+                    header.append(line)
+                    if GUTENBERG_START.match(line):
+                        self._strip("".join(header))
+                        header, in_header = [], False
+                    elif len(header) >= MAX_HEADER_LINES:
+                        emitted.extend(header)
+                        header, in_header = [], False
+                elif GUTENBERG_END.match(line):
+                    in_footer = True
+                    self._strip(line)
+                else:
+                    emitted.append(line)
+            if emitted:
+                yield "".join(emitted)
+
+        if partial:
+            if in_header:
+                header.append(partial)
+            elif in_footer:
+                self._strip(partial)
+            else:
+                yield partial
+        if header:
+            # Short file that never reached a start marker
+            yield "".join(header)
+
+    def _strip(self, text: str) -> None:
+        self.stripped_chars += len(text)
+        if self.count_tokens:
+            self.stripped_tokens += self.count_tokens(text)
@@ -0,0 +1,130 @@
+import hashlib
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.src.infrastructure.config.settings import rag_settings
+
+WORD_PATTERN = re.compile(r"\w+")
+FINGERPRINT_BITS = 64
+SHINGLE_SIZE = 3
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash over word 3-shingles; None for texts too short to fingerprint."""
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return None
+    shingles = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))]
+    weights = [0] * FINGERPRINT_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+class NearDuplicateDetector:
+    """
+    Finds chunks whose SimHash is within `max_distance` bits of one already seen in
+    the same document.
+
+    Matches never cross documents: every document's manifest owns its whole chunk id
+    range, so a chunk skipped in favour of another document's copy would leave that
+    document with missing text.
+
+    Fingerprints are split into `max_distance + 1` bands; by the pigeonhole principle
+    two fingerprints that differ in at most `max_distance` bits share a whole band,
+    so only fingerprints in the same band buckets have to be compared.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = rag_settings.NEAR_DUPLICATE_MAX_DISTANCE,
+        min_words: int = rag_settings.NEAR_DUPLICATE_MIN_WORDS,
+    ):
+        self.max_distance = max_distance
+        self.min_words = min_words
+        self.n_bands = max_distance + 1
+        self.band_bits = -(-FINGERPRINT_BITS // self.n_bands)
+        self._buckets: Dict[Tuple[int, int], List[Tuple[int, Optional[str]]]] = {}
+        self._lock = threading.Lock()
+        self.size = 0
+
+    def is_duplicate(self, text: str, document_hash: Optional[str] = None) -> bool:
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return False
+        with self._lock:
+            return self._find(fingerprint, document_hash)
+
+    def add(self, text: str, document_hash: Optional[str] = None) -> None:
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return
+        with self._lock:
+            self._add(fingerprint, document_hash)
+
+    def check_and_add(self, text: str, document_hash: Optional[str] = None) -> bool:
+        """Return True if `text` repeats a chunk of the same document; otherwise remember it."""
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return False
+        with self._lock:
+            if self._find(fingerprint, document_hash):
+                return True
+            self._add(fingerprint, document_hash)
+            return False
+
+    def remove_document(self, document_hash: str) -> None:
+        with self._lock:
+            for key, entries in list(self._buckets.items()):
+                kept = [entry for entry in entries if entry[1] != document_hash]
+                if kept:
+                    self._buckets[key] = kept
+                else:
+                    del self._buckets[key]
+            # Every fingerprint sits in exactly one bucket of band 0
+            self.size = sum(len(entries) for (band, _), entries in self._buckets.items() if band == 0)
+
+    def seed_from_collection(
+        self, collection: Any, where: Optional[Dict[str, Any]] = None, page_size: int = 1000
+    ) -> int:
+        """Fingerprint the chunks already stored in a Chroma collection (optionally filtered)."""
+        offset = 0
+        while True:
+            page = collection.get(
+                where=where, include=["documents", "metadatas"], limit=page_size, offset=offset
+            )
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            metadatas = page.get("metadatas") or [{}] * len(ids)
+            for text, metadata in zip(page.get("documents") or [], metadatas):
+                self.add(text or "", (metadata or {}).get("document_hash"))
+            offset += len(ids)
+        return self.size
+
+    def _fingerprint(self, text: str) -> Optional[int]:
+        if len(WORD_PATTERN.findall(text)) < self.min_words:
+            return None  # short chunks (headings, dialogue tags) collide too easily
+        return simhash(text)
+
+    def _bands(self, fingerprint: int):
+        mask = (1 << self.band_bits) - 1
+        for band in range(self.n_bands):
+            yield band, fingerprint >> (band * self.band_bits) & mask
+
+    def _find(self, fingerprint: int, document_hash: Optional[str]) -> bool:
+        for key in self._bands(fingerprint):
+            for candidate, candidate_hash in self._buckets.get(key, ()):
+                if candidate_hash != document_hash:
+                    continue
+                if bin(candidate ^ fingerprint).count("1") <= self.max_distance:
+                    return True
+        return False
+
+    def _add(self, fingerprint: int, document_hash: Optional[str]) -> None:
+        for key in self._bands(fingerprint):
+            self._buckets.setdefault(key, []).append((fingerprint, document_hash))
+        self.size += 1
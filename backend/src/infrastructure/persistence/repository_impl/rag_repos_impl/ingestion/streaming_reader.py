@@ -0,0 +1,58 @@
+from typing import Iterable, Iterator
+
+import chardet
+from langchain_text_splitters import TextSplitter
+
+from backend.src.infrastructure.config.settings import rag_settings
+
+
+def detect_encoding(
+    file_path: str, sample_bytes: int = rag_settings.INGEST_ENCODING_SAMPLE_BYTES
+) -> str:
+    """Guess the file encoding from a bounded sample instead of the whole file."""
+    with open(file_path, "rb") as file:
+        sample = file.read(sample_bytes)
+    encoding = chardet.detect(sample)["encoding"]
+    # A pure-ASCII sample says nothing about the rest of the file; utf-8 is a safe superset
+    if not encoding or encoding.lower() == "ascii":
+        return "utf-8"
+    return encoding
+
+
+def iter_text_blocks(
+    file_path: str,
+    encoding: str,
+    block_chars: int = rag_settings.INGEST_READ_BLOCK_CHARS,
+) -> Iterator[str]:
+    """Decode the file incrementally, yielding blocks of at most `block_chars` characters."""
+    with open(file_path, "r", encoding=encoding, errors="replace") as file:
+        while True:
+            block = file.read(block_chars)
+            if not block:
+                return
+            yield block
+
+
+def iter_split_text(blocks: Iterable[str], splitter: TextSplitter) -> Iterator[str]:
+    """
+    Run `splitter` over a stream of text blocks and yield chunks as soon as they are final.
+
+    The last chunk of every window may continue into the next block, so it is held
+    back and re-split together with the following block. Only one window of text
+    is ever held in memory.
+    """
+    carry = ""
+    for block in blocks:
+        window = carry + block
+        pieces = splitter.split_text(window)
+        if not pieces:
+            carry = ""
+            continue
+        for piece in pieces[:-1]:
+            yield piece
+        # Keep the raw tail (including whitespace the splitter strips) for the next window
+        tail_start = window.rfind(pieces[-1])
+        carry = window[tail_start:] if tail_start != -1 else pieces[-1]
+
+    if carry:
+        yield from splitter.split_text(carry)
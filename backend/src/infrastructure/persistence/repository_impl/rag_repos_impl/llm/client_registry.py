@@ -0,0 +1,294 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Deque, Dict, Tuple
+
+import httpx
+from langchain_cerebras import ChatCerebras
+from langchain_openai import ChatOpenAI
+
+from backend.src.infrastructure.config.settings import api_settings, rag_settings
+from logs.log_config import setup_logger
+
+llm_logger = setup_logger("llm_clients")
+
+CEREBRAS_BASE_URL = "https://api.cerebras.ai/v1"
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    client: str  # "cerebras" or "openai" (OpenAI-compatible endpoint)
+    model: str
+    temperature: float
+
+
+MODEL_SPECS: Dict[str, ModelSpec] = {
+    "small": ModelSpec("cerebras", "llama3.1-8b", 0.1),
+    "big": ModelSpec("cerebras", "llama-3.3-70b", 0.1),
+    "decent": ModelSpec("cerebras", "llama-3.3-70b", 0.1),
+    "field_extractor": ModelSpec("openai", "llama-3.3-70b", 0.0),
+}
+
+
+def _resolve_waiter(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the calls in flight to one model, from threads and from the event loop alike.
+
+    Async callers that hit the limit wait on a future of their own loop, which
+    `release` resolves, so waiting never ties up a thread and a cancelled waiter
+    holds no permit.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self.calls = 0
+        self.waited = 0
+        self.in_flight = 0
+        self._wait_seconds = 0.0
+
+    def acquire(self) -> None:
+        if not self._semaphore.acquire(blocking=False):
+            started = time.perf_counter()
+            self._semaphore.acquire()
+            self._record_wait(time.perf_counter() - started)
+        self._enter()
+
+    async def aacquire(self) -> None:
+        if not self._semaphore.acquire(blocking=False):
+            started = time.perf_counter()
+            await self._await_permit()
+            self._record_wait(time.perf_counter() - started)
+        self._enter()
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+        self._wake_one()
+
+    async def _await_permit(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            waiter = loop.create_future()
+            with self._lock:
+                self._async_waiters.append((loop, waiter))
+            # Retry only once registered, so a release in between still wakes us
+            if self._semaphore.acquire(blocking=False):
+                self._discard_waiter(loop, waiter)
+                return
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                self._discard_waiter(loop, waiter)
+                raise
+
+    def _discard_waiter(self, loop: asyncio.AbstractEventLoop, waiter: asyncio.Future) -> None:
+        with self._lock:
+            try:
+                self._async_waiters.remove((loop, waiter))
+                return
+            except ValueError:
+                pass
+        # A release already picked this waiter; hand its wake-up to the next one
+        self._wake_one()
+
+    def _wake_one(self) -> None:
+        with self._lock:
+            while self._async_waiters:
+                loop, waiter = self._async_waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(_resolve_waiter, waiter)
+                    return
+                except RuntimeError:
+                    continue  # the waiter's loop is closed
+
+    def _enter(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+
+    def _record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.waited += 1
+            self._wait_seconds += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "calls": self.calls,
+                "waited": self.waited,
+                "avg_wait_ms": round(self._wait_seconds / self.waited * 1000, 3) if self.waited else 0.0,
+            }
+
+
+class LimitedChatModel:
+    """
+    A chat model whose calls go through the concurrency limiter of its model.
+
+    `invoke`, `ainvoke`, `stream` and `astream` are limited; everything else is
+    delegated to the wrapped model unchanged.
+    """
+
+    def __init__(self, llm: Any, limiter: ConcurrencyLimiter):
+        self.llm = llm
+        self.limiter = limiter
+
+    def invoke(self, *args, **kwargs):
+        self.limiter.acquire()
+        try:
+            return self.llm.invoke(*args, **kwargs)
+        finally:
+            self.limiter.release()
+
+    async def ainvoke(self, *args, **kwargs):
+        await self.limiter.aacquire()
+        try:
+            return await self.llm.ainvoke(*args, **kwargs)
+        finally:
+            self.limiter.release()
+
+    def stream(self, *args, **kwargs):
+        self.limiter.acquire()
+        try:
+            yield from self.llm.stream(*args, **kwargs)
+        finally:
+            self.limiter.release()
+
+    async def astream(self, *args, **kwargs):
+        await self.limiter.aacquire()
+        try:
+            async for chunk in self.llm.astream(*args, **kwargs):
+                yield chunk
+        finally:
+            self.limiter.release()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.llm, name)
+
+
+class LLMClientRegistry:
+    """
+    Process-wide LLM clients sharing one pooled HTTP client (and one async one).
+
+    Every chat model is built once, on first use, on top of the shared `httpx`
+    clients, so connections stay alive between graph nodes and requests instead of
+    paying a TLS handshake per call. Models with the same name on the provider share
+    a concurrency limit (`LLM_MODEL_CONCURRENCY`, default `LLM_MAX_CONCURRENCY`).
+    `stats()` counts requests and newly opened connections, which shows the reuse.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = rag_settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections: int = rag_settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = rag_settings.LLM_KEEPALIVE_EXPIRY_SECONDS,
+        timeout: float = rag_settings.LLM_TIMEOUT_SECONDS,
+        connect_timeout: float = rag_settings.LLM_CONNECT_TIMEOUT_SECONDS,
+    ):
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        timeouts = httpx.Timeout(timeout, connect=connect_timeout)
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+        self.http_client = httpx.Client(
+            limits=limits, timeout=timeouts, event_hooks={"request": [self._on_request]}
+        )
+        self.http_async_client = httpx.AsyncClient(
+            limits=limits, timeout=timeouts, event_hooks={"request": [self._aon_request]}
+        )
+        self._clients: Dict[str, LimitedChatModel] = {}
+        self._limiters: Dict[str, ConcurrencyLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> LimitedChatModel:
+        """Return the shared client for a model in `MODEL_SPECS`, building it on first use."""
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                spec = MODEL_SPECS[name]
+                limiter = self._limiters.get(spec.model)
+                if limiter is None:
+                    limit = rag_settings.LLM_MODEL_CONCURRENCY.get(
+                        spec.model, rag_settings.LLM_MAX_CONCURRENCY
+                    )
+                    limiter = self._limiters[spec.model] = ConcurrencyLimiter(limit)
+                client = self._clients[name] = LimitedChatModel(self._build(spec), limiter)
+                llm_logger.info(f"Built LLM client {name!r} ({spec.model})")
+            return client
+
+    def _build(self, spec: ModelSpec) -> Any:
+        common = dict(
+            model=spec.model,
+            api_key=api_settings.CEREBRAS_API_KEY,  # type: ignore
+            base_url=CEREBRAS_BASE_URL,
+            temperature=spec.temperature,
+            http_client=self.http_client,
+            http_async_client=self.http_async_client,
+        )
+        if spec.client == "openai":
+            return ChatOpenAI(**common)
+        return ChatCerebras(**common)
+
+    # httpcore reports its steps through the "trace" extension; a TCP connect only
+    # happens when a request cannot reuse a pooled connection
+    def _on_request(self, request: httpx.Request) -> None:
+        self._count_request()
+        request.extensions["trace"] = self._trace
+
+    async def _aon_request(self, request: httpx.Request) -> None:
+        self._count_request()
+        request.extensions["trace"] = self._atrace
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._stats_lock:
+                self.connections_opened += 1
+
+    async def _atrace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._trace(event_name, info)
+
+    def _count_request(self) -> None:
+        with self._stats_lock:
+            self.requests += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            requests, opened = self.requests, self.connections_opened
+        with self._lock:
+            limiters = {model: limiter.stats() for model, limiter in self._limiters.items()}
+            clients = sorted(self._clients)
+        return {
+            "requests": requests,
+            "connections_opened": opened,
+            "connection_reuse_ratio": round(1 - opened / requests, 3) if requests else 0.0,
+            "clients": clients,
+            "models": limiters,
+        }
+
+    async def aclose(self) -> None:
+        self.http_client.close()
+        await self.http_async_client.aclose()
+
+
+@lru_cache(maxsize=1)
+def get_llm_registry() -> LLMClientRegistry:
+    """The process-wide registry; build it once and share it."""
+    return LLMClientRegistry()
@@ -1,56 +1,31 @@
-from typing import cast
+from pydantic import BaseModel, Field
 
-from langchain_cerebras import ChatCerebras
-from langchain_openai import ChatOpenAI
-from pydantic import BaseModel, Field, SecretStr
-
-from backend.src.infrastructure.config.settings import api_settings
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.llm.client_registry import (
+    LimitedChatModel, get_llm_registry)
 
 
 class ToolCallerRequest(BaseModel):
     query: str = Field(description="The input query for the tool caller LLM")
 
 
-def get_small_llm():
+def get_small_llm() -> LimitedChatModel:
     """
-    Initializes and returns the ChatCerebras LLM instance.
-    Raises ValueError if the API key is not configured.
+    Returns the shared ChatCerebras client of the small model.
+
+    All getters hand out process-wide clients from the LLM client registry; they
+    share pooled keep-alive HTTP connections and a per-model concurrency limit.
     """
+    return get_llm_registry().get("small")
+
+
+def get_big_llm() -> LimitedChatModel:
+    return get_llm_registry().get("big")
+
+
+def get_decent_llm() -> LimitedChatModel:
+    return get_llm_registry().get("decent")
+
 
-    llm = ChatCerebras(
-        model="llama3.1-8b",
-        api_key=api_settings.CEREBRAS_API_KEY,  # type: ignore
-        base_url="https://api.cerebras.ai/v1",
-        temperature=0.1,
-    )
-    return llm
-
-
-def get_big_llm():
-    llm = ChatCerebras(
-        model="llama-3.3-70b",
-        api_key=api_settings.CEREBRAS_API_KEY,  # type: ignore
-        base_url="https://api.cerebras.ai/v1",
-        temperature=0.1,
-    )
-    return llm
-
-
-def get_decent_llm():
-    llm = ChatCerebras(
-        model="llama-3.3-70b",
-        api_key=api_settings.CEREBRAS_API_KEY,  # type: ignore
-        base_url="https://api.cerebras.ai/v1",
-        temperature=0.1,
-    )
-    return llm
-
-def get_field_extractor_llm():
-    llm = ChatOpenAI(
-        model="llama-3.3-70b",
-        api_key=api_settings.CEREBRAS_API_KEY,  # type: ignore
-        base_url="https://api.cerebras.ai/v1",
-        temperature=0.0,
-        # model_kwargs={"response_format": "json_object"}
-    )
-    return llm
\ No newline at end of file
+def get_field_extractor_llm() -> LimitedChatModel:
+    # OpenAI-compatible client against Cerebras, temperature 0 for field extraction
+    return get_llm_registry().get("field_extractor")
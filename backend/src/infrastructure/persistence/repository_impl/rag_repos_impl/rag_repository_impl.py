@@ -1,6 +1,7 @@
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 """Single authoritative RAG repository implementation.
 
@@ -10,6 +11,8 @@ There used to be a duplicate graph-only implementation in
 as the canonical provider of the IRAGRepository contract.
 """
 
+from langchain_core.messages import AIMessageChunk
+
 from backend.src.application.interfaces.library_interfaces.book_repository import BookRepository
 from backend.src.application.interfaces.rag_interfaces.chat_session_repository import \
     IChatSessionRepository
@@ -26,6 +29,10 @@ from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.llm.l
 
 logger = logging.getLogger(__name__)
 
+# Nodes whose last message is the answer; the two generate nodes stream their tokens
+ANSWER_NODES = ("generate", "generate_after_find_books", "only_greet")
+NO_ANSWER_MESSAGE = "I'm sorry — I couldn't find an answer in the specified document."
+
 
 class LangGraphRAGRepositoryImpl(IRAGRepository):
     """LangGraph-based RAG repository implementing IRAGRepository.
@@ -34,27 +41,49 @@ class LangGraphRAGRepositoryImpl(IRAGRepository):
     chat repository and the compiled graph are required for answering
     queries, but vector/embedding repositories can be provided for
     extended functionality or future hooks.
+
+    The API passes in the graph and LLM clients of the resource container, so a
+    request only wraps them; without them they are built here.
     """
 
     def __init__(
         self,
         vector_repo: IVectorStoreRepository,
         chat_repo: IChatSessionRepository,
-        books_repo: BookRepository
+        books_repo: BookRepository,
+        graph: Optional[Any] = None,
+        llms: Optional[Dict[str, Any]] = None,
     ):
         self.vector_repo = vector_repo
         self.chat_repo = chat_repo
-        self.graph = build_graph(vector_repo=vector_repo, books_repo=books_repo)  
-        self.small_llm = get_small_llm()
-        self.decent_llm = get_decent_llm()
-        self.big_llm = get_big_llm()
+        self.books_repo = books_repo
+        self.graph = graph if graph is not None else build_graph(vector_repo=vector_repo)
+        llms = llms or {}
+        self.small_llm = llms.get("small") or get_small_llm()
+        self.decent_llm = llms.get("decent") or get_decent_llm()
+        self.big_llm = llms.get("big") or get_big_llm()
 
     def initialize_graph(self) -> Any:
         """Return the compiled graph-like object (framework-agnostic)."""
         return self.graph
 
     # ---------- Helpers ----------
-    def _run_graph_and_get_last_content(
+    def _graph_input(self, query: str, document_hash: Optional[str]) -> Dict[str, Any]:
+        return {
+            "query": query,
+            "messages": [("user", query)],
+            "documents": [],
+            "search_results": [],
+            "web_search": "yes",
+            "document_hash": document_hash,
+            "books_list": [],
+            "book_fields": {},
+            "filtered_books": [],
+            "summary_isbns": [],
+            "timings": {},
+        }
+
+    async def _run_graph_and_get_last_content(
         self,
         messages_payload: List[tuple],
         query: str,
@@ -64,34 +93,33 @@ class LangGraphRAGRepositoryImpl(IRAGRepository):
         Run the compiled graph with given messages payload and return the final message.content.
         """
         try:
-            events = self.graph.stream(  # type: ignore
-                {
-                    "query": query,
-                    "messages": messages_payload,  # list of ("user", text)
-                    "documents": [],
-                    "search_results": [],
-                    "web_search": "yes",
-                    "document_hash": document_hash,
-                    "books_list": []
-                },
+            events = self.graph.astream(  # type: ignore
+                # messages_payload: list of ("user", text)
+                {**self._graph_input(query, document_hash), "messages": messages_payload},
+                # The graph is shared across requests; the book repository is this request's
+                config={"configurable": {"books_repo": self.books_repo}},
                 stream_mode="values",
             )
 
             last_content: Optional[str] = None
-            for event in events:
+            timings: Dict[str, float] = {}
+            async for event in events:
+                if event and event.get("timings"):
+                    timings = event["timings"]
                 if event and "messages" in event and event["messages"]:
                     last_msg = event["messages"][-1]
                     content = getattr(last_msg, "content", None)
                     if content:
                         last_content = content
 
+            logger.info("Graph node timings (ms): %s", timings)
             return last_content or ""
         except Exception as e:
             logger.exception("Error while running graph: %s", e)
             return ""
 
 
-    def summarize_history(self, formatted_history: List[Dict[str, Any]]) -> str:
+    async def summarize_history(self, formatted_history: List[Dict[str, Any]]) -> str:
         """
         Summarize chat history for context.
 
@@ -110,7 +138,7 @@ class LangGraphRAGRepositoryImpl(IRAGRepository):
 
         # Run the graph with a system/system-like prompt then a user summarization request
         try:
-            result = self.decent_llm.invoke(summarization_prompt).content
+            result = (await self.decent_llm.ainvoke(summarization_prompt)).content
             return (
                 result
                 or f"Conversation of {len(formatted_history)} messages about various topics."
@@ -119,7 +147,7 @@ class LangGraphRAGRepositoryImpl(IRAGRepository):
             logger.exception("summarize_history fallback: %s", e)
             return f"Conversation of {len(formatted_history)} messages about various topics."
 
-    def revise_query_with_context(self, query: str, context: str) -> str:
+    async def revise_query_with_context(self, query: str, context: str) -> str:
         """
         Revise user query by inserting the summarized context to give the RAG pipeline
         a more context-rich question. This implementation uses a simple deterministic
@@ -153,10 +181,10 @@ class LangGraphRAGRepositoryImpl(IRAGRepository):
         """
 
         # Use the graph to produce a refined query
-        refined = self.big_llm.invoke(prompt).content
+        refined = (await self.big_llm.ainvoke(prompt)).content
         return refined or f"{query} {context}"  # type: ignore
 
-    def answer_query_with_specific_document(
+    async def answer_query_with_specific_document(
         self, user_query: str, document_hash: Optional[str]
     ) -> str:
         """
@@ -173,17 +201,70 @@ class LangGraphRAGRepositoryImpl(IRAGRepository):
                 ("user", user_query),
             ]
 
-            assistant_text = self._run_graph_and_get_last_content(
+            assistant_text = await self._run_graph_and_get_last_content(
                 messages_payload, user_query, document_hash=document_hash
             )
 
             if not assistant_text:
-                assistant_text = (
-                    "I'm sorry — I couldn't find an answer in the specified document."
-                )
+                assistant_text = NO_ANSWER_MESSAGE
 
             return assistant_text
 
         except Exception as e:
             logger.exception("answer_query_with_specific_document failed: %s", e)
             return "I'm sorry, something went wrong while processing your request."
+
+    async def astream_answer(
+        self, user_query: str, document_hash: Optional[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the graph and yield its progress as it happens.
+
+        Yields `{"event": "progress", "node", "elapsed_ms", "duration_ms"}` when a node
+        finishes (elapsed since the start of the run, and the node's own time),
+        `{"event": "token", "content"}` for each generated token and a final
+        `{"event": "answer", "content"}` with the whole answer. An answer that was not
+        streamed (the greeting template) is sent as a single token.
+        """
+        started = time.perf_counter()
+        answer = ""
+        streamed = False
+        timings: Dict[str, float] = {}
+        async for mode, chunk in self.graph.astream(  # type: ignore
+            self._graph_input(user_query, document_hash),
+            config={"configurable": {"books_repo": self.books_repo}},
+            stream_mode=["updates", "messages"],
+        ):
+            if mode == "messages":
+                message, metadata = chunk
+                # Whole messages are also reported once a node ends; only chunks are tokens
+                if (
+                    isinstance(message, AIMessageChunk)
+                    and message.content
+                    and metadata.get("langgraph_node") in ANSWER_NODES
+                ):
+                    streamed = True
+                    yield {"event": "token", "content": message.content}
+                continue
+
+            for node, update in chunk.items():
+                duration_ms = ((update or {}).get("timings") or {}).get(node)
+                if duration_ms is not None:
+                    timings[node] = duration_ms
+                yield {
+                    "event": "progress",
+                    "node": node,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "duration_ms": duration_ms,
+                }
+                messages = (update or {}).get("messages") if node in ANSWER_NODES else None
+                if messages:
+                    answer = getattr(messages[-1], "content", "") or ""
+                    if answer and not streamed:
+                        yield {"event": "token", "content": answer}
+
+        logger.info(
+            "Graph node timings (ms): %s, total %.1f ms",
+            timings, (time.perf_counter() - started) * 1000,
+        )
+        yield {"event": "answer", "content": answer or NO_ANSWER_MESSAGE}
@@ -0,0 +1,157 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.src.infrastructure.config.settings import rag_settings
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    """a an and are as at be but by for from had has have he her his i if in into is it
+    its me my no not of on or our she so that the their them then there they this to
+    was we were what when where which who why will with you your""".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+class BM25Index:
+    """
+    In-memory BM25 inverted index over chunk texts.
+
+    Only term statistics are kept, not the texts themselves; callers resolve the
+    returned chunk ids against the vector store. Adding an existing id replaces it,
+    matching the upsert semantics of the vector store.
+
+    Hits scoring below `min_score_ratio` of the query's ceiling (every query term
+    found in the corpus matched with unbounded frequency) are dropped. Dense hits have to pass a
+    similarity threshold, and this is the lexical counterpart.
+    """
+
+    def __init__(
+        self,
+        k1: float = rag_settings.BM25_K1,
+        b: float = rag_settings.BM25_B,
+        min_score_ratio: float = rag_settings.BM25_MIN_SCORE_RATIO,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.min_score_ratio = min_score_ratio
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._doc_hashes: Dict[str, Optional[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        with self._lock:
+            for i, (chunk_id, text) in enumerate(zip(ids, texts)):
+                if chunk_id in self._doc_lengths:
+                    self._remove(chunk_id)
+                term_counts = Counter(tokenize(text or ""))
+                for term, count in term_counts.items():
+                    self._postings.setdefault(term, {})[chunk_id] = count
+                length = sum(term_counts.values())
+                self._doc_lengths[chunk_id] = length
+                self._doc_terms[chunk_id] = tuple(term_counts)
+                metadata = metadatas[i] if metadatas and i < len(metadatas) else {}
+                self._doc_hashes[chunk_id] = (metadata or {}).get("document_hash")
+                self._total_length += length
+
+    def remove(self, ids: Sequence[str]) -> None:
+        with self._lock:
+            for chunk_id in ids:
+                if chunk_id in self._doc_lengths:
+                    self._remove(chunk_id)
+
+    def remove_document(self, document_hash: str) -> int:
+        """Drop every chunk of one document; returns how many were removed."""
+        with self._lock:
+            ids = [cid for cid, dh in self._doc_hashes.items() if dh == document_hash]
+            for chunk_id in ids:
+                self._remove(chunk_id)
+            return len(ids)
+
+    def search(
+        self, query: str, k: int, document_hash: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """Return up to k (chunk_id, score) pairs, best first."""
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self._doc_lengths)
+            if not terms or not n_docs:
+                return []
+            avg_length = self._total_length / n_docs or 1.0
+            scores: Dict[str, float] = {}
+            ceiling = 0.0
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log((n_docs - len(postings) + 0.5) / (len(postings) + 0.5) + 1)
+                ceiling += idf * (self.k1 + 1)
+                for chunk_id, tf in postings.items():
+                    if document_hash is not None and self._doc_hashes.get(chunk_id) != document_hash:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[chunk_id] / avg_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        floor = self.min_score_ratio * ceiling
+        hits = [(chunk_id, score) for chunk_id, score in scores.items() if score >= floor]
+        return sorted(hits, key=lambda item: item[1], reverse=True)[:k]
+
+    def build_from_collection(self, collection: Any, page_size: int = 1000) -> int:
+        """(Re)build the index from every chunk currently stored in a Chroma collection."""
+        with self._lock:
+            self._postings.clear()
+            self._doc_lengths.clear()
+            self._doc_terms.clear()
+            self._doc_hashes.clear()
+            self._total_length = 0
+            offset = 0
+            while True:
+                page = collection.get(
+                    include=["documents", "metadatas"], limit=page_size, offset=offset
+                )
+                ids = page.get("ids") or []
+                if not ids:
+                    break
+                self.add(ids, page.get("documents") or [], page.get("metadatas") or [])
+                offset += len(ids)
+            return len(self._doc_lengths)
+
+    def _remove(self, chunk_id: str) -> None:
+        for term in self._doc_terms.pop(chunk_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(chunk_id, 0)
+        self._doc_hashes.pop(chunk_id, None)
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = rag_settings.RRF_K
+) -> List[Tuple[str, float]]:
+    """Merge several best-first id rankings into one by reciprocal rank fusion."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
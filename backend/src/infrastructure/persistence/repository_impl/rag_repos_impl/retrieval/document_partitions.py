@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.src.infrastructure.config.settings import rag_settings
+
+
+@dataclass
+class DocumentPartition:
+    """All chunks of one document with a normalized embedding matrix."""
+
+    ids: List[str]
+    documents: List[str]
+    metadatas: List[Dict[str, Any]]
+    matrix: np.ndarray
+
+    def search(self, query_embedding: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        """Exact top-k as (row, cosine similarity) pairs, best first."""
+        if not self.ids or k <= 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        similarities = self.matrix @ (query / norm if norm else query)
+        k = min(k, len(self.ids))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [(int(row), float(similarities[row])) for row in top]
+
+
+class DocumentPartitionCache:
+    """
+    LRU cache of per-document partitions of a collection.
+
+    Book-scoped retrieval searches only the chunks of that book, so its latency
+    depends on the size of the book rather than the library, and it always
+    returns k results when the book has them (unlike a filtered HNSW search).
+    Partitions are loaded on first use and must be invalidated when a document's
+    chunks change.
+    """
+
+    def __init__(self, max_documents: int = rag_settings.DOCUMENT_PARTITION_CACHE_SIZE):
+        self.max_documents = max_documents
+        self._partitions: "OrderedDict[str, DocumentPartition]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, collection: Any, document_hash: str) -> DocumentPartition:
+        with self._lock:
+            partition = self._partitions.get(document_hash)
+            if partition is not None:
+                self._partitions.move_to_end(document_hash)
+                self.hits += 1
+                return partition
+
+        partition = self._load(collection, document_hash)
+        with self._lock:
+            self.misses += 1
+            self._partitions[document_hash] = partition
+            self._partitions.move_to_end(document_hash)
+            while len(self._partitions) > self.max_documents:
+                self._partitions.popitem(last=False)
+        return partition
+
+    def invalidate(self, document_hash: str) -> None:
+        with self._lock:
+            self._partitions.pop(document_hash, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"documents": len(self._partitions), "hits": self.hits, "misses": self.misses}
+
+    @staticmethod
+    def _load(collection: Any, document_hash: str) -> DocumentPartition:
+        fetched = collection.get(
+            where={"document_hash": document_hash},
+            include=["documents", "metadatas", "embeddings"],
+        )
+        ids = list(fetched.get("ids") or [])
+        embeddings = fetched.get("embeddings")
+        if not ids or embeddings is None or len(embeddings) == 0:
+            return DocumentPartition([], [], [], np.zeros((0, 0), dtype=np.float32))
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return DocumentPartition(
+            ids=ids,
+            documents=list(fetched.get("documents") or []),
+            metadatas=[metadata or {} for metadata in fetched.get("metadatas") or []],
+            matrix=matrix / norms,
+        )
@@ -0,0 +1,412 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backend.src.infrastructure.config.settings import rag_settings
+
+QUERY_BLOCK_ROWS = 4096
+
+
+class ExactVectorCollection:
+    """
+    Exact cosine-similarity search over a memory-mapped embedding matrix.
+
+    Mirrors the subset of the Chroma collection API the vector store repository
+    uses (`upsert`, `query`, `get`, `delete`, `count`, `name`, `metadata`), so it can
+    stand in for a Chroma collection.
+
+    On disk a collection directory holds:
+      - `vectors.bin`: L2-normalized rows in `dtype`, append-only, memory-mapped on load
+      - `chunks.sqlite3`: chunk id, document hash, text and metadata per live row
+      - `collection.json`: dimension, dtype and collection metadata
+
+    A parallel integer array maps each row to its document hash, so `document_hash`
+    filters are a vectorized mask. Replaced or deleted rows stay in `vectors.bin` as
+    dead rows until `compact()` rewrites the file. Upserts and deletes update these
+    arrays in place (they grow by doubling); only opening and compaction rebuild them
+    from `chunks.sqlite3`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        name: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        dtype: str = rag_settings.EXACT_INDEX_DTYPE,
+    ):
+        self.name = name
+        self.directory = os.path.join(directory, name)
+        os.makedirs(self.directory, exist_ok=True)
+        self._vectors_path = os.path.join(self.directory, "vectors.bin")
+        self._info_path = os.path.join(self.directory, "collection.json")
+        self._lock = threading.RLock()
+
+        self._info = self._load_info(metadata or {}, dtype)
+        self.metadata: Dict[str, Any] = self._info["metadata"]
+        self._dtype = np.dtype(self._info["dtype"])
+
+        self._conn = sqlite3.connect(
+            os.path.join(self.directory, "chunks.sqlite3"), check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                row INTEGER PRIMARY KEY,
+                chunk_id TEXT NOT NULL UNIQUE,
+                document_hash TEXT,
+                document TEXT,
+                metadata TEXT
+            )
+            """
+        )
+        self._conn.commit()
+
+        self._vectors: Optional[np.ndarray] = None
+        # Row arrays are views over buffers with room to grow
+        self._hash_codes_buffer = np.zeros(0, dtype=np.int32)
+        self._alive_buffer = np.zeros(0, dtype=bool)
+        self._hash_codes = self._hash_codes_buffer
+        self._alive = self._alive_buffer
+        # Codes of the document hashes with live rows, and how many rows each has
+        self._code_by_hash: Dict[Optional[str], int] = {}
+        self._live_rows_by_code: Dict[int, int] = {}
+        self._next_code = 0
+        self._row_by_id: Dict[str, int] = {}
+        self._load_rows()
+
+    # ==== Chroma-compatible API ====
+    def count(self) -> int:
+        return len(self._row_by_id)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        documents: Optional[Sequence[str]] = None,
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        if not ids:
+            return
+        matrix = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        with self._lock:
+            if self._info["dimension"] is None:
+                self._info["dimension"] = int(matrix.shape[1])
+                self._save_info()
+            elif matrix.shape[1] != self._info["dimension"]:
+                raise ValueError(
+                    f"Embedding dimension {matrix.shape[1]} does not match collection "
+                    f"{self.name!r} dimension {self._info['dimension']}"
+                )
+
+            first_row = self._row_count()
+            with open(self._vectors_path, "ab") as f:
+                f.write(matrix.astype(self._dtype).tobytes())
+
+            hashes = []
+            rows = []
+            for i, chunk_id in enumerate(ids):
+                metadata = dict(metadatas[i]) if metadatas else {}
+                hashes.append(metadata.get("document_hash"))
+                rows.append(
+                    (
+                        first_row + i,
+                        chunk_id,
+                        metadata.get("document_hash"),
+                        documents[i] if documents else None,
+                        json.dumps(metadata),
+                    )
+                )
+            # Replaced rows become dead rows in vectors.bin
+            self._conn.executemany(
+                "DELETE FROM chunks WHERE chunk_id = ?", [(chunk_id,) for chunk_id in ids]
+            )
+            self._conn.executemany(
+                "INSERT INTO chunks (row, chunk_id, document_hash, document, metadata) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            self._append_rows(first_row, ids, hashes)
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = ("documents", "metadatas", "distances"),
+    ) -> Dict[str, Any]:
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+        with self._lock:
+            vectors, mask = self._vectors, self._filter_mask(where)
+
+        results: Dict[str, List[Any]] = {"ids": []}
+        for key in ("documents", "metadatas", "distances", "embeddings"):
+            if key in include:
+                results[key] = []
+
+        for query in queries:
+            rows, similarities = self._top_k(vectors, mask, query, n_results)
+            records = self._fetch_rows(rows)
+            # Rows deleted while the search ran are dropped
+            kept = [(row, s) for row, s in zip(rows, similarities) if row in records]
+            rows, similarities = [row for row, _ in kept], [s for _, s in kept]
+            results["ids"].append([records[row]["id"] for row in rows])
+            if "documents" in results:
+                results["documents"].append([records[row]["document"] for row in rows])
+            if "metadatas" in results:
+                results["metadatas"].append([records[row]["metadata"] for row in rows])
+            if "distances" in results:
+                results["distances"].append([float(1 - s) for s in similarities])
+            if "embeddings" in results:
+                results["embeddings"].append([vectors[row].astype(np.float32) for row in rows])
+        return results
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Sequence[str] = ("documents", "metadatas"),
+    ) -> Dict[str, Any]:
+        with self._lock:
+            if ids is not None:
+                rows = [self._row_by_id[chunk_id] for chunk_id in ids if chunk_id in self._row_by_id]
+            else:
+                rows = [int(row) for row in np.flatnonzero(self._filter_mask(where))]
+                rows = rows[offset or 0:]
+                if limit is not None:
+                    rows = rows[:limit]
+            vectors = self._vectors
+
+        records = self._fetch_rows(rows)
+        rows = [row for row in rows if row in records]
+        results: Dict[str, Any] = {"ids": [records[row]["id"] for row in rows]}
+        if "documents" in include:
+            results["documents"] = [records[row]["document"] for row in rows]
+        if "metadatas" in include:
+            results["metadatas"] = [records[row]["metadata"] for row in rows]
+        if "embeddings" in include:
+            results["embeddings"] = [vectors[row].astype(np.float32) for row in rows]
+        return results
+
+    def delete(
+        self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None
+    ) -> None:
+        with self._lock:
+            if ids is None:
+                ids = self.get(where=where, include=())["ids"]
+            self._conn.executemany(
+                "DELETE FROM chunks WHERE chunk_id = ?", [(chunk_id,) for chunk_id in ids]
+            )
+            self._conn.commit()
+            for chunk_id in ids:
+                row = self._row_by_id.pop(chunk_id, None)
+                if row is not None:
+                    self._kill_row(row)
+
+    # ==== Maintenance ====
+    def stored_rows(self) -> int:
+        """Rows in the vector file, including dead rows left by replacements and deletes."""
+        with self._lock:
+            return self._row_count()
+
+    def compact(self) -> int:
+        """
+        Rewrite the vector file with only live rows and renumber them.
+
+        Returns the number of dead rows dropped. Meant for offline maintenance.
+        """
+        with self._lock:
+            n_rows = self._row_count()
+            live_rows = [
+                row for (row,) in self._conn.execute("SELECT row FROM chunks ORDER BY row") if row < n_rows
+            ]
+            dropped = n_rows - len(live_rows)
+            if not dropped:
+                return 0
+
+            tmp_path = f"{self._vectors_path}.compact"
+            with open(tmp_path, "wb") as f:
+                for start in range(0, len(live_rows), QUERY_BLOCK_ROWS):
+                    f.write(np.ascontiguousarray(self._vectors[live_rows[start:start + QUERY_BLOCK_ROWS]]).tobytes())
+
+            # Rows only move down and in ascending order, so renumbering never collides
+            self._conn.executemany(
+                "UPDATE chunks SET row = ? WHERE row = ?",
+                [(new_row, old_row) for new_row, old_row in enumerate(live_rows) if new_row != old_row],
+            )
+            self._conn.execute("DELETE FROM chunks WHERE row >= ?", (len(live_rows),))
+            self._conn.commit()
+            os.replace(tmp_path, self._vectors_path)
+            self._load_rows()
+            return dropped
+
+    # ==== Internals ====
+    def _row_count(self) -> int:
+        dimension = self._info["dimension"]
+        if not dimension or not os.path.exists(self._vectors_path):
+            return 0
+        return os.path.getsize(self._vectors_path) // (dimension * self._dtype.itemsize)
+
+    def _load_rows(self) -> None:
+        """Re-map the vector file and rebuild the parallel row arrays from the chunk table."""
+        n_rows = self._row_count()
+        self._map_vectors(n_rows)
+        self._hash_codes_buffer = np.zeros(n_rows, dtype=np.int32)
+        self._alive_buffer = np.zeros(n_rows, dtype=bool)
+        self._resize_rows(n_rows)
+        self._code_by_hash = {}
+        self._live_rows_by_code = {}
+        self._next_code = 0
+        self._row_by_id = {}
+        for row, chunk_id, document_hash in self._conn.execute(
+            "SELECT row, chunk_id, document_hash FROM chunks"
+        ):
+            if row >= n_rows:
+                continue  # vector write was lost, the row cannot be served
+            self._set_row(row, chunk_id, document_hash)
+
+    def _append_rows(
+        self, first_row: int, ids: Sequence[str], hashes: Sequence[Optional[str]]
+    ) -> None:
+        """Add the rows just written at `first_row`; replaced ids turn their old row dead."""
+        if len(self._alive) != first_row:
+            # The arrays no longer match the file (e.g. a lost write), start over
+            self._load_rows()
+            return
+        n_rows = first_row + len(ids)
+        self._map_vectors(n_rows)
+        self._resize_rows(n_rows)
+        for i, (chunk_id, document_hash) in enumerate(zip(ids, hashes)):
+            old_row = self._row_by_id.get(chunk_id)
+            if old_row is not None:
+                self._kill_row(old_row)
+            self._set_row(first_row + i, chunk_id, document_hash)
+
+    def _map_vectors(self, n_rows: int) -> None:
+        # Mapping a longer prefix of the file is cheap; readers keep their old view
+        self._vectors = (
+            np.memmap(
+                self._vectors_path,
+                dtype=self._dtype,
+                mode="r",
+                shape=(n_rows, self._info["dimension"]),
+            )
+            if n_rows
+            else None
+        )
+
+    def _resize_rows(self, n_rows: int) -> None:
+        if n_rows > len(self._alive_buffer):
+            capacity = max(n_rows, 2 * len(self._alive_buffer))
+            hash_codes = np.zeros(capacity, dtype=np.int32)
+            alive = np.zeros(capacity, dtype=bool)
+            hash_codes[:len(self._hash_codes)] = self._hash_codes
+            alive[:len(self._alive)] = self._alive
+            self._hash_codes_buffer, self._alive_buffer = hash_codes, alive
+        self._hash_codes = self._hash_codes_buffer[:n_rows]
+        self._alive = self._alive_buffer[:n_rows]
+
+    def _set_row(self, row: int, chunk_id: str, document_hash: Optional[str]) -> None:
+        code = self._code_by_hash.get(document_hash)
+        if code is None:
+            code = self._code_by_hash[document_hash] = self._next_code
+            self._next_code += 1
+        self._live_rows_by_code[code] = self._live_rows_by_code.get(code, 0) + 1
+        self._hash_codes[row] = code
+        self._alive[row] = True
+        self._row_by_id[chunk_id] = row
+
+    def _kill_row(self, row: int) -> None:
+        """Mark a row dead; a document hash without live rows is forgotten."""
+        if not self._alive[row]:
+            return
+        self._alive[row] = False
+        code = int(self._hash_codes[row])
+        remaining = self._live_rows_by_code[code] - 1
+        if remaining:
+            self._live_rows_by_code[code] = remaining
+            return
+        del self._live_rows_by_code[code]
+        for document_hash, hash_code in list(self._code_by_hash.items()):
+            if hash_code == code:
+                del self._code_by_hash[document_hash]
+
+    def _filter_mask(self, where: Optional[Dict[str, Any]]) -> np.ndarray:
+        mask = self._alive.copy()
+        for key, value in (where or {}).items():
+            if key.startswith("$") or isinstance(value, dict):
+                raise ValueError(f"Only plain equality filters are supported, got {key!r}")
+            if key == "document_hash":
+                code = self._code_by_hash.get(value)
+                mask &= self._hash_codes == code if code is not None else False
+                continue
+            matching = np.zeros_like(mask)
+            for (row,) in self._conn.execute(
+                "SELECT row FROM chunks WHERE json_extract(metadata, ?) = ?",
+                (f"$.{key}", value),
+            ):
+                if row < len(matching):
+                    matching[row] = True
+            mask &= matching
+        return mask
+
+    @staticmethod
+    def _top_k(
+        vectors: Optional[np.ndarray], mask: np.ndarray, query: np.ndarray, k: int
+    ):
+        if vectors is None or not mask.any() or k <= 0:
+            return [], []
+        # Blocked matmul keeps the float32 upcast of a float16 matrix bounded
+        similarities = np.empty(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), QUERY_BLOCK_ROWS):
+            block = np.asarray(vectors[start:start + QUERY_BLOCK_ROWS], dtype=np.float32)
+            similarities[start:start + len(block)] = block @ query
+        similarities[~mask] = -np.inf
+
+        k = min(k, int(mask.sum()))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [int(row) for row in top], similarities[top].tolist()
+
+    def _fetch_rows(self, rows: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        if not rows:
+            return {}
+        placeholders = ",".join("?" * len(rows))
+        with self._lock:
+            fetched = self._conn.execute(
+                f"SELECT row, chunk_id, document, metadata FROM chunks WHERE row IN ({placeholders})",
+                list(rows),
+            ).fetchall()
+        return {
+            row: {"id": chunk_id, "document": document, "metadata": json.loads(metadata or "{}")}
+            for row, chunk_id, document, metadata in fetched
+        }
+
+    def _load_info(self, metadata: Dict[str, Any], dtype: str) -> Dict[str, Any]:
+        if os.path.exists(self._info_path):
+            with open(self._info_path, "r") as f:
+                return json.load(f)
+        self._info = {"dimension": None, "dtype": dtype, "metadata": metadata}
+        self._save_info()
+        return self._info
+
+    def _save_info(self) -> None:
+        tmp_path = f"{self._info_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._info, f)
+        os.replace(tmp_path, self._info_path)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
@@ -0,0 +1,186 @@
+import asyncio
+import math
+import re
+import threading
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from backend.src.infrastructure.config.settings import rag_settings
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.routing.route_examples import (
+    GREETING_REPLIES, ROUTE_EXAMPLES)
+from logs.log_config import setup_logger
+
+router_logger = setup_logger("query_router")
+
+ROUTES = ("find_books", "web_search", "retrieve", "only_greet")
+
+# Whole-query greetings only, so "hi, who is Mr. Darcy?" is not answered with a template
+GREETING_PATTERN = re.compile(
+    r"^(?:(?:hi|hello|hey|hiya|yo|greetings|good (?:morning|afternoon|evening|day)|"
+    r"how are you(?: doing)?|how is it going|nice to meet you|"
+    r"thanks|thank you|thx|cheers|many thanks|thanks a lot|"
+    r"bye|goodbye|see you(?: later)?|have a (?:nice|good) day)"
+    r"(?: there| again| so much| very much| everyone| all)?[\s!.,?]*)+$"
+)
+# Keyword hints: they only settle a low-confidence classifier decision that already
+# agrees with them, and are ignored in book-scoped chats
+FIND_BOOKS_PATTERN = re.compile(
+    r"\b(?:recommend|suggest|recommendation|recommendations|what should i read|"
+    r"looking for (?:a |an |some )?(?:\w+ )?(?:book|novel)s?|"
+    r"(?:books|novels) (?:by|about|from|published|written|similar|like)|"
+    r"find (?:me )?(?:a |an |some )?(?:\w+ )?(?:book|novel)s?)\b"
+)
+WEB_SEARCH_PATTERN = re.compile(
+    r"\b(?:today|tonight|yesterday|tomorrow|latest|breaking|news|weather|"
+    r"stock price|this week|right now|currently|score of)\b"
+)
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def greeting_reply(query: str) -> str:
+    """Template reply to a greeting, thanks or goodbye; no LLM involved."""
+    text = normalize(query)
+    if re.search(r"\b(?:thanks|thank you|thx|cheers)\b", text):
+        return GREETING_REPLIES["thanks"]
+    if re.search(r"\b(?:bye|goodbye|see you|have a (?:nice|good) day)\b", text):
+        return GREETING_REPLIES["bye"]
+    return GREETING_REPLIES["hello"]
+
+
+@dataclass
+class RouteDecision:
+    """
+    Where a query goes, how sure the router is and what decided it ("rule",
+    "classifier", "classifier+keywords" or "llm").
+    """
+
+    route: str
+    confidence: float
+    source: str
+
+
+class QueryRouter:
+    """
+    Local query router: a greeting rule first, then a nearest-centroid classifier.
+
+    Each route's centroid is the normalized mean embedding of its labelled example
+    queries. A query goes to the route of the most similar centroid; the softmax of
+    the similarities (at `temperature`) is the confidence. Below `min_confidence`,
+    or when the centroids could not be built, the slower `llm_fallback` decides,
+    unless the query's keywords point to the same route as the classifier.
+    """
+
+    def __init__(
+        self,
+        embed_query: Callable[[str], List[float]],
+        embed_documents: Callable[[List[str]], List[List[float]]],
+        llm_fallback: Callable[[str], Awaitable[str]],
+        examples: Dict[str, Sequence[str]] = ROUTE_EXAMPLES,
+        min_confidence: float = rag_settings.ROUTER_MIN_CONFIDENCE,
+        temperature: float = rag_settings.ROUTER_TEMPERATURE,
+    ):
+        self.embed_query = embed_query
+        self.embed_documents = embed_documents
+        self.llm_fallback = llm_fallback
+        self.examples = examples
+        self.min_confidence = min_confidence
+        self.temperature = temperature
+        self._centroids: Optional[Dict[str, List[float]]] = None
+        self._fit_failed = False
+        self._lock = threading.Lock()
+
+    def fit(self) -> bool:
+        """Embed the examples and build the centroids; returns False (and logs) on failure."""
+        with self._lock:
+            if self._centroids is not None:
+                return True
+            try:
+                labels = [label for label, queries in self.examples.items() for _ in queries]
+                vectors = self.embed_documents(
+                    [query for queries in self.examples.values() for query in queries]
+                )
+                sums: Dict[str, List[float]] = {}
+                for label, vector in zip(labels, vectors):
+                    unit = _unit(vector)
+                    total = sums.setdefault(label, [0.0] * len(unit))
+                    for i, value in enumerate(unit):
+                        total[i] += value
+                self._centroids = {label: _unit(total) for label, total in sums.items()}
+                self._fit_failed = False
+                router_logger.info(f"Router centroids built from {len(labels)} examples")
+                return True
+            except Exception as e:
+                self._fit_failed = True
+                router_logger.error(f"Could not build router centroids, using the LLM router: {e}")
+                return False
+
+    def classify(self, query: str) -> Optional[RouteDecision]:
+        """Nearest-centroid decision, or None if there are no centroids."""
+        if self._centroids is None and (self._fit_failed or not self.fit()):
+            return None
+        query_vector = _unit(self.embed_query(query))
+        similarities = {
+            label: sum(a * b for a, b in zip(query_vector, centroid))
+            for label, centroid in self._centroids.items()  # type: ignore
+        }
+        best = max(similarities, key=similarities.get)  # type: ignore
+        # Softmax over the similarities, shifted by the best one for stability
+        weights = {
+            label: math.exp((similarity - similarities[best]) / self.temperature)
+            for label, similarity in similarities.items()
+        }
+        return RouteDecision(best, weights[best] / sum(weights.values()), "classifier")
+
+    async def route(self, query: str, document_hash: Optional[str] = None) -> RouteDecision:
+        """Route a query; `document_hash` marks a book-scoped chat, where keyword hints are ignored."""
+        decision = self._rule(query)
+        if decision is None:
+            try:
+                # Embedding the query blocks (a local model or an HTTP client)
+                decision = await asyncio.to_thread(self.classify, query)
+            except Exception as e:
+                router_logger.error(f"Router classifier failed: {e}")
+                decision = None
+            hint = None if document_hash else self._keyword_hint(query)
+            if (
+                decision is not None
+                and decision.confidence < self.min_confidence
+                and decision.route == hint
+            ):
+                decision = RouteDecision(decision.route, decision.confidence, "classifier+keywords")
+            elif decision is None or decision.confidence < self.min_confidence:
+                classifier_guess = decision
+                decision = RouteDecision(await self.llm_fallback(query), 1.0, "llm")
+                if classifier_guess is not None:
+                    router_logger.info(
+                        f"Low classifier confidence {classifier_guess.confidence:.2f} "
+                        f"for {classifier_guess.route!r}, asked the LLM"
+                    )
+        router_logger.info(
+            f"Routed to {decision.route} by {decision.source} "
+            f"(confidence {decision.confidence:.2f}): {query[:80]!r}"
+        )
+        return decision
+
+    @staticmethod
+    def _rule(query: str) -> Optional[RouteDecision]:
+        if GREETING_PATTERN.match(normalize(query)):
+            return RouteDecision("only_greet", 1.0, "rule")
+        return None
+
+    @staticmethod
+    def _keyword_hint(query: str) -> Optional[str]:
+        text = normalize(query)
+        if FIND_BOOKS_PATTERN.search(text):
+            return "find_books"
+        if WEB_SEARCH_PATTERN.search(text):
+            return "web_search"
+        return None
+
+
+def _unit(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
@@ -0,0 +1,70 @@
+"""Labelled example queries the local router learns its route centroids from."""
+
+ROUTE_EXAMPLES = {
+    "only_greet": [
+        "hi",
+        "hello there",
+        "hey, how are you?",
+        "good morning",
+        "good evening!",
+        "thanks a lot",
+        "thank you for your help",
+        "bye",
+        "goodbye, see you later",
+        "nice to meet you",
+        "how is it going?",
+        "have a nice day",
+    ],
+    "find_books": [
+        "recommend me a book about love",
+        "can you suggest some horror novels?",
+        "find books by Jane Austen",
+        "I'm looking for a romance novel",
+        "books published in the 1800s",
+        "what books do you have about the sea?",
+        "any fantasy books for children?",
+        "show me books similar to Frankenstein",
+        "which book has a character who talks to animals?",
+        "I want to read a tragedy by Shakespeare",
+        "list gothic books written before 1850",
+        "what should I read next if I liked Moby Dick?",
+    ],
+    "retrieve": [
+        "What happens to Alice when she falls down the rabbit hole?",
+        "Analyze the themes in Romeo and Juliet",
+        "Who is Mr. Darcy?",
+        "What is the monster's motivation in Frankenstein?",
+        "Why does Victor Frankenstein abandon his creature?",
+        "How does Juliet fake her death?",
+        "What does the Cheshire Cat tell Alice?",
+        "Describe Elizabeth Bennet's first impression of Darcy",
+        "Why is Captain Ahab obsessed with the white whale?",
+        "Summarize the ending of Pride and Prejudice",
+        "What is the role of the Mad Hatter's tea party?",
+        "Who kills Tybalt and what happens next?",
+    ],
+    "web_search": [
+        "What's the weather today?",
+        "latest news about artificial intelligence",
+        "how to cook pasta",
+        "current bestseller list",
+        "what happened in 2024?",
+        "who won the football match yesterday?",
+        "what is the capital of Australia?",
+        "how much does a flight to Paris cost?",
+        "explain how vaccines work",
+        "stock price of Apple today",
+        "when is the next solar eclipse?",
+        "who is the current president of France?",
+    ],
+}
+
+GREETING_REPLIES = {
+    "thanks": "You're welcome! Let me know if there is anything else I can help you with.",
+    "bye": "Goodbye! Come back any time you want to talk about books.",
+    "hello": (
+        "Hello! I can answer questions about the books in our library, "
+        "recommend books by genre, author or period, or look things up on the web. "
+        "What would you like to know?"
+    ),
+}
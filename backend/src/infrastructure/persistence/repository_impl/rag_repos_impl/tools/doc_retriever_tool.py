@@ -1,6 +1,6 @@
 import os
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Tuple
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.tools import StructuredTool, Tool, tool
@@ -8,15 +8,18 @@ from langchain.tools.retriever import create_retriever_tool
 from langchain_chroma import Chroma
 from langchain_community.document_loaders import TextLoader
 from langchain_core.documents import Document
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from pydantic import BaseModel, Field, SecretStr
+from langchain_core.embeddings import Embeddings
+from pydantic import BaseModel, Field
 
 from backend.src.application.interfaces.rag_interfaces.vectorstore_repo import \
     IVectorStoreRepository
 from backend.src.infrastructure.adapters.document_hasher import DocumentHasher
-from backend.src.infrastructure.config.settings import (api_settings,
-                                                        db_settings,
+from backend.src.infrastructure.config.settings import (db_settings,
                                                         rag_settings)
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.embeddings.embedding_cache import (
+    CachedEmbeddings, SQLiteEmbeddingCache)
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.embeddings.providers import \
+    build_embedding_provider
 
 # --- Configuration ---
 CHROMA_PERSIST_DIR = rag_settings.CHROMA_PERSIST_DIR
@@ -30,27 +33,33 @@ TEXT_FILES = [
     "data/price_and_prejudice.txt",
     "data/romeo_and_juliet.txt",
 ]
-GOOGLE_API_KEY = api_settings.GOOGLE_API_KEY
-EMBEDDING_MODEL = f"models/{api_settings.GOOGLE_EMBEDDING_MODEL}"
+EMBEDDING_TASK_TYPE = "retrieval_document"
+EMBEDDING_CACHE_PATH = rag_settings.EMBEDDING_CACHE_PATH or os.path.join(
+    CHROMA_PERSIST_DIR, "embedding_cache.sqlite3"
+)
 
 
 # --- Embedding Function ---
 @lru_cache(maxsize=1)
-def get_embedding_function() -> GoogleGenerativeAIEmbeddings:
-    embedding_function = GoogleGenerativeAIEmbeddings(
-        model=EMBEDDING_MODEL,
-        google_api_key=cast(SecretStr, GOOGLE_API_KEY),
-        task_type="retrieval_document",
-    )
-    # Test embedding
-    test_text = "This is a test embedding."
-    test_embedding = embedding_function.embed_query(test_text)
-    print(f"Embedding test successful. Vector dimension: {len(test_embedding)}")
-
-    return embedding_function
+def get_embedding_provider() -> Tuple[Embeddings, str]:
+    """Return the configured embedding function and the name of the model behind it."""
+    embedding_function, model_name = build_embedding_provider()
+    if rag_settings.EMBEDDING_CACHE_ENABLED and rag_settings.EMBEDDING_PROVIDER != "hashing":
+        # Both task types match because each backend embeds queries and documents alike
+        embedding_function = CachedEmbeddings(
+            embedding_function,
+            cache=SQLiteEmbeddingCache(
+                EMBEDDING_CACHE_PATH, rag_settings.EMBEDDING_CACHE_MAX_ENTRIES
+            ),
+            model_name=model_name,
+            document_task_type=EMBEDDING_TASK_TYPE,
+            query_task_type=EMBEDDING_TASK_TYPE,
+        )
+    return embedding_function, model_name
 
 
-embedding_function = get_embedding_function()
+def get_embedding_function() -> Embeddings:
+    return get_embedding_provider()[0]
 
 
 class RetrieverInput(BaseModel):
@@ -17,15 +17,22 @@ class SearchInput(BaseModel):
     query: str = Field(description="The search query for Tavily web search")
 
 
-from langchain_core.tools import tool
+def _search_web(query: str) -> str:
+    """Search the web for up-to-date information"""
+    return base_search.invoke(query)
 
 
-@tool(
-    "Search",
+async def _asearch_web(query: str) -> str:
+    """Search the web for up-to-date information"""
+    return await base_search.ainvoke(query)
+
+
+# Built with both functions so `ainvoke` awaits Tavily instead of borrowing a thread
+search_web = StructuredTool.from_function(
+    func=_search_web,
+    coroutine=_asearch_web,
+    name="Search",
     return_direct=True,
     description="A general web search tool (Tavily). Use this to find information on current events, news, or any general knowledge question that your local documents do not have an answer for.",
     args_schema=SearchInput,
 )
-def search_web(query: str) -> str:
-    """Search the web for up-to-date information"""
-    return base_search.invoke(query)
@@ -1,35 +1,63 @@
 import gc
 import hashlib
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import chromadb
+import tiktoken
+from chromadb.errors import NotFoundError
 
-import chardet
 from langchain_chroma import Chroma
-from langchain_community.document_loaders import TextLoader
 from langchain_core.documents import Document as LCDocument
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from backend.src.application.interfaces.library_interfaces.book_repository import BookRepository
+from backend.src.application.interfaces.rag_interfaces.document_manifest_repository import \
+    IDocumentManifestRepository
 from backend.src.application.interfaces.rag_interfaces.vectorstore_repo import \
     IVectorStoreRepository
 from backend.src.domain.entities.rag_entities.document import Document
+from backend.src.domain.entities.rag_entities.document_manifest import \
+    DocumentManifestEntry
 from backend.src.infrastructure.adapters.document_hasher import DocumentHasher
-from backend.src.infrastructure.config.settings import rag_settings
+from backend.src.infrastructure.config.settings import api_settings, rag_settings
+from backend.src.infrastructure.jobs.bounded_executor import BoundedExecutor
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.embeddings.embedding_pipeline import \
+    EmbeddingPipeline
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.embeddings.query_cache import \
+    QueryEmbeddingCache
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.ingestion.boilerplate import \
+    GutenbergBoilerplateFilter
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.ingestion.near_duplicates import \
+    NearDuplicateDetector
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.ingestion.streaming_reader import (
+    detect_encoding, iter_split_text, iter_text_blocks)
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.retrieval.bm25_index import (
+    BM25Index, reciprocal_rank_fusion)
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.retrieval.document_partitions import \
+    DocumentPartitionCache
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.retrieval.mmr import \
+    maximal_marginal_relevance
 from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.tools.doc_retriever_tool import \
-    get_embedding_function
+    get_embedding_provider
 from backend.src.application.interfaces.rag_interfaces.document_repository import IDocumentRepository
 from backend.src.utils import get_isbn13
+from logs.log_config import setup_logger
+
+vector_logger = setup_logger("vectorstore")
 TEXT_FILES_DIR = rag_settings.TEXT_FILES_DIR
 CHROMA_PERSIST_DIR = rag_settings.CHROMA_PERSIST_DIR
-TEXT_FILES = [
-    os.path.join(TEXT_FILES_DIR, f)
-    for f in os.listdir(TEXT_FILES_DIR)
-    if os.path.isfile(os.path.join(TEXT_FILES_DIR, f)) and f.lower().endswith(".txt")
-]
-print("=== Text files to process:", TEXT_FILES)
+LEGACY_EMBEDDING_MODEL = f"models/{api_settings.GOOGLE_EMBEDDING_MODEL}"
+
+
+def list_text_files(text_files_dir: str = TEXT_FILES_DIR) -> List[str]:
+    """List the .txt files to sync; done at sync time, not at import time."""
+    return [
+        os.path.join(text_files_dir, f)
+        for f in os.listdir(text_files_dir)
+        if os.path.isfile(os.path.join(text_files_dir, f)) and f.lower().endswith(".txt")
+    ]
 
 
 def clean_file_name(name: str):
@@ -42,14 +70,14 @@ class ChromaVectorStoreRepositoryImpl(IVectorStoreRepository):
 
     def __init__(self, doc_repo: IDocumentRepository,
                  book_repo: BookRepository, 
-                 persist_directory: str = rag_settings.CHROMA_PERSIST_DIR):
+                 manifest_repo: IDocumentManifestRepository,
+                 persist_directory: str = rag_settings.CHROMA_PERSIST_DIR,
+                 sync_on_start: bool = True):
         
         self.doc_repo = doc_repo
         self.book_repo = book_repo
+        self.manifest_repo = manifest_repo
         self.persist_directory = persist_directory
-        self.metadata_file = os.path.join(persist_directory, "document_metadata.json")
-        
-        self.client = chromadb.PersistentClient(path=persist_directory)
         
         self.text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
             chunk_size=rag_settings.CHUNK_SIZE,
@@ -57,62 +85,90 @@ class ChromaVectorStoreRepositoryImpl(IVectorStoreRepository):
             separators=["\n\n", "\n", ". ", "? ", "! ", " ", ""],
             keep_separator=True,
         )
+        # Same encoding the splitter measures chunks with
+        self.token_encoder = tiktoken.get_encoding("gpt2")
 
-        self.embeddings = None
+        self.embeddings, self.embedding_model = self._initialize_embeddings()
+        self.embedding_pipeline: Optional[EmbeddingPipeline] = None
+        self.query_cache = QueryEmbeddingCache()
         self.current_document_hash: Optional[str] = None
-        self.processed_documents: Dict[str, Dict[str, Any]] = {}
+        # Lexical index over book_chunks, queried next to the vector search
+        self.bm25_index: Optional[BM25Index] = (
+            BM25Index() if rag_settings.HYBRID_SEARCH_ENABLED else None
+        )
+        self._lexical_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bm25")
+        # Blocking Chroma/tokenizer work of the async methods; ingests run on the
+        # ingestion queue's workers, so a long upload never holds up searches
+        self.retrieval_executor = BoundedExecutor(rag_settings.RETRIEVAL_EXECUTOR_WORKERS, "retrieval")
+        # Per-document embedding matrices for book-scoped retrieval
+        self.partitions = DocumentPartitionCache()
+        # Fingerprints of the chunks of documents being ingested, to skip chunks that
+        # repeat earlier text of the same document
+        self.near_duplicates: Optional[NearDuplicateDetector] = (
+            NearDuplicateDetector() if rag_settings.INGEST_SKIP_NEAR_DUPLICATES else None
+        )
 
-        self.collections: Dict[str, Any] = {
+        self.collections: Dict[str, Any] = self._create_collections()
+        for collection in self.collections.values():
+            self._check_embedding_model(collection)
+
+        if sync_on_start:
+            self._load_vectorstore()
+        else:
+            # Maintenance tools only need the collections, not a sync of TEXT_FILES_DIR
+            self.embedding_pipeline = EmbeddingPipeline(self.embeddings)
+
+    def _create_collections(self) -> Dict[str, Any]:
+        self.client = chromadb.PersistentClient(path=self.persist_directory)
+        for name in ("book_chunks", "summary_chunks"):
+            self._recover_rebuild(name)
+        # Collections record the embedding model that produced their vectors
+        return {
             "book_chunks": self.client.get_or_create_collection(
                 "book_chunks",
-                metadata={"hnsw:space": "cosine"}  # Use cosine distance
+                metadata={"hnsw:space": "cosine", "embedding_model": self.embedding_model}  # Use cosine distance
             ),
             "summary_chunks": self.client.get_or_create_collection(
                 "summary_chunks", 
-                metadata={"hnsw:space": "cosine"}
+                metadata={"hnsw:space": "cosine", "embedding_model": self.embedding_model}
             ),
         }
 
-        self._load_metadata()
-        self._load_vectorstore()
-
-    def _load_metadata(self):
-        """Load document metadata from JSON file"""
-        if os.path.exists(self.metadata_file):
-            try:
-                with open(self.metadata_file, "r") as f:
-                    self.processed_documents = json.load(f)
-                print(
-                    f"✓ Loaded metadata for {len(self.processed_documents)} documents"
-                )
-            except Exception as e:
-                print(f"⚠️  Failed to load metadata: {e}")
-                self.processed_documents = {}
-
-    def _save_metadata(self):
-        """Save document metadata to JSON file"""
-        try:
-            os.makedirs(self.persist_directory, exist_ok=True)
-            with open(self.metadata_file, "w") as f:
-                json.dump(self.processed_documents, f, indent=2, default=str)
-        except Exception as e:
-            print(f"⚠️  Failed to save metadata: {e}")
-
     def _load_vectorstore(self):
-        self.embeddings = self._initialize_embeddings()
+        self.embedding_pipeline = EmbeddingPipeline(self.embeddings)
         book_collection = self.collections["book_chunks"]
         summary_collection = self.collections["summary_chunks"]
+        if self.bm25_index is not None:
+            indexed = self.bm25_index.build_from_collection(book_collection)
+            print(f"✓ BM25 index built over {indexed} book chunks")
+        if self.near_duplicates is not None:
+            # Only interrupted ingests can still add chunks; completed documents are never re-chunked
+            in_progress = [
+                entry.document_hash for entry in self.manifest_repo.list_all() if entry.status == "in_progress"
+            ]
+            # One plain-equality filter per document so the exact backend can serve it too
+            for document_hash in in_progress:
+                self.near_duplicates.seed_from_collection(
+                    book_collection, where={"document_hash": document_hash}
+                )
+            if in_progress:
+                print(f"✓ Near-duplicate detector seeded with {self.near_duplicates.size} book chunks")
+        summary_chunks: List[LCDocument] = []
+        text_files = list_text_files()
+        print("=== Text files to process:", text_files)
         
-        for text_file_path in TEXT_FILES:
+        for text_file_path in text_files:
             file_hash = DocumentHasher.hash_file(text_file_path)
-            if file_hash in self.processed_documents:
+            if self._is_synced(file_hash):
                 continue
             
             print(f"Embedding new doc: {text_file_path}")
             cleaned_file_name = clean_file_name(os.path.basename(text_file_path))
             
             document = self.process_document(text_file_path, file_hash, cleaned_file_name)
-            self.doc_repo.save_document(document)
+            # A re-ingest for another backend already has its document row
+            if not self.doc_repo.document_exists(file_hash):
+                self.doc_repo.save_document(document)
             
             retries = len(cleaned_file_name.split())
             for i in range(retries):
@@ -126,86 +182,237 @@ class ChromaVectorStoreRepositoryImpl(IVectorStoreRepository):
             db_book = self.book_repo.get_by_isbn(isbn)
             if not db_book:
                 raise ValueError("no book found of such isbn, recheck your algorithm")
+            manifest_entry = self.manifest_repo.get(file_hash)
+            if manifest_entry:
+                manifest_entry.book_isbn = isbn
+                self.manifest_repo.save(manifest_entry)
             summary_text = self.book_repo.get_by_isbn(isbn).summary or ""
             
             if summary_text:
-                summary_embedding = self.embeddings.embed_query(summary_text)
-                summary_collection.add(
-                    ids=[isbn],
-                    embeddings=[summary_embedding],
-                    documents=[summary_text],
-                    metadatas=[{
-                        'isbn': isbn, 
-                        "title": cleaned_file_name
-                    }]
+                # Summaries are embedded together after the loop instead of one call per book
+                summary_chunks.append(
+                    LCDocument(
+                        page_content=summary_text,
+                        metadata={
+                            'isbn': isbn,
+                            "title": cleaned_file_name,
+                            "chunk_id": isbn,
+                        },
+                    )
                 )
+
+        if summary_chunks:
+            self.add_chunks_to_vectorstore("summary_chunks", summary_chunks)
         print(f"✓ Book chunks collection now has {book_collection.count()} items")
         print(f"✓ Summary collection now has {summary_collection.count()} items")
+        if hasattr(self.embeddings, "stats"):
+            print(f"✓ Embedding cache: {self.embeddings.stats()}")
+
+    def _is_synced(self, document_hash: str) -> bool:
+        """True if the startup sync can skip a document of TEXT_FILES_DIR (ingested or deleted)."""
+        entry = self.manifest_repo.get(document_hash)
+        return entry is not None and (entry.is_completed or entry.is_deleted)
+
+    def _resume_index(self, document_hash: str) -> int:
+        """Return the first chunk index that still has to be embedded for a document."""
+        entry = self.manifest_repo.get(document_hash)
+        if not entry or entry.status != "in_progress":
+            return 0
+        # Chunk ids are only stable if the document is split the same way as before
+        if (
+            entry.chunk_size != rag_settings.CHUNK_SIZE
+            or entry.chunk_overlap != rag_settings.CHUNK_OVERLAP
+            or entry.read_block_chars != rag_settings.INGEST_READ_BLOCK_CHARS
+            or entry.strip_boilerplate != rag_settings.INGEST_STRIP_BOILERPLATE
+        ):
+            return 0
+        return entry.committed_chunks
+
+    def _initialize_embeddings(self) -> Tuple[Any, str]:
+        return get_embedding_provider()
+
+    def _check_embedding_model(self, collection: Any) -> None:
+        """Refuse to mix vectors of different embedding models in one collection."""
+        recorded = (collection.metadata or {}).get("embedding_model")
+        if recorded is None and collection.count():
+            # Collections created before models were recorded were always embedded by Google
+            recorded = LEGACY_EMBEDDING_MODEL
+        if recorded is not None and recorded != self.embedding_model:
+            raise RuntimeError(
+                f"Collection {collection.name!r} was embedded with {recorded!r} but "
+                f"EMBEDDING_PROVIDER is configured for {self.embedding_model!r}; "
+                "use a separate CHROMA_PERSIST_DIR or switch the provider back"
+            )
+
+    def _count_tokens(self, text: str) -> int:
+        return len(self.token_encoder.encode(text, disallowed_special=()))
 
-    def _initialize_embeddings(self):
-        return get_embedding_function()
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a query, serving repeated questions from the in-process cache."""
+        return self.query_cache.get_or_compute(query, self.embeddings.embed_query)
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a query like searches do, so a later search of the same query is a cache hit."""
+        return self._embed_query(query)
+
+    async def _aembed_query(self, query: str) -> List[float]:
+        """Async `_embed_query`, through the embedding client's async API."""
+        return await self.query_cache.aget_or_compute(query, self.embeddings.aembed_query)
 
     # ==== CORE METHODS ====
-    def process_document(self, file_path: str, hash: str, file_name: str) -> Document:
-        """Load, hash, chunk, and prepare a document for storage."""
+    def process_document(
+        self,
+        file_path: str,
+        hash: str,
+        file_name: str,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> Document:
+        """Stream, chunk, embed and store a document in a single pass over the file."""
 
         try:
-            # Read file
-            with open(file_path, "rb") as file:
-                raw_data = file.read()
-                result = chardet.detect(raw_data)
-            encoding = result["encoding"] if result["encoding"] else "utf-8"
-            with open(file_path, "r", encoding=encoding) as file:
-                content = file.read()
-                
-            # Load and chunk
-            documents = TextLoader(file_path, encoding="utf-8").load()
-            chunks = self.text_splitter.split_documents(documents)
-
-            for i, chunk in enumerate(chunks):
-                chunk.metadata.update(
-                    {
-                        "document_hash": hash,
-                        "chunk_id": f"{hash[:8]}_chunk_{i}",
-                        "source_file": file_name,
-                        "chunk_index": i,
-                        "total_chunks": len(chunks),
-                    }
+            encoding = detect_encoding(file_path)
+
+            start_index = self._resume_index(hash)
+            if start_index:
+                print(f"↻ Resuming {file_name} from chunk {start_index}")
+
+            checkpoint = self.manifest_repo.save(
+                DocumentManifestEntry(
+                    document_hash=hash,
+                    filename=file_name,
+                    status="in_progress",
+                    chunk_id_prefix=hash[:8],
+                    committed_chunks=start_index,
+                    chunk_size=rag_settings.CHUNK_SIZE,
+                    chunk_overlap=rag_settings.CHUNK_OVERLAP,
+                    read_block_chars=rag_settings.INGEST_READ_BLOCK_CHARS,
+                    strip_boilerplate=rag_settings.INGEST_STRIP_BOILERPLATE,
                 )
+            )
 
-            self.add_chunks_to_vectorstore("book_chunks",chunks)
-            
-            self.processed_documents[hash] = {
-                "filename": file_name,
-                "chunk_count": len(chunks),
-                "chunk_ids": [chunk.metadata["chunk_id"] for chunk in chunks],
-            }
+            # Only a bounded preview of the text is kept; the full text lives in the chunks
+            preview_parts: List[str] = []
+            preview_len = 0
+            chunk_count = 0
+            skipped_chunks = 0
+            skipped_tokens = 0
+
+            blocks = iter_text_blocks(file_path, encoding)
+            boilerplate = GutenbergBoilerplateFilter(count_tokens=self._count_tokens)
+            if rag_settings.INGEST_STRIP_BOILERPLATE:
+                blocks = boilerplate.filter(blocks)
+
+            # Batches can finish out of order, so only advance the checkpoint over
+            # a contiguous run of written chunks
+            written_indexes = set()
+
+            def blocks_with_preview():
+                nonlocal preview_len
+                for block in blocks:
+                    if preview_len < rag_settings.DOCUMENT_PREVIEW_CHARS:
+                        part = block[:rag_settings.DOCUMENT_PREVIEW_CHARS - preview_len]
+                        preview_parts.append(part)
+                        preview_len += len(part)
+                    yield block
+
+            def chunk_documents():
+                nonlocal chunk_count, skipped_chunks, skipped_tokens
+                for i, text in enumerate(iter_split_text(blocks_with_preview(), self.text_splitter)):
+                    chunk_count = i + 1
+                    if i < start_index:
+                        continue  # already committed by an earlier, interrupted run
+                    if self.near_duplicates is not None and self.near_duplicates.check_and_add(text, hash):
+                        # Never embedded, but counts as done for the checkpoint
+                        skipped_chunks += 1
+                        skipped_tokens += self._count_tokens(text)
+                        written_indexes.add(i)
+                        continue
+                    yield LCDocument(
+                        page_content=text,
+                        metadata={
+                            "source": file_path,
+                            "document_hash": hash,
+                            "chunk_id": f"{checkpoint.chunk_id_prefix}_chunk_{i}",
+                            "source_file": file_name,
+                            "chunk_index": i,
+                        },
+                    )
 
-            self._save_metadata()
+            def commit_batch(batch: List[LCDocument]):
+                written_indexes.update(chunk.metadata["chunk_index"] for chunk in batch)
+                committed = checkpoint.committed_chunks
+                while committed in written_indexes:
+                    written_indexes.discard(committed)
+                    committed += 1
+                if committed != checkpoint.committed_chunks:
+                    checkpoint.committed_chunks = committed
+                    self.manifest_repo.update_committed(hash, committed)
+                if on_progress:
+                    on_progress(committed)
+
+            self.add_chunks_to_vectorstore(
+                "book_chunks", chunk_documents(), on_batch_written=commit_batch
+            )
+
+            book_isbn = get_isbn13(file_name)
+            checkpoint.status = "completed"
+            checkpoint.chunk_count = chunk_count
+            checkpoint.committed_chunks = chunk_count
+            checkpoint.book_isbn = book_isbn
+            self.manifest_repo.save(checkpoint)
+            if self.near_duplicates is not None:
+                # A completed document is never re-chunked, so its fingerprints are dead weight
+                self.near_duplicates.remove_document(hash)
+            print(
+                f"✓ Ingest savings for {file_name}: {boilerplate.stripped_tokens} boilerplate tokens stripped, "
+                f"{skipped_chunks} near-duplicate chunks ({skipped_tokens} tokens) skipped"
+            )
 
             document_entity = Document(
-                book_isbn=get_isbn13(file_name),
+                book_isbn=book_isbn,
                 title=file_name,
-                content=content,
+                content="".join(preview_parts),
                 hash=hash,
             )
 
             return document_entity
         except Exception as e:
+            if self.near_duplicates is not None:
+                # Fingerprints of chunks that never got stored would make a retry skip them
+                self.near_duplicates.remove_document(hash)
             raise RuntimeError(f"Failed to process document {file_path}: {e}")
 
-    def add_chunks_to_vectorstore(self, collection_name: str, chunks: List[LCDocument]):
-        """Add new chunks to existing vectorstore"""
+    def add_chunks_to_vectorstore(
+        self,
+        collection_name: str,
+        chunks: Iterable[LCDocument],
+        on_batch_written: Optional[Callable[[List[LCDocument]], None]] = None,
+    ):
+        """Embed chunks in concurrent batches and upsert each batch into the collection as soon as it is done"""
         collection = self.collections[collection_name]
-        embeddings = self.embeddings.embed_documents([chunk.page_content for chunk in chunks])
-        
-        collection.add(
-            ids=[chunk.metadata['chunk_id'] for chunk in chunks],
-            embeddings=embeddings,
-            documents=[chunk.page_content for chunk in chunks],
-            metadatas=[chunk.metadata for chunk in chunks]
-        )
-        
+
+        def write_batch(batch: List[LCDocument], embeddings: List[List[float]]):
+            # Upsert so that re-running an interrupted ingest never collides on ids
+            collection.upsert(
+                ids=[chunk.metadata['chunk_id'] for chunk in batch],
+                embeddings=embeddings,
+                documents=[chunk.page_content for chunk in batch],
+                metadatas=[chunk.metadata for chunk in batch]
+            )
+            if collection_name == "book_chunks":
+                if self.bm25_index is not None:
+                    self.bm25_index.add(
+                        [chunk.metadata['chunk_id'] for chunk in batch],
+                        [chunk.page_content for chunk in batch],
+                        [chunk.metadata for chunk in batch],
+                    )
+                for document_hash in {chunk.metadata.get("document_hash") for chunk in batch}:
+                    self.partitions.invalidate(document_hash)
+            if on_batch_written:
+                on_batch_written(batch)
+
+        progress = self.embedding_pipeline.run(chunks, write_batch)
+        print(f"✓ Added to {collection_name}: {progress.summary()}")
 
     def get_similar_chunks(
         self, 
@@ -213,67 +420,479 @@ class ChromaVectorStoreRepositoryImpl(IVectorStoreRepository):
         k: int = 4, 
         threshold: float = 0.7, 
         collection_name: str = "book_chunks", 
-        filter_dict: dict = None
+        filter_dict: dict = None,
+        mmr: Optional[bool] = None,
     ) -> List[LCDocument]:
-        """Get similar chunks for a query with optional metadata filtering and proper distance handling"""
-        
+        """
+        Get similar chunks for a query with optional metadata filtering and proper distance handling.
+
+        With `mmr` (defaults to `MMR_ENABLED`) a larger candidate pool is fetched and a
+        diverse top-k is picked by maximal marginal relevance, so overlapping neighbour
+        chunks of the same passage do not crowd out the prompt.
+        """
+        return self._search_similar(query, None, k, collection_name, filter_dict, mmr)
+
+    async def aget_similar_chunks(
+        self,
+        query: str,
+        k: int = 4,
+        threshold: float = 0.7,
+        collection_name: str = "book_chunks",
+        filter_dict: dict = None,
+        mmr: Optional[bool] = None,
+    ) -> List[LCDocument]:
+        """
+        Async `get_similar_chunks`: the query is embedded with the async embedding API
+        and the index search runs on `retrieval_executor`, off the event loop.
+        """
+        query_embedding = await self._aembed_query(query)
+        return await self.retrieval_executor.run(
+            self._search_similar, query, query_embedding, k, collection_name, filter_dict, mmr
+        )
+
+    def _search_similar(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]],
+        k: int,
+        collection_name: str,
+        filter_dict: Optional[dict],
+        mmr: Optional[bool],
+    ) -> List[LCDocument]:
+        """Search body of `get_similar_chunks`; the query is embedded here unless given."""
         collection = self.collections[collection_name]
-        query_embedding = self.embeddings.embed_query(query)
+        use_mmr = rag_settings.MMR_ENABLED if mmr is None else mmr
+
+        k, threshold = self._search_params(collection_name, k)
+
+        use_hybrid = collection_name == "book_chunks" and self._supports_lexical_filter(filter_dict)
+        n_results = k
+        if use_hybrid:
+            n_results = k * rag_settings.HYBRID_CANDIDATE_MULTIPLIER
+        if use_mmr:
+            n_results = max(n_results, k * rag_settings.MMR_FETCH_MULTIPLIER)
+
+        # Book chunks are also searched lexically, in parallel with the embedding + vector query
+        lexical_future = None
+        if use_hybrid:
+            lexical_future = self._lexical_executor.submit(
+                self.bm25_index.search,
+                query,
+                n_results,
+                (filter_dict or {}).get("document_hash"),
+            )
 
-        # Adjust parameters for different collection types
-        if collection_name == "summary_chunks":
-            k = rag_settings.SUMMARY_TOP_K
-            threshold = 0.85
+        if query_embedding is None:
+            query_embedding = self._embed_query(query)
+
+        document_hash = self._partition_key(collection_name, filter_dict)
+        if document_hash is not None:
+            # Book-scoped search runs exactly over that book's partition instead of a filtered index query
+            document_ids, documents, embeddings_by_id = self._search_partition(
+                document_hash, query_embedding, n_results, threshold
+            )
         else:
-            threshold = 0.4
-
-        # Step 1: Query the vector store
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=k,
-            include=["distances", "documents", "metadatas"],
-            where=filter_dict if filter_dict else None 
+            # Step 1: Query the vector store
+            include = ["distances", "documents", "metadatas"]
+            if use_mmr:
+                include.append("embeddings")
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                include=include,
+                where=filter_dict if filter_dict else None 
+            )
+
+            # Steps 2-4: threshold and post-filter the hits
+            document_ids, documents, embeddings_by_id = self._filter_query_result(
+                results, 0, threshold, filter_dict, with_embeddings=use_mmr
+            )
+
+        # Step 5: Merge dense and lexical rankings by reciprocal rank fusion
+        pool_size = n_results if use_mmr else k
+        if lexical_future is not None:
+            lexical_ids = [chunk_id for chunk_id, _ in lexical_future.result()]
+            document_ids, documents = self._fuse_rankings(
+                collection, document_ids, documents, lexical_ids, pool_size,
+                embeddings_by_id if use_mmr else None,
+            )
+
+        if not use_mmr:
+            return documents
+
+        # Step 6: Diversify the candidate pool
+        candidate_embeddings = [embeddings_by_id[chunk_id] for chunk_id in document_ids]
+        selected = maximal_marginal_relevance(
+            query_embedding, candidate_embeddings, k, rag_settings.MMR_LAMBDA
         )
+        return [documents[i] for i in selected]
+
+    def get_similar_chunks_batch(
+        self,
+        queries: List[str],
+        k: int = 4,
+        collection_name: str = "book_chunks",
+        filter_dict: dict = None,
+    ) -> List[List[LCDocument]]:
+        """
+        Retrieve chunks for many queries at once.
+
+        All queries are embedded in one `embed_documents` call (cached ones are
+        skipped) and searched with one Chroma query; the collection threshold and
+        `filter_dict` are then applied to every result list. Book chunk searches
+        are fused with the lexical index like `get_similar_chunks`; MMR is not applied.
+        """
+        if not queries:
+            return []
 
-        documents = []
+        collection = self.collections[collection_name]
+        k, threshold = self._search_params(collection_name, k)
 
-        # Step 2: Check and iterate through results
-        if results.get("documents") and results["documents"][0]:
-            docs = results["documents"][0]
-            metadatas = results["metadatas"][0]
-            distances = results["distances"][0]
+        use_hybrid = collection_name == "book_chunks" and self._supports_lexical_filter(filter_dict)
+        n_results = k * rag_settings.HYBRID_CANDIDATE_MULTIPLIER if use_hybrid else k
 
-            for i, distance in enumerate(distances):
-                similarity = 1 - distance  # convert distance to similarity
-                metadata = metadatas[i] if i < len(metadatas) else {}
+        lexical_futures = []
+        if use_hybrid:
+            document_hash = (filter_dict or {}).get("document_hash")
+            lexical_futures = [
+                self._lexical_executor.submit(self.bm25_index.search, query, n_results, document_hash)
+                for query in queries
+            ]
 
-                # Step 3: Manual post-filtering if backend doesn't support `where`
-                if filter_dict:
-                    match = all(metadata.get(k) == v for k, v in filter_dict.items())
-                    if not match:
-                        continue
+        query_embeddings = self.query_cache.get_or_compute_many(
+            queries, self.embeddings.embed_documents
+        )
+        document_hash = self._partition_key(collection_name, filter_dict)
+        results = None
+        if document_hash is None:
+            results = collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                include=["distances", "documents", "metadatas"],
+                where=filter_dict if filter_dict else None,
+            )
 
-                # Step 4: Add if above threshold
-                if similarity >= threshold:
-                    documents.append(
-                        LCDocument(
-                            page_content=docs[i],
-                            metadata=metadata
-                        )
-                    )
+        batch_documents: List[List[LCDocument]] = []
+        for row in range(len(queries)):
+            if results is None:
+                document_ids, documents, _ = self._search_partition(
+                    document_hash, query_embeddings[row], n_results, threshold
+                )
+            else:
+                document_ids, documents, _ = self._filter_query_result(
+                    results, row, threshold, filter_dict
+                )
+            if use_hybrid:
+                lexical_ids = [chunk_id for chunk_id, _ in lexical_futures[row].result()]
+                _, documents = self._fuse_rankings(
+                    collection, document_ids, documents, lexical_ids, k
+                )
+            batch_documents.append(documents)
+        return batch_documents
 
-        return documents
+    def _search_params(self, collection_name: str, k: int) -> Tuple[int, float]:
+        """Return the (k, similarity threshold) used for a collection."""
+        if collection_name == "summary_chunks":
+            return rag_settings.SUMMARY_TOP_K, 0.85
+        return k, 0.4
+
+    def _filter_query_result(
+        self,
+        results: Dict[str, Any],
+        row: int,
+        threshold: float,
+        filter_dict: Optional[dict],
+        with_embeddings: bool = False,
+    ) -> Tuple[List[str], List[LCDocument], Dict[str, Any]]:
+        """Turn one query's row of a Chroma result into the ids and documents above the threshold."""
+        document_ids: List[str] = []
+        documents: List[LCDocument] = []
+        embeddings_by_id: Dict[str, Any] = {}
+
+        if not (results.get("documents") and results["documents"][row]):
+            return document_ids, documents, embeddings_by_id
+
+        ids = results["ids"][row]
+        docs = results["documents"][row]
+        metadatas = results["metadatas"][row]
+        distances = results["distances"][row]
+
+        for i, distance in enumerate(distances):
+            similarity = 1 - distance  # convert distance to similarity
+            metadata = metadatas[i] if i < len(metadatas) else {}
+
+            # Manual post-filtering if backend doesn't support `where`
+            if filter_dict:
+                match = all(metadata.get(key) == value for key, value in filter_dict.items())
+                if not match:
+                    continue
+
+            if similarity >= threshold:
+                document_ids.append(ids[i])
+                metadata = {**metadata, "score": similarity}
+                documents.append(LCDocument(page_content=docs[i], metadata=metadata))
+                if with_embeddings:
+                    embeddings_by_id[ids[i]] = results["embeddings"][row][i]
+
+        return document_ids, documents, embeddings_by_id
+
+    def _partition_key(self, collection_name: str, filter_dict: Optional[dict]) -> Optional[str]:
+        """Return the document hash when a search is scoped to exactly one book."""
+        if collection_name == "book_chunks" and filter_dict and set(filter_dict) == {"document_hash"}:
+            return filter_dict["document_hash"]
+        return None
+
+    def _search_partition(
+        self,
+        document_hash: str,
+        query_embedding: List[float],
+        n_results: int,
+        threshold: float,
+    ) -> Tuple[List[str], List[LCDocument], Dict[str, Any]]:
+        """Exact top-k over one document's chunks, in the same shape as `_filter_query_result`."""
+        partition = self.partitions.get(self.collections["book_chunks"], document_hash)
+        document_ids: List[str] = []
+        documents: List[LCDocument] = []
+        embeddings_by_id: Dict[str, Any] = {}
+        for row, similarity in partition.search(query_embedding, n_results):
+            if similarity < threshold:
+                break  # results are sorted, the rest is below the threshold too
+            chunk_id = partition.ids[row]
+            document_ids.append(chunk_id)
+            documents.append(
+                LCDocument(
+                    page_content=partition.documents[row],
+                    metadata={**partition.metadatas[row], "score": similarity},
+                )
+            )
+            embeddings_by_id[chunk_id] = partition.matrix[row]
+        return document_ids, documents, embeddings_by_id
+
+    def _supports_lexical_filter(self, filter_dict: Optional[dict]) -> bool:
+        # The lexical index only knows which document a chunk belongs to
+        return self.bm25_index is not None and set(filter_dict or {}) <= {"document_hash"}
+
+    def _fuse_rankings(
+        self,
+        collection: Any,
+        dense_ids: List[str],
+        dense_documents: List[LCDocument],
+        lexical_ids: List[str],
+        limit: int,
+        embeddings_by_id: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[str], List[LCDocument]]:
+        """Return the top `limit` ids and documents of the RRF merge of both rankings."""
+        fused_ids = [chunk_id for chunk_id, _ in reciprocal_rank_fusion([dense_ids, lexical_ids])[:limit]]
+        by_id = dict(zip(dense_ids, dense_documents))
+
+        # Lexical-only hits were not returned by the vector query, fetch them by id
+        missing = [chunk_id for chunk_id in fused_ids if chunk_id not in by_id]
+        if missing:
+            include = ["documents", "metadatas"]
+            if embeddings_by_id is not None:
+                include.append("embeddings")
+            fetched = collection.get(ids=missing, include=include)
+            for i, chunk_id in enumerate(fetched["ids"]):
+                by_id[chunk_id] = LCDocument(
+                    page_content=fetched["documents"][i],
+                    metadata=fetched["metadatas"][i] or {},
+                )
+                if embeddings_by_id is not None:
+                    embeddings_by_id[chunk_id] = fetched["embeddings"][i]
+
+        ordered_ids = [chunk_id for chunk_id in fused_ids if chunk_id in by_id]
+        return ordered_ids, [by_id[chunk_id] for chunk_id in ordered_ids]
 
 
     def get_document_chunks(self, query: str, document_hash: str, k: int = 6) -> List[LCDocument]:
-        collection = self.collections["book_chunks"]
-        query_embedding = self.embeddings.embed_query(query)
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=k,
-            where={"document_hash": document_hash}
+        """Top-k chunks of one document, best first, with their similarity in `metadata["score"]`."""
+        query_embedding = self._embed_query(query)
+        _, documents, _ = self._search_partition(
+            document_hash, query_embedding, k, threshold=float("-inf")
         )
-        return results["documents"]
+        return documents
+
+    # ==== DELETION & MAINTENANCE ====
+    def delete_document_vectors(self, document_hash: str) -> Dict[str, int]:
+        """
+        Remove the chunks and the summary of a document and tombstone its manifest entry.
+
+        The tombstone keeps the startup sync from re-ingesting a file that is still in
+        TEXT_FILES_DIR; uploading the document again replaces it.
+        """
+        entry = self.manifest_repo.get(document_hash)
+
+        book_collection = self.collections["book_chunks"]
+        chunk_ids = book_collection.get(where={"document_hash": document_hash}, include=[])["ids"]
+        self._delete_ids(book_collection, chunk_ids)
+        self.manifest_repo.add_deleted_vectors("book_chunks", len(chunk_ids))
+
+        # The summary belongs to the book, keep it while another upload of the same book remains
+        summary_ids: List[str] = []
+        isbn = entry.book_isbn if entry else None
+        if isbn and not any(
+            other.book_isbn == isbn and other.document_hash != document_hash and not other.is_deleted
+            for other in self.manifest_repo.list_all()
+        ):
+            summary_collection = self.collections["summary_chunks"]
+            summary_ids = summary_collection.get(where={"isbn": isbn}, include=[])["ids"]
+            self._delete_ids(summary_collection, summary_ids)
+            self.manifest_repo.add_deleted_vectors("summary_chunks", len(summary_ids))
+
+        if self.bm25_index is not None:
+            self.bm25_index.remove(chunk_ids)
+        if self.near_duplicates is not None:
+            self.near_duplicates.remove_document(document_hash)
+        self.partitions.invalidate(document_hash)
+        manifest_deleted = self.manifest_repo.mark_deleted(document_hash)
+
+        print(f"✓ Deleted {len(chunk_ids)} chunks and {len(summary_ids)} summaries of {document_hash}")
+        return {
+            "chunks": len(chunk_ids),
+            "summaries": len(summary_ids),
+            "manifest_entries": int(manifest_deleted),
+        }
+
+    def collection_health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report stored, live and dead vectors per collection.
+
+        Dead vectors are chunks whose document is deleted or not in the manifest, plus
+        any rows the backend still stores after deletes (see `_stored_vector_count`).
+        Summaries are keyed by ISBN, which legacy manifest entries lack, so only
+        book chunks are checked for orphans.
+        """
+        known_hashes = self._live_document_hashes()
+        report: Dict[str, Dict[str, Any]] = {}
+        for name, collection in self.collections.items():
+            orphaned = len(self._orphan_ids(name, collection, known_hashes))
+            live = collection.count() - orphaned
+            stored = self._stored_vector_count(collection)
+            dead = stored - live
+            report[name] = {
+                "stored": stored,
+                "live": live,
+                "orphaned": orphaned,
+                "dead": dead,
+                "dead_ratio": round(dead / stored, 4) if stored else 0.0,
+            }
+        return report
+
+    def compact_collection(self, collection_name: str) -> Dict[str, Any]:
+        """Drop orphaned chunks and rebuild a collection without dead vectors; run offline."""
+        collection = self.collections[collection_name]
+        known_hashes = self._live_document_hashes()
+        orphans = self._orphan_ids(collection_name, collection, known_hashes)
+        self._delete_ids(collection, [chunk_id for chunk_id, _ in orphans])
+
+        if collection_name == "book_chunks":
+            if self.bm25_index is not None:
+                self.bm25_index.remove([chunk_id for chunk_id, _ in orphans])
+            for document_hash in {document_hash for _, document_hash in orphans}:
+                if self.near_duplicates is not None:
+                    self.near_duplicates.remove_document(document_hash)
+                self.partitions.invalidate(document_hash)
+
+        self.collections[collection_name] = self._rebuild_collection(collection_name)
+        self.manifest_repo.reset_deleted_vectors(collection_name)
+        return self.collection_health()[collection_name]
+
+    def _live_document_hashes(self) -> set:
+        return {entry.document_hash for entry in self.manifest_repo.list_all() if not entry.is_deleted}
+
+    def _orphan_ids(self, collection_name: str, collection: Any, known_hashes: set, page_size: int = 1000):
+        """(chunk id, document hash) of book chunks whose document is not in the manifest."""
+        if collection_name != "book_chunks":
+            return []
+        orphans = []
+        offset = 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                return orphans
+            for chunk_id, metadata in zip(ids, page.get("metadatas") or []):
+                document_hash = (metadata or {}).get("document_hash")
+                if document_hash not in known_hashes:
+                    orphans.append((chunk_id, document_hash))
+            offset += len(ids)
+
+    def _stored_vector_count(self, collection: Any) -> int:
+        # Chroma does not expose its HNSW tombstones; deletes are counted in the manifest
+        # database instead and stay stored until the collection is rebuilt
+        return collection.count() + self.manifest_repo.get_deleted_vectors(collection.name)
+
+    def _rebuild_collection(self, collection_name: str, page_size: int = 1000) -> Any:
+        """Copy the live records into a fresh collection, which also drops HNSW tombstones."""
+        rebuild_name = f"{collection_name}_rebuild"
+        self._recover_rebuild(collection_name)
+        old = self.client.get_collection(collection_name)
+        new = self.client.create_collection(rebuild_name, metadata=old.metadata)
+
+        offset = 0
+        while True:
+            page = old.get(include=["documents", "metadatas", "embeddings"], limit=page_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            new.add(
+                ids=ids,
+                embeddings=page["embeddings"],
+                documents=page["documents"],
+                metadatas=page["metadatas"],
+            )
+            offset += len(ids)
+
+        self.client.delete_collection(collection_name)
+        new.modify(name=collection_name)
+        return new
+
+    def _recover_rebuild(self, collection_name: str) -> None:
+        """
+        Finish or discard a rebuild that was interrupted.
+
+        `_rebuild_collection` drops the original before renaming the copy, so a
+        missing or empty original means the copy holds the data and is renamed back;
+        next to a populated original the copy is an unfinished one and is dropped.
+        """
+        rebuild_name = f"{collection_name}_rebuild"
+        try:
+            rebuild = self.client.get_collection(rebuild_name)
+        except NotFoundError:
+            return
+        try:
+            original = self.client.get_collection(collection_name)
+        except NotFoundError:
+            original = None
+
+        if original is None or not original.count():
+            if original is not None:
+                self.client.delete_collection(collection_name)
+            rebuild.modify(name=collection_name)
+            vector_logger.warning(
+                f"Restored {collection_name!r} from an interrupted rebuild ({rebuild.count()} vectors)"
+            )
+        else:
+            self.client.delete_collection(rebuild_name)
+            vector_logger.warning(f"Dropped an unfinished rebuild of {collection_name!r}")
+
+    @staticmethod
+    def _delete_ids(collection: Any, ids: List[str], batch_size: int = 1000) -> None:
+        for start in range(0, len(ids), batch_size):
+            collection.delete(ids=ids[start:start + batch_size])
 
     def get_all_processed_docs(self) -> Dict[Any, Any]:
-        return {hash: doc_name['filename'] for (hash, doc_name) in self.processed_documents.items()}
+        return self.manifest_repo.list_completed()
+
+    def is_document_processed(self, document_hash: str) -> bool:
+        return self.manifest_repo.is_completed(document_hash)
+
+    def executor_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and timings of the pools behind the async methods."""
+        return {
+            "retrieval": self.retrieval_executor.stats(),
+        }
+
+    def shutdown_executors(self) -> None:
+        self.retrieval_executor.shutdown()
+        self._lexical_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,110 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from backend.src.infrastructure.config.settings import rag_settings
+from backend.src.infrastructure.jobs.ingestion_jobs import IngestionJobQueue
+from backend.src.infrastructure.jobs.vectorstore_warmup import VectorStoreWarmup
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.graph_builder import (
+    build_graph, build_query_router)
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.llm.client_registry import (
+    LLMClientRegistry, get_llm_registry)
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.llm.llm import (
+    get_big_llm, get_decent_llm, get_field_extractor_llm, get_small_llm)
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.tools.doc_retriever_tool import \
+    get_embedding_provider
+from logs.log_config import setup_logger
+
+container_logger = setup_logger("resource_container")
+
+
+class ResourceContainer:
+    """
+    Process-wide resources of the API, built once in the FastAPI lifespan.
+
+    Holds the embedding function, the pooled LLM clients, the ingestion queue and the vector
+    store warmup; the compiled RAG graph is built on the warmup thread right after the
+    vector store, since it needs it. Request-scoped objects (DB sessions and the
+    repositories on top of them) are not kept here; routes get them from `get_db`.
+    `init_timings` records how many seconds each resource took to build.
+    """
+
+    def __init__(self):
+        self.init_timings: Dict[str, float] = {}
+        self._timings_lock = threading.Lock()
+        self.embeddings: Optional[Embeddings] = None
+        self.embedding_model: Optional[str] = None
+        self.llm_registry: Optional[LLMClientRegistry] = None
+        self.llms: Dict[str, Any] = {}
+        self.graph: Any = None
+        self.ingestion_queue: Optional[IngestionJobQueue] = None
+        self.vectorstore_warmup: Optional[VectorStoreWarmup] = None
+
+    @contextmanager
+    def _timed(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = round(time.perf_counter() - started, 3)
+            with self._timings_lock:
+                self.init_timings[name] = elapsed
+            container_logger.info(f"Initialized {name} in {elapsed}s")
+
+    def start(self) -> None:
+        """Build the cheap resources now and start the vector store sync in the background."""
+        with self._timed("embeddings"):
+            self.embeddings, self.embedding_model = get_embedding_provider()
+        with self._timed("llm_clients"):
+            self.llm_registry = get_llm_registry()
+            self.llms = {
+                "small": get_small_llm(),
+                "decent": get_decent_llm(),
+                "big": get_big_llm(),
+                "field_extractor": get_field_extractor_llm(),
+            }
+        with self._timed("ingestion_queue"):
+            self.ingestion_queue = IngestionJobQueue()
+        # Vector store sync can take minutes; serve /books and /users meanwhile
+        self.vectorstore_warmup = VectorStoreWarmup(factory=self._build_vector_resources)
+        self.vectorstore_warmup.start()
+
+    def _build_vector_resources(self):
+        # Imported here: dependencies imports this module for the FastAPI dependencies
+        from backend.src.infrastructure.web.dependencies import build_vector_repo
+
+        with self._timed("vector_repo"):
+            vector_repo = build_vector_repo()
+        router = None
+        if rag_settings.LOCAL_ROUTER_ENABLED:
+            with self._timed("query_router"):
+                router = build_query_router(vector_repo)
+        with self._timed("graph"):
+            # Book lookups use the request's repository, passed in through the run config
+            self.graph = build_graph(vector_repo=vector_repo, router=router)
+        return vector_repo
+
+    async def shutdown(self) -> None:
+        if self.llm_registry is not None:
+            await self.llm_registry.aclose()
+        if self.ingestion_queue is not None:
+            self.ingestion_queue.shutdown(wait=False)
+        if self.vectorstore_warmup is not None and self.vectorstore_warmup.is_ready:
+            self.vectorstore_warmup.vector_repo.shutdown_executors()
+
+    def status(self) -> Dict[str, Any]:
+        with self._timings_lock:
+            timings = dict(self.init_timings)
+        status = {
+            "init_timings": timings,
+            "embedding_model": self.embedding_model,
+            "graph_ready": self.graph is not None,
+        }
+        if self.llm_registry is not None:
+            status["llm_pool"] = self.llm_registry.stats()
+        if self.vectorstore_warmup is not None and self.vectorstore_warmup.is_ready:
+            status["executors"] = self.vectorstore_warmup.vector_repo.executor_stats()
+        return status
@@ -1,9 +1,12 @@
-from functools import lru_cache
+import os
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from backend.src.infrastructure.persistence.database import get_db
+from backend.src.infrastructure.config.settings import rag_settings
+from backend.src.infrastructure.jobs.ingestion_jobs import IngestionJobQueue
+from backend.src.infrastructure.jobs.vectorstore_warmup import VectorStoreWarmup
+from backend.src.infrastructure.persistence.database import SessionLocal, get_db
 from backend.src.infrastructure.persistence.repository_impl.library_repos_impl.book_repository_impl import BookRepositoryImpl
 from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.chat_session_repository_impl import \
     ChatSessionRepositoryImpl
@@ -13,26 +16,89 @@ from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.vecto
     ChromaVectorStoreRepositoryImpl
 from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.document_repository_impl import \
     DocumentRepositoryImpl
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.document_manifest_repository_impl import \
+    DocumentManifestRepositoryImpl
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.exact_vectorstore_repository_impl import \
+    ExactVectorStoreRepositoryImpl
+from backend.src.infrastructure.web.container import ResourceContainer
+
+def build_vector_repo(sync_on_start: bool = True) -> ChromaVectorStoreRepositoryImpl:
+    """Build the configured vector store; `sync_on_start=False` skips syncing TEXT_FILES_DIR."""
+    # The singleton outlives every request and is used from several threads, so its
+    # repositories open a short session per operation instead of sharing one
+    manifest_repo = DocumentManifestRepositoryImpl(SessionLocal)
+    # One-off migration of the old document_metadata.json into the SQL manifest
+    manifest_repo.import_legacy_json(
+        os.path.join(rag_settings.CHROMA_PERSIST_DIR, "document_metadata.json")
+    )
+    repo_class = (
+        ExactVectorStoreRepositoryImpl
+        if rag_settings.VECTOR_STORE_BACKEND == "exact"
+        else ChromaVectorStoreRepositoryImpl
+    )
+    return repo_class(
+        doc_repo=DocumentRepositoryImpl(session_factory=SessionLocal),
+        book_repo=BookRepositoryImpl(session_factory=SessionLocal),
+        manifest_repo=manifest_repo,
+        sync_on_start=sync_on_start,
+    )
+
+
+def get_resources(request: Request) -> ResourceContainer:
+    """Resources built once in the application lifespan."""
+    return request.app.state.resources
+
+
+def get_vectorstore_warmup(
+    resources: ResourceContainer = Depends(get_resources),
+) -> VectorStoreWarmup:
+    """Background sync that builds the singleton Chroma vectorstore."""
+    return resources.vectorstore_warmup  # type: ignore
 
-@lru_cache()
-def get_vector_repo(db: Session = Depends(get_db)) -> ChromaVectorStoreRepositoryImpl:
-    """Singleton instance of the Chroma vectorstore."""
-    return ChromaVectorStoreRepositoryImpl(doc_repo=DocumentRepositoryImpl(db), book_repo=BookRepositoryImpl(db))
+
+def get_vector_repo(
+    warmup: VectorStoreWarmup = Depends(get_vectorstore_warmup),
+) -> ChromaVectorStoreRepositoryImpl:
+    """Singleton instance of the Chroma vectorstore, once the background sync is done."""
+    if not warmup.is_ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "message": "The RAG service is warming up, please try again shortly.",
+                **warmup.status(),
+            },
+            headers={"Retry-After": "5"},
+        )
+    return warmup.vector_repo  # type: ignore
+
+
+def get_ingestion_queue(
+    resources: ResourceContainer = Depends(get_resources),
+) -> IngestionJobQueue:
+    """Process-wide queue that runs document ingestion in the background."""
+    return resources.ingestion_queue  # type: ignore
 
 
 def get_chat_session_repo(db: Session = Depends(get_db)) -> ChatSessionRepositoryImpl:
     """Provides chat session repository per request."""
     return ChatSessionRepositoryImpl(db)
+
+
 def get_book_repo(db: Session = Depends(get_db)) -> BookRepositoryImpl:
     return BookRepositoryImpl(db)
+
+
 def get_rag_repo(
+    resources: ResourceContainer = Depends(get_resources),
     vector_repo: ChromaVectorStoreRepositoryImpl = Depends(get_vector_repo),
     chat_repo: ChatSessionRepositoryImpl = Depends(get_chat_session_repo),
     book_repo: BookRepositoryImpl = Depends(get_book_repo)
 ) -> LangGraphRAGRepositoryImpl:
-    """Creates RAG repository with injected dependencies."""
+    """RAG repository over the shared graph and LLM clients and this request's repositories."""
     return LangGraphRAGRepositoryImpl(
         vector_repo=vector_repo,
         chat_repo=chat_repo,
-        books_repo=book_repo
+        books_repo=book_repo,
+        graph=resources.graph,
+        llms=resources.llms,
     )
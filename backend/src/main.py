@@ -1,6 +1,7 @@
 import json
 import logging
 import time
+from contextlib import asynccontextmanager
 from logging.handlers import RotatingFileHandler
 
 from fastapi import FastAPI, Request
@@ -10,6 +11,7 @@ from fastapi.responses import JSONResponse
 
 from backend.src.infrastructure.config.settings import settings
 from backend.src.infrastructure.persistence.database import create_tables
+from backend.src.infrastructure.web.container import ResourceContainer
 from backend.src.presentation.routers.v1 import books, rag, users
 from backend.src.presentation.routers.v1.api import router as api_router
 
@@ -17,12 +19,21 @@ RATE_LIMIT = settings.RATE_LIMIT
 WINDOW_SIZE = settings.RATE_LIMIT_WINDOW_SIZE
 
 request_counts = {}
-app = FastAPI()
 
 
-@app.on_event("startup")
-def startup_event():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     create_tables()
+    resources = ResourceContainer()
+    resources.start()
+    app.state.resources = resources
+    try:
+        yield
+    finally:
+        await resources.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 ### LOGGING
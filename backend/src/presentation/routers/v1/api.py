@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 
 import psutil
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import text
 from sqlalchemy.orm import Session
@@ -10,6 +11,10 @@ from backend.src.infrastructure.config.settings import settings
 from backend.src.infrastructure.persistence.database import get_db
 from backend.src.infrastructure.web.auth_provider import (
     ACCESS_TOKEN_EXPIRE_MINUTES, authenticate_user, create_access_token)
+from backend.src.infrastructure.jobs.vectorstore_warmup import VectorStoreWarmup
+from backend.src.infrastructure.web.container import ResourceContainer
+from backend.src.infrastructure.web.dependencies import (get_resources,
+                                                         get_vectorstore_warmup)
 from backend.src.presentation.schemas.library_schemas import token_schema
 
 SYSTEM_BOOT_TIME = datetime.fromtimestamp(psutil.boot_time())
@@ -38,7 +43,10 @@ def login_for_access_token(
 
 
 @router.get("/health")
-def health_check(db: Session = Depends(get_db)):
+def health_check(
+    db: Session = Depends(get_db),
+    warmup: VectorStoreWarmup = Depends(get_vectorstore_warmup),
+):
     uptime_delta = datetime.now() - SYSTEM_BOOT_TIME
     total_seconds = int(uptime_delta.total_seconds())
     days, remainder = divmod(total_seconds, 86400)
@@ -65,5 +73,20 @@ def health_check(db: Session = Depends(get_db)):
         "system_uptime": sys_uptime_str,
         "app_uptime": app_uptime_str,
         "total_token_validity": f"{ACCESS_TOKEN_EXPIRE_MINUTES} minutes",
+        "vectorstore": warmup.state,
         "version": APP_VERSION,
     }
+
+
+@router.get("/ready")
+def readiness_check(resources: ResourceContainer = Depends(get_resources)):
+    """
+    Readiness probe: 200 once the vector store sync is done, 503 while it is still
+    warming up or if it failed. Also reports how long each resource took to build.
+    """
+    warmup_status = resources.vectorstore_warmup.status()  # type: ignore
+    ready = warmup_status["state"] == "ready"
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"ready": ready, "vectorstore": warmup_status, "resources": resources.status()},
+    )
@@ -1,14 +1,19 @@
+import asyncio
+import json
 import os
 import tempfile
 from functools import lru_cache
 from typing import List, Optional
 
 from fastapi import (APIRouter, Depends, File, HTTPException, Query,
-                     UploadFile, status)
+                     Request, UploadFile, status)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from backend.src.application.use_cases._rag_ops.chat_with_context import \
     ChatWithContext
+from backend.src.application.use_cases._rag_ops.delete_doc import \
+    DeleteDocument
 from backend.src.application.use_cases._rag_ops.get_all_processed_docs import \
     GetAllProcessedDocsUseCase
 from backend.src.application.use_cases._rag_ops.get_session import \
@@ -18,9 +23,12 @@ from backend.src.application.use_cases._rag_ops.upload_doc import \
 from backend.src.domain.entities.library_entities.user import User
 from backend.src.domain.exceptions.chat_exceptions import *
 from backend.src.domain.exceptions.chat_exceptions import (
-    ChatHistoryNotFound, NotAuthorizedToViewSession)
+    ChatHistoryNotFound, DocumentAlreadyProcessed, DocumentNotFound,
+    NotAuthorizedToViewSession)
 from backend.src.domain.exceptions.user_exceptions import UserNotFound
-from backend.src.infrastructure.persistence.database import get_db
+from backend.src.infrastructure.jobs.ingestion_jobs import (
+    IngestionAlreadyQueued, IngestionJob, IngestionJobQueue, IngestionQueueFull)
+from backend.src.infrastructure.persistence.database import SessionLocal, get_db
 from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.chat_session_repository_impl import \
     ChatSessionRepositoryImpl
 from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.document_repository_impl import \
@@ -36,11 +44,12 @@ from backend.src.infrastructure.web.file_validator import \
 from backend.src.presentation.schemas.rag_schemas.chat_schema import (
     ChatMessageRequest, ChatMessageResponse, ChatResponse, ChatSessionRequest,
     ChatSessionResponse)
-from backend.src.presentation.schemas.rag_schemas.document_schema import \
-    DocumentUploadResponse
+from backend.src.presentation.schemas.rag_schemas.document_schema import (
+    DocumentDeleteResponse, DocumentUploadResponse, IngestionJobResponse,
+    IngestionJobStatusResponse)
 
 from backend.src.infrastructure.web.dependencies import (
-    get_chat_session_repo, get_rag_repo, get_vector_repo,)
+    get_chat_session_repo, get_ingestion_queue, get_rag_repo, get_vector_repo,)
 
 
 
@@ -57,7 +66,7 @@ router = APIRouter(
 
 ### CHAT WITH CONTEXT ENDPOINT, THIS MIGHT RECEIVE AND OPTIONAL HASH PARAMETER ###
 @router.post("/chat", response_model=ChatMessageResponse)
-def chat_with_context(
+async def chat_with_context(
     chat_request: ChatMessageRequest,
     current_user: User = Depends(get_current_user),
     rag_repo: LangGraphRAGRepositoryImpl = Depends(get_rag_repo),
@@ -78,7 +87,7 @@ def chat_with_context(
         rag_repo=rag_repo, chat_session_repo=chat_repo, hash=hash
     )
     try:
-        response_message = chat_with_context_use_case.generate_response(
+        response_message = await chat_with_context_use_case.generate_response(
             current_user=current_user,
             session_id=chat_request.session_id,  # type: ignore
             query=chat_request.content,
@@ -94,31 +103,76 @@ def chat_with_context(
         raise HTTPException(status_code=500, detail=f"Internal RAG error: {str(e)}")
 
 
+### SAME CHAT, STREAMED AS SERVER-SENT EVENTS ###
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_with_context_stream(
+    chat_request: ChatMessageRequest,
+    current_user: User = Depends(get_current_user),
+    rag_repo: LangGraphRAGRepositoryImpl = Depends(get_rag_repo),
+    chat_repo: ChatSessionRepositoryImpl = Depends(get_chat_session_repo),
+    hash: Optional[str] = Query(None, description="Optional document hash"),
+):
+    """
+    Same as /chat, answered as a text/event-stream:
+
+     - `progress`: a step of the pipeline finished ({"node", "elapsed_ms", "duration_ms"})
+     - `token`: a piece of the answer as it is generated ({"content"})
+     - `done`: the saved assistant message, same shape as the /chat response
+     - `error`: the answer could not be generated ({"detail"})
+    """
+    chat_with_context_use_case = ChatWithContext(
+        rag_repo=rag_repo, chat_session_repo=chat_repo, hash=hash
+    )
+
+    async def event_stream():
+        try:
+            async for event in chat_with_context_use_case.stream_response(
+                current_user=current_user,
+                session_id=chat_request.session_id,  # type: ignore
+                query=chat_request.content,
+                hash=hash,
+            ):
+                name = event.pop("event")
+                if name == "done":
+                    event = ChatMessageResponse.model_validate(event["message"]).model_dump(mode="json")
+                yield _sse(name, event)
+        except Exception as e:
+            yield _sse("error", {"detail": f"Internal RAG error: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the tokens
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 ### UPLOAD DOCUMENT, THIS WILL GO INTO THE VECTORSTORE AND THE NORMAL DB###
 @router.post(
     "/documents",
-    status_code=status.HTTP_201_CREATED,
-    response_model=DocumentUploadResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=IngestionJobResponse,
     dependencies=[Depends(has_role("admin"))],
 )
 async def upload_document_to_process(
+    request: Request,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     vector_repo: ChromaVectorStoreRepositoryImpl = Depends(get_vector_repo),
+    ingestion_queue: IngestionJobQueue = Depends(get_ingestion_queue),
 ):
     """
     Upload a document to be processed and stored in the RAG system.
     Since the document is stored, only admin can access this endpoint.
+    Processing runs in the background; poll the returned status_url for progress.
     """
     await validate_uploaded_file(file)  # validate size and extension
 
-    doc_repo = DocumentRepositoryImpl(db=db)
-
-    upload_doc_use_case = AddAndProcessDocument(
-        doc_repo=doc_repo,
-        vector_repo=vector_repo,
-    )
     original_filename = file.filename  # Store original filename
     _, ext = os.path.splitext(file.filename)  # type: ignore
     
@@ -132,28 +186,87 @@ async def upload_document_to_process(
         temp_file.write(await file.read())
         temp_file_path = temp_file.name
 
+    # Reject a duplicate right away with a 400 instead of a failed background job
     try:
-        response_message = upload_doc_use_case.add_documents(
-            file_path=temp_file_path, 
-            user_id=current_user.user_id, # type: ignore
-            file_name=original_filename, # type: ignore
-        )  
-        return DocumentUploadResponse(
-            book_isbn=response_message.book_isbn,
-            title=response_message.title,
-            hash=response_message.hash, #type: ignore 
+        document_hash = await asyncio.to_thread(
+            AddAndProcessDocument(
+                doc_repo=DocumentRepositoryImpl(db=db), vector_repo=vector_repo
+            ).check_not_processed,
+            temp_file_path,
         )
     except DocumentAlreadyProcessed as e:
+        os.remove(temp_file_path)
         raise HTTPException(status_code=400, detail=str(e))
-    except FileNotFoundError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
+
+    user_id = current_user.user_id
+
+    def run_ingestion(job: IngestionJob) -> dict:
+        # The request's db session is closed by the time this runs, so use a fresh one
+        db = SessionLocal()
+        try:
+            upload_doc_use_case = AddAndProcessDocument(
+                doc_repo=DocumentRepositoryImpl(db=db),
+                vector_repo=vector_repo,
+            )
+            response_message = upload_doc_use_case.add_documents(
+                file_path=temp_file_path, 
+                user_id=user_id, # type: ignore
+                file_name=original_filename, # type: ignore
+                on_stage=job.set_stage,
+                on_progress=job.set_chunks_committed,
+                document_hash=document_hash,
+            )  
+            return DocumentUploadResponse(
+                book_isbn=response_message.book_isbn,
+                title=response_message.title,
+                hash=response_message.hash, #type: ignore 
+            ).model_dump()
+        finally:
+            db.close()
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+
+    try:
+        job = ingestion_queue.submit(original_filename, run_ingestion, key=document_hash)  # type: ignore
+    except IngestionAlreadyQueued as e:
+        # Same file uploaded twice before the first ingestion finished
+        os.remove(temp_file_path)
         raise HTTPException(
-            status_code=500, detail=f"Failed to process document: {str(e)}"
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": str(e),
+                "job_id": e.job.job_id,
+                "status_url": request.url_for("get_ingestion_job_status", job_id=e.job.job_id).path,
+            },
         )
-    finally:
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+    except IngestionQueueFull as e:
+        os.remove(temp_file_path)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    return IngestionJobResponse(
+        job_id=job.job_id,
+        stage=job.stage,
+        status_url=request.url_for("get_ingestion_job_status", job_id=job.job_id).path,
+    )
+
+
+### POLL THE PROGRESS OF A DOCUMENT UPLOAD ###
+@router.get(
+    "/documents/jobs/{job_id}",
+    response_model=IngestionJobStatusResponse,
+    dependencies=[Depends(has_role("admin"))],
+)
+def get_ingestion_job_status(
+    job_id: str,
+    ingestion_queue: IngestionJobQueue = Depends(get_ingestion_queue),
+):
+    """
+    Report stage, chunk progress and per-stage timings of a background ingestion job.
+    """
+    job = ingestion_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return IngestionJobStatusResponse.model_validate(job)
 
 
 ### LIST ALL PROCESSED DOCUMENTS IN VECTORSTORE ###
@@ -171,6 +284,31 @@ def list_processed_documents_hashes(
     return processed_docs
 
 
+### DELETE A DOCUMENT TOGETHER WITH ITS VECTORS ###
+@router.delete(
+    "/documents/{document_hash}",
+    response_model=DocumentDeleteResponse,
+    dependencies=[Depends(has_role("admin"))],
+)
+def delete_document(
+    document_hash: str,
+    db: Session = Depends(get_db),
+    vector_repo: ChromaVectorStoreRepositoryImpl = Depends(get_vector_repo),
+):
+    """
+    Delete a document's SQL row, its chunk and summary vectors and its manifest entry.
+    """
+    try:
+        result = DeleteDocument(
+            doc_repo=DocumentRepositoryImpl(db=db), vector_repo=vector_repo
+        ).execute(document_hash)
+        return DocumentDeleteResponse(**result)
+    except DocumentNotFound:
+        raise HTTPException(status_code=404, detail="Document not found")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to delete document: {str(e)}")
+
+
 @router.get("/sessions/", response_model=List[ChatSessionResponse])
 def get_user_sessions(
     current_user: User = Depends(get_current_user),
@@ -13,4 +13,40 @@ class DocumentUploadResponse(BaseModel):
     hash: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class DocumentDeleteResponse(BaseModel):
+    """Response schema after deleting a document and its vectors."""
+
+    hash: str
+    document_removed: bool
+    chunks_removed: int
+    summaries_removed: int
+    manifest_removed: bool
+
+
+class IngestionJobResponse(BaseModel):
+    """Response schema after a document upload has been queued."""
+
+    job_id: str
+    stage: str
+    status_url: str
+
+
+class IngestionJobStatusResponse(BaseModel):
+    """Progress of a background document ingestion job."""
+
+    job_id: str
+    file_name: str
+    stage: str
+    chunks_committed: int
+    stage_timings: Dict[str, float] = Field(default_factory=dict)
+    error: Optional[str] = None
+    result: Optional[DocumentUploadResponse] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
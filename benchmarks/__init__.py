@@ -0,0 +1 @@
+"""Offline benchmarks and tuning harnesses; run each module with `python -m benchmarks.<name>`."""
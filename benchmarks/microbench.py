@@ -0,0 +1,337 @@
+"""
+Micro-benchmarks for the repository and retrieval hot paths.
+
+Every run works on a seeded copy of `data/library.db` (padded with synthetic books
+and chat sessions) and a throwaway Chroma directory, and embeds with the
+deterministic hashing provider, so runs need no network and never touch the real
+database or CHROMA_PERSIST_DIR.
+
+Results are compared against a JSON baseline; a benchmark whose median got slower
+than `--max-regression` percent fails the run:
+
+    python -m benchmarks.microbench --save-baseline      # record benchmarks/baselines/microbench.json
+    python -m benchmarks.microbench --max-regression 15  # compare, exit 1 on regressions
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.src.domain.entities.rag_entities.chat_history import (ChatMessage,
+                                                                   ChatSession,
+                                                                   MessageRole)
+from backend.src.infrastructure.config.settings import rag_settings
+from backend.src.infrastructure.persistence.models.normal_models import (
+    Base, BookModel)
+from backend.src.infrastructure.persistence.models.rag_models import (  # noqa: F401 - registers the tables
+    ChatMessageModel, ChatSessionModel, DocumentManifestModel, DocumentModel)
+from backend.src.infrastructure.persistence.repository_impl.library_repos_impl.book_repository_impl import \
+    BookRepositoryImpl
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl import \
+    vectorstore_repository_impl
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.chat_session_repository_impl import \
+    ChatSessionRepositoryImpl
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.document_manifest_repository_impl import \
+    DocumentManifestRepositoryImpl
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.document_repository_impl import \
+    DocumentRepositoryImpl
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.embeddings.providers import \
+    HashingEmbeddings
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.graph_builder import \
+    parse_model_json
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.vectorstore_repository_impl import \
+    ChromaVectorStoreRepositoryImpl
+
+SOURCE_DB = os.path.join("data", "library.db")
+SEARCH_BOOK = os.path.join(rag_settings.TEXT_FILES_DIR, "alice_in_wonderland.txt")
+# A different book, so near-duplicate detection does not skip it against the search corpus
+INGEST_BOOK = os.path.join(rag_settings.TEXT_FILES_DIR, "frankeinstein.txt")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "microbench.json")
+
+GENRES = ["Fantasy", "Gothic Horror", "Adventure", "Romance", "Tragedy", "Mystery", "Poetry", "History"]
+AUTHORS = ["Lewis Carroll", "Mary Shelley", "Herman Melville", "Jane Austen", "William Shakespeare",
+           "Charles Dickens", "Bram Stoker", "Emily Bronte", "Leo Tolstoy", "Homer"]
+WORDS = ["night", "river", "house", "garden", "letter", "voyage", "queen", "storm", "secret",
+         "winter", "island", "daughter", "machine", "whale", "ball", "rabbit", "castle", "war"]
+MODEL_REPLIES = [
+    '```json\n{"datasource": "vectorstore", "reason": "asks about the uploaded book"}\n```',
+    '{"binary_score": "yes"}',
+    '```\n{"genre": ["Fantasy"], "author": null, "title": "alice", "published_year": {"from": 1800, "to": 1900}}\n```',
+    "Sure! Here is the answer you asked for, but it is not JSON.",
+]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[[int], Any]
+    # Untimed preparation before each round, e.g. undoing the previous ingest
+    setup: Optional[Callable[[int], None]] = None
+    rounds: Optional[int] = None
+    # Work items per call, to report throughput (e.g. chunks per ingest)
+    items: Optional[Callable[[], int]] = None
+
+
+class BenchmarkEnvironment:
+    """Seeded SQLite copy, repositories and a throwaway vector store in one temp directory."""
+
+    def __init__(self, seed: int, n_books: int, n_sessions: int, messages_per_session: int):
+        self.workdir = tempfile.mkdtemp(prefix="rag_microbench_")
+        self.rng = random.Random(seed)
+
+        db_path = os.path.join(self.workdir, "library.db")
+        shutil.copyfile(SOURCE_DB, db_path)
+        self.engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=self.engine)
+        self.session_factory = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.db: Session = self.session_factory()
+
+        self._seed_books(n_books)
+        self.session_ids = self._seed_sessions(n_sessions, messages_per_session)
+
+        self.book_repo = BookRepositoryImpl(self.db)
+        self.chat_repo = ChatSessionRepositoryImpl(self.db)
+        self.vector_repo = _HashingVectorStore(
+            doc_repo=DocumentRepositoryImpl(self.db),
+            book_repo=self.book_repo,
+            manifest_repo=DocumentManifestRepositoryImpl(self.session_factory),
+            persist_directory=os.path.join(self.workdir, "chroma"),
+            sync_on_start=False,
+        )
+
+    def _seed_books(self, n_books: int) -> None:
+        for i in range(n_books):
+            title = " ".join(self.rng.choice(WORDS) for _ in range(3)).title()
+            self.db.add(
+                BookModel(
+                    book_isbn=f"979{i:010d}",
+                    title=f"{title} {i}",
+                    summary=" ".join(self.rng.choice(WORDS) for _ in range(60)),
+                    genre=self.rng.choice(GENRES),
+                    published_year=self.rng.randint(1500, 2020),
+                    author_name=self.rng.choice(AUTHORS),
+                )
+            )
+        self.db.commit()
+
+    def _seed_sessions(self, n_sessions: int, messages_per_session: int) -> List[str]:
+        repo = ChatSessionRepositoryImpl(self.db)
+        session_ids = []
+        for i in range(n_sessions):
+            session_id = f"bench-session-{i}"
+            repo.create_session(ChatSession(session_id=session_id, messages=[], user_id=i % 10 + 1))
+            for j in range(messages_per_session):
+                role = MessageRole.USER if j % 2 == 0 else MessageRole.ASSISTANT
+                content = " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(5, 80)))
+                repo.add_message_to_session(session_id, ChatMessage(content=content, role=role, session_id=session_id))
+            session_ids.append(session_id)
+        return session_ids
+
+    def close(self) -> None:
+        self.db.close()
+        self.engine.dispose()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class _HashingVectorStore(ChromaVectorStoreRepositoryImpl):
+    """Chroma repository on deterministic local embeddings, whatever EMBEDDING_PROVIDER says."""
+
+    def _initialize_embeddings(self):
+        embeddings = HashingEmbeddings()
+        return embeddings, f"hashing/{embeddings.dimension}"
+
+
+def book_sentences(path: str, count: int, seed: int) -> List[str]:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    sentences = [" ".join(s.split()) for s in re.findall(r"[^.!?]{40,300}[.!?]", text)]
+    return random.Random(seed).sample(sentences, min(count, len(sentences)))
+
+
+def build_benchmarks(env: BenchmarkEnvironment, rounds: int, seed: int) -> List[Benchmark]:
+    rng = random.Random(seed)
+    vector_repo = env.vector_repo
+
+    # Index one book up front so that retrieval has something to search
+    vector_repo.process_document(SEARCH_BOOK, "bench-search-corpus", "Alice In Wonderland")
+    queries = book_sentences(SEARCH_BOOK, rounds * 2, seed)
+
+    def book_filters(_: int):
+        return env.book_repo.get_books_with_filter(
+            genre=rng.sample(GENRES, 2),
+            author=rng.sample(AUTHORS, 3),
+            title=None,
+            published_year={"from": 1700, "to": 1950},
+        )
+
+    def add_message(i: int):
+        session_id = env.session_ids[i % len(env.session_ids)]
+        env.chat_repo.add_message_to_session(
+            session_id,
+            ChatMessage(content=f"benchmark message {i}", role=MessageRole.USER, session_id=session_id),
+        )
+
+    def similar_chunks(i: int):
+        # A fresh query each round, so the query embedding cache is not measured instead
+        return vector_repo.get_similar_chunks(queries[i % len(queries)])
+
+    ingest_hash = lambda i: f"bench-ingest-{i}"  # noqa: E731
+
+    def reset_ingest(i: int):
+        if i > 0:
+            vector_repo.delete_document_vectors(ingest_hash(i - 1))
+
+    def ingested_chunks() -> int:
+        entry = vector_repo.manifest_repo.get(ingest_hash(0))
+        return entry.chunk_count if entry and entry.chunk_count else 0
+
+    return [
+        Benchmark("book_repo.search", lambda i: env.book_repo.search(rng.choice(WORDS))),
+        Benchmark("book_repo.get_books_with_filter", book_filters),
+        Benchmark("chat_repo.add_message_to_session", add_message),
+        Benchmark("chat_repo.get_session_by_id",
+                  lambda i: env.chat_repo.get_session_by_id(env.session_ids[i % len(env.session_ids)])),
+        Benchmark("vector_repo.get_similar_chunks", similar_chunks),
+        Benchmark(
+            "vector_repo.process_document",
+            lambda i: vector_repo.process_document(INGEST_BOOK, ingest_hash(i), "Frankenstein"),
+            setup=reset_ingest,
+            rounds=max(3, rounds // 10),
+            items=ingested_chunks,
+        ),
+        Benchmark("parse_model_json", lambda i: [parse_model_json(reply) for reply in MODEL_REPLIES]),
+    ]
+
+
+def measure(benchmark: Benchmark, rounds: int, warmup: int) -> Dict[str, float]:
+    """Time one benchmark; all durations are in milliseconds."""
+    rounds = benchmark.rounds or rounds
+    durations = []
+    for i in range(warmup + rounds):
+        if benchmark.setup:
+            benchmark.setup(i)
+        started = time.perf_counter()
+        benchmark.func(i)
+        elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            durations.append(elapsed)
+
+    stats = {
+        "rounds": rounds,
+        "min_ms": round(min(durations), 4),
+        "median_ms": round(statistics.median(durations), 4),
+        "mean_ms": round(statistics.fmean(durations), 4),
+        "stdev_ms": round(statistics.stdev(durations), 4) if len(durations) > 1 else 0.0,
+    }
+    if benchmark.items:
+        items = benchmark.items()
+        stats["items"] = items
+        stats["items_per_second"] = round(items / (stats["median_ms"] / 1000), 2) if stats["median_ms"] else 0.0
+    return stats
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            max_regression: float) -> List[str]:
+    """Return a line per benchmark whose median is more than `max_regression` percent slower."""
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("median_ms"):
+            continue
+        change = (stats["median_ms"] - previous["median_ms"]) / previous["median_ms"] * 100
+        stats["change_pct"] = round(change, 2)
+        if change > max_regression:
+            regressions.append(
+                f"{name}: median {previous['median_ms']:.3f}ms -> {stats['median_ms']:.3f}ms (+{change:.1f}%)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for repository and retrieval hot paths.")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--books", type=int, default=2000, help="synthetic books added to the seeded copy")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--messages-per-session", type=int, default=20)
+    parser.add_argument("--only", action="append", help="run only benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--max-regression", type=float, default=25.0,
+                        help="fail when a median is this many percent slower than the baseline")
+    parser.add_argument("--output", help="also write this run's results to this file")
+    args = parser.parse_args(argv)
+
+    env = BenchmarkEnvironment(args.seed, args.books, args.sessions, args.messages_per_session)
+    results: Dict[str, Dict[str, float]] = {}
+    # process_document looks the ISBN up on Google Books; keep that HTTP call out of the timings
+    isbn_lookup = mock.patch.object(vectorstore_repository_impl, "get_isbn13", return_value=None)
+    try:
+        isbn_lookup.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            benchmarks = build_benchmarks(env, args.rounds, args.seed)
+        for benchmark in benchmarks:
+            if args.only and not any(part in benchmark.name for part in args.only):
+                continue
+            # The repositories print progress; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[benchmark.name] = measure(benchmark, args.rounds, args.warmup)
+            stats = results[benchmark.name]
+            line = f"{benchmark.name:<36} median {stats['median_ms']:>10.3f}ms  min {stats['min_ms']:>10.3f}ms"
+            if "items_per_second" in stats:
+                line += f"  {stats['items_per_second']:.1f} items/s"
+            print(line)
+    finally:
+        isbn_lookup.stop()
+        env.close()
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+    regressions: List[str] = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline.get("results", {}), args.max_regression)
+    elif not args.save_baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if regressions:
+        print(f"⚠️ {len(regressions)} benchmark(s) regressed more than {args.max_regression}%:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
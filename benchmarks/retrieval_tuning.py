@@ -0,0 +1,316 @@
+"""
+Retrieval tuning lab.
+
+Builds throwaway Chroma collections from `data/*.txt` for every combination of
+chunking and `hnsw:*` settings and scores them against exact brute-force search
+over the same embeddings. For each configuration it reports recall@k, p50/p99
+query latency, on-disk index size, embedding time and indexing time, plus how
+many results the similarity thresholds would let through.
+
+Queries are embedded with `embed_query`, like the chat path. Pass real user
+questions with `--queries-file` (one per line) for a threshold sweep that
+reflects production traffic. Without it, sentences are sampled from the books
+and cut out of the corpus before chunking, so no chunk contains its query
+verbatim; they are still closer to the text than real questions are, so treat
+the similarities of that sweep as optimistic.
+
+Nothing touches CHROMA_PERSIST_DIR; every collection lives in a temp directory.
+Use the hashing provider for a fully offline run:
+
+    python -m benchmarks.retrieval_tuning --provider hashing \
+        --chunk-sizes 256,512 --chunk-overlaps 0,64 --hnsw-m 8,16,32 \
+        --ef-construction 100,200 --ef-search 10,50,100 --output tuning.json
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import random
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import chromadb
+import numpy as np
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from backend.src.infrastructure.config.settings import rag_settings
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.embeddings.providers import \
+    build_embedding_provider
+from backend.src.infrastructure.persistence.repository_impl.rag_repos_impl.ingestion.boilerplate import \
+    GutenbergBoilerplateFilter
+
+SENTENCE_PATTERN = re.compile(r"[^.!?]{40,300}[.!?]")
+ADD_BATCH_SIZE = 512
+
+
+@dataclass
+class TuningResult:
+    chunk_size: int
+    chunk_overlap: int
+    n_chunks: int
+    hnsw_m: int
+    ef_construction: int
+    ef_search: int
+    recall_at_k: float
+    p50_ms: float
+    p99_ms: float
+    index_mb: float
+    embed_seconds: float
+    index_seconds: float
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def parse_floats(value: str) -> List[float]:
+    return [float(item) for item in value.split(",") if item.strip()]
+
+
+def load_corpus(data_dir: str, strip_boilerplate: bool = True) -> Dict[str, str]:
+    corpus = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.txt"))):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        if strip_boilerplate:
+            text = "".join(GutenbergBoilerplateFilter().filter([text]))
+        corpus[os.path.basename(path)] = text
+    return corpus
+
+
+def sample_queries(
+    corpus: Dict[str, str], n_queries: int, seed: int
+) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Pick sentences from the books as queries, so every query has real neighbours.
+
+    Returns the queries and the corpus with those sentences held out, so that a
+    query never matches the chunk it was copied from.
+    """
+    rng = random.Random(seed)
+    spans = [
+        (name, match.start(), match.end())
+        for name, text in corpus.items()
+        for match in SENTENCE_PATTERN.finditer(text)
+    ]
+    picked = rng.sample(spans, min(n_queries, len(spans)))
+    queries = [" ".join(corpus[name][start:end].split()) for name, start, end in picked]
+
+    held_out = dict(corpus)
+    for name, start, end in sorted(picked, key=lambda span: span[1], reverse=True):
+        held_out[name] = held_out[name][:start] + held_out[name][end:]
+    return queries, held_out
+
+
+def load_queries(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def chunk_corpus(corpus: Dict[str, str], chunk_size: int, chunk_overlap: int) -> List[str]:
+    splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ". ", "? ", "! ", " ", ""],
+        keep_separator=True,
+    )
+    return [chunk for text in corpus.values() for chunk in splitter.split_text(text)]
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def exact_top_k(
+    chunk_matrix: np.ndarray, query_matrix: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Brute-force ground truth: (row indices, cosine similarities), best first."""
+    similarities = normalize(query_matrix) @ normalize(chunk_matrix).T
+    k = min(k, chunk_matrix.shape[0])
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(similarities, top, axis=1), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    return top, np.take_along_axis(similarities, top, axis=1)
+
+
+def directory_size_mb(path: str) -> float:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total / (1024 * 1024)
+
+
+def build_collection(
+    directory: str,
+    chunk_embeddings: np.ndarray,
+    chunks: Sequence[str],
+    hnsw_m: int,
+    ef_construction: int,
+    ef_search: int,
+):
+    client = chromadb.PersistentClient(path=directory)
+    collection = client.create_collection(
+        "tuning",
+        metadata={
+            "hnsw:space": "cosine",
+            "hnsw:M": hnsw_m,
+            "hnsw:construction_ef": ef_construction,
+            "hnsw:search_ef": ef_search,
+        },
+    )
+    started = time.perf_counter()
+    for start in range(0, len(chunks), ADD_BATCH_SIZE):
+        end = start + ADD_BATCH_SIZE
+        collection.add(
+            ids=[str(i) for i in range(start, min(end, len(chunks)))],
+            embeddings=chunk_embeddings[start:end].tolist(),
+            documents=list(chunks[start:end]),
+        )
+    return client, collection, time.perf_counter() - started
+
+
+def measure_queries(
+    collection, query_embeddings: np.ndarray, ground_truth: np.ndarray, k: int
+) -> Tuple[float, float, float]:
+    """Return (recall@k, p50 ms, p99 ms) of one query at a time, like the chat path."""
+    latencies = []
+    hits = 0
+    for query, expected in zip(query_embeddings, ground_truth):
+        started = time.perf_counter()
+        result = collection.query(query_embeddings=[query.tolist()], n_results=k, include=[])
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits += len({int(i) for i in result["ids"][0]} & {int(i) for i in expected})
+    recall = hits / ground_truth.size if ground_truth.size else 0.0
+    return recall, float(np.percentile(latencies, 50)), float(np.percentile(latencies, 99))
+
+
+def threshold_sweep(similarities: np.ndarray, thresholds: Sequence[float]) -> List[Dict[str, float]]:
+    """How many of the true top-k pass each similarity cutoff, and how often none do."""
+    return [
+        {
+            "threshold": threshold,
+            "mean_results": round(float((similarities >= threshold).sum(axis=1).mean()), 3),
+            "empty_query_ratio": round(float((similarities.max(axis=1) < threshold).mean()), 3),
+        }
+        for threshold in thresholds
+    ]
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    embeddings, model_name = build_embedding_provider(args.provider)
+    corpus = load_corpus(args.data_dir, strip_boilerplate=not args.keep_boilerplate)
+    if not corpus:
+        raise SystemExit(f"No .txt files found in {args.data_dir}")
+    if args.queries_file:
+        queries = load_queries(args.queries_file)
+        query_source = args.queries_file
+    else:
+        queries, corpus = sample_queries(corpus, args.queries, args.seed)
+        query_source = "held-out book sentences"
+    query_matrix = np.asarray([embeddings.embed_query(query) for query in queries], dtype=np.float32)
+    print(f"Model {model_name}: {len(corpus)} books, {len(queries)} queries ({query_source}), k={args.k}")
+
+    results: List[TuningResult] = []
+    thresholds: Dict[str, List[Dict[str, float]]] = {}
+    hnsw_grid = list(itertools.product(args.hnsw_m, args.ef_construction, args.ef_search))
+
+    for chunk_size, chunk_overlap in itertools.product(args.chunk_sizes, args.chunk_overlaps):
+        if chunk_overlap >= chunk_size:
+            continue
+        started = time.perf_counter()
+        chunks = chunk_corpus(corpus, chunk_size, chunk_overlap)
+        chunk_matrix = np.asarray(embeddings.embed_documents(chunks), dtype=np.float32)
+        embed_seconds = time.perf_counter() - started
+
+        ground_truth, true_similarities = exact_top_k(chunk_matrix, query_matrix, args.k)
+        thresholds[f"{chunk_size}/{chunk_overlap}"] = threshold_sweep(true_similarities, args.thresholds)
+
+        for hnsw_m, ef_construction, ef_search in hnsw_grid:
+            directory = tempfile.mkdtemp(prefix="rag_tuning_")
+            try:
+                client, collection, index_seconds = build_collection(
+                    directory, chunk_matrix, chunks, hnsw_m, ef_construction, ef_search
+                )
+                recall, p50, p99 = measure_queries(collection, query_matrix, ground_truth, args.k)
+                index_mb = directory_size_mb(directory)
+                del collection, client
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
+
+            result = TuningResult(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                n_chunks=len(chunks),
+                hnsw_m=hnsw_m,
+                ef_construction=ef_construction,
+                ef_search=ef_search,
+                recall_at_k=round(recall, 4),
+                p50_ms=round(p50, 3),
+                p99_ms=round(p99, 3),
+                index_mb=round(index_mb, 2),
+                embed_seconds=round(embed_seconds, 2),
+                index_seconds=round(index_seconds, 2),
+            )
+            results.append(result)
+            print(
+                f"chunk {chunk_size}/{chunk_overlap} ({len(chunks)} chunks) "
+                f"M={hnsw_m} efC={ef_construction} efS={ef_search}: "
+                f"recall@{args.k}={result.recall_at_k:.3f} p50={result.p50_ms:.2f}ms "
+                f"p99={result.p99_ms:.2f}ms size={result.index_mb:.1f}MB "
+                f"embed={result.embed_seconds:.1f}s index={result.index_seconds:.1f}s"
+            )
+
+    for config, sweep in thresholds.items():
+        print(f"Thresholds for chunk {config}: " + ", ".join(
+            f"{row['threshold']}: {row['mean_results']} results, {row['empty_query_ratio']:.0%} empty"
+            for row in sweep
+        ))
+
+    return {
+        "model": model_name,
+        "k": args.k,
+        "queries": len(queries),
+        "query_source": query_source,
+        "results": [asdict(result) for result in results],
+        "thresholds": thresholds,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--data-dir", default=rag_settings.TEXT_FILES_DIR)
+    parser.add_argument("--provider", default=rag_settings.EMBEDDING_PROVIDER,
+                        help="embedding provider: google, onnx or hashing")
+    parser.add_argument("--chunk-sizes", type=parse_ints, default=[rag_settings.CHUNK_SIZE])
+    parser.add_argument("--chunk-overlaps", type=parse_ints, default=[rag_settings.CHUNK_OVERLAP])
+    parser.add_argument("--hnsw-m", type=parse_ints, default=[16])
+    parser.add_argument("--ef-construction", type=parse_ints, default=[100])
+    parser.add_argument("--ef-search", type=parse_ints, default=[10, 50, 100])
+    parser.add_argument("--thresholds", type=parse_floats, default=[0.3, 0.4, 0.5, 0.6, 0.7, 0.85])
+    parser.add_argument("--k", type=int, default=rag_settings.NUM_DOCS_RETRIEVED)
+    parser.add_argument("--queries", type=int, default=200, help="number of sampled queries")
+    parser.add_argument("--queries-file",
+                        help="use the questions in this file (one per line) instead of sampled sentences")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep-boilerplate", action="store_true",
+                        help="do not strip Project Gutenberg headers and footers")
+    parser.add_argument("--output", help="write the full report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
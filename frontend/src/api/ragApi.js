@@ -1,4 +1,5 @@
 import apiClient from './axiosConfig';
+import { getToken } from '@/services/tokenService';
 
 export const ragApi = {
   // --- SEND CHAT MESSAGE ---
@@ -15,6 +16,49 @@ export const ragApi = {
     return response.data;
   },
 
+  // --- SEND CHAT MESSAGE, STREAMING THE ANSWER (SERVER-SENT EVENTS) ---
+  // onEvent(event, data) is called for every "progress", "token", "done" and "error" event.
+  // axios cannot read a streamed body in the browser, so this uses fetch.
+  streamMessage: async ({sessionId, message, documentHash = null, onEvent, signal}) => {
+    const params = documentHash ? `?hash=${documentHash}` : '';
+    const token = getToken();
+
+    const response = await fetch(`${apiClient.defaults.baseURL}/rag/chat/stream${params}`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(token ? { Authorization: `Bearer ${token}` } : {}),
+      },
+      body: JSON.stringify({ content: message, session_id: sessionId }),
+      signal,
+    });
+    if (!response.ok) {
+      throw new Error(`Chat stream failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let done = null;
+    for (;;) {
+      const { value, done: finished } = await reader.read();
+      if (finished) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const raw = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        const event = raw.match(/^event: (.*)$/m)?.[1] ?? 'message';
+        const data = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] ?? 'null');
+        if (event === 'done') done = data;
+        onEvent?.(event, data);
+      }
+    }
+    return done;
+  },
+
   // --- UPLOAD DOCUMENT ---
   uploadDocument: async (file) => {
     const formData = new FormData();
@@ -27,6 +71,18 @@ export const ragApi = {
     return response.data;
   },
 
+  // --- POLL DOCUMENT INGESTION JOB ---
+  getDocumentJob: async (jobId) => {
+    const response = await apiClient.get(`/rag/documents/jobs/${jobId}`);
+    return response.data;
+  },
+
+  // --- DELETE DOCUMENT AND ITS VECTORS ---
+  deleteDocument: async (documentHash) => {
+    const response = await apiClient.delete(`/rag/documents/${documentHash}`);
+    return response.data;
+  },
+
   // --- LIST CHAT SESSIONS ---
   getChatSessions: async () => {
     const response = await apiClient.get('/rag/sessions/');